@@ -1,15 +1,22 @@
 import re
+from bisect import bisect_right
 import numpy as np
 import pandas as pd
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import nltk
 from nltk.tokenize import sent_tokenize, word_tokenize
 from nltk.corpus import stopwords
 import math
 import string
+import time
+from statistics import NormalDist
 import torch
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import warnings
+from near_duplicates import SimHashIndex
+from sentence_splitter import split_financial_sentences
+from lexicon import load_compiled_lexicon
+from batching import AdaptiveBatchSizer, is_out_of_memory
 warnings.filterwarnings('ignore')
 
 try:
@@ -27,17 +34,57 @@ try:
 except LookupError:
     nltk.download('wordnet')
 
+# Whitespace runs collapse to one space and unsupported characters become a space, in one pass
+PREPROCESS_PATTERN = re.compile(r'\s+|[^\w\s\.\!\?\,\;\:\-\$\%]')
+COLLAPSED_WHITESPACE = re.compile(r'\s{2,}')
+
+
+class TextOffsetMap:
+    """
+    Map character offsets in preprocess_text output back to the original text.
+
+    Cleaning replaces characters one for one except where a whitespace run collapses,
+    so only one (clean offset, shift) anchor per collapsed run is stored.
+    """
+
+    def __init__(self, text):
+        leading = len(text) - len(text.lstrip())
+        self.clean_offsets = [0]
+        self.shifts = [leading]
+        shift = leading
+        for match in COLLAPSED_WHITESPACE.finditer(text, leading):
+            shift += match.end() - match.start() - 1
+            self.clean_offsets.append(match.end() - shift)
+            self.shifts.append(shift)
+
+    def to_source(self, offset):
+        """Offset in the original text of the character at ``offset`` in the cleaned text"""
+        return offset + self.shifts[bisect_right(self.clean_offsets, offset) - 1]
+
+    def span(self, start, end):
+        """(start, end) in the original text of the cleaned slice [start, end)"""
+        if end <= start:
+            return self.to_source(start), self.to_source(start)
+        return self.to_source(start), self.to_source(end - 1) + 1
+
+
 class BankruptcyAwareFinBERTAnalyzer:
 
-    def __init__(self):
-        """Initialize the Bankruptcy-Aware FinBERT Sentiment Analyzer with simplified binary classification"""
+    def __init__(self, model_name="ProsusAI/finbert", lexicon_path=None):
+        """Initialize the Bankruptcy-Aware FinBERT Sentiment Analyzer with simplified binary classification
+
+        ``model_name`` selects the sentence model: ProsusAI/finbert by default, or the
+        directory of a distilled student saved by distillation.py. ``lexicon_path`` is
+        a lexicon JSON file (default lexicons/bankruptcy_lexicon.json).
+        """
 
         print("Loading FinBERT model... This may take a moment.")
 
         # Load FinBERT model and tokenizer
         try:
-            self.tokenizer = AutoTokenizer.from_pretrained("ProsusAI/finbert")
-            self.model = AutoModelForSequenceClassification.from_pretrained("ProsusAI/finbert")
+            self.model_name = model_name
+            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+            self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
             self.model.eval()  # Set to evaluation mode
             print("✅ FinBERT model loaded successfully!")
         except Exception as e:
@@ -45,210 +92,8 @@ class BankruptcyAwareFinBERTAnalyzer:
             print("📝 Please install required packages: pip install transformers torch")
             return None
 
-        # BANKRUPTCY-SPECIFIC SENTIMENT LEXICON with severe scoring
-        self.critical_bankruptcy_terms = {
-            'going concern': -1.0,  # Absolute high-risk
-            'continue as a going concern': -1.0,  # Absolute high-risk
-            'chapter 11': -1.0,  # Absolute high-risk
-            'bankruptcy': -1.0,  # Absolute high-risk
-            'cease operations': -1.0,  # Absolute high-risk
-            'substantial doubt': -1.0,
-            'covenant violation': -1.0,
-            'covenant violations': -1.0,
-            'insufficient liquidity': -1.0,
-            'sustain operations': -1.0,
-            'liquidation': -1.0,
-            'wind down': -1.0,
-            'unable to continue': -1.0,
-            'substantial uncertainty exists': -1.0,
-            'total losses of their investment': -1.0,
-            'wind down of': -1.0,
-            'completed the wind down': -1.0
-        }
-
-        self.high_risk_terms = {
-            'restructuring': -0.5,
-            'recapitalization': -0.45,
-            'working with our advisers': -0.5,
-            'financial advisers': -0.5,
-            'strategic alternatives': -0.45,
-            'potential strategic': -0.45,
-            'financial alternatives': -0.45,
-            'distressed': -0.5,
-            'covenant default': -0.5,
-            'amendment and closing fees': -0.4,
-            'refinancing': -0.45,
-            'debt restructuring': -0.5,
-            'impairment': -0.5,
-            'writedown': -0.5,
-            'writeoff': -0.5,
-            'goodwill impairment': -0.5,
-            'asset sales': -0.45,
-            'liquidity uncertainty': -0.5,
-            'goodwill impairment charges': -0.5,
-            'intangible asset impairment': -0.5,
-            'impairment charges': -0.5,
-            'strategic review': -0.45,
-            'sourcing reorganization': -0.5,
-            'discontinued operations': -1.0,
-        }
-
-        self.moderate_risk_terms = {
-            'turnaround strategy': -0.3,
-            'turnaround plan': -0.3,
-            'cost-cutting initiatives': -0.25,
-            'cost reduction efforts': -0.25,
-            'store closures': -0.35,
-            'store closure': -0.35,
-            'underperforming': -0.3,
-            'streamline our workforce': -0.35,
-            'workforce reduction': -0.35,
-            'operational improvements': -0.2,
-            'challenging environment': -0.25,
-            'difficult conditions': -0.25,
-            'cash used in operating activities': -0.35,
-            'negative cash flows': -0.35,
-            'losses from operations': -0.35,
-            'declining sales': -0.25,
-            'comparable store sales': -0.2,
-            'inventory reduction': -0.2,
-            'margin pressure': -0.25,
-            'comparable sales decreased': -0.25,
-            'comparable sales decline': -0.25,
-            'net sales decreased': -0.25,
-            'operating loss': -0.35,
-            'net loss': -0.35,
-            'loss from continuing operations': -0.35,
-            'lower than expected sales': -0.25,
-            'lower than expected margins': -0.25,
-            'excess inventory': -0.2,
-            'increased markdowns': -0.25,
-            'markdown requirements': -0.25
-        }
-
-        self.economic_headwinds_terms = {
-            'intense competition': -0.35,
-            'competitive environment': -0.35,
-            'highly competitive': -0.35,
-            'challenging retail landscape': -0.35,
-            'changing retail landscape': -0.35,
-            'consumer spending habits': -0.25,
-            'preference to purchase digitally': -0.25,
-            'pressure on retail store sales': -0.35,
-            'persistent highly promotional': -0.35,
-            'promotional retail environment': -0.35,
-            'promotional environment': -0.35,
-            'pressure on gross margins': -0.35,
-            'margin compression': -0.35,
-            'pricing pressure': -0.35,
-            'promotional selling': -0.25,
-            'promotional activities': -0.25,
-            'market headwinds': -0.35,
-            'economic headwinds': -0.35,
-            'macroeconomic pressures': -0.35,
-            'industry headwinds': -0.35,
-            'secular trends': -0.25,
-            'structural changes': -0.25,
-            'fundamental changes': -0.25,
-            'digital transformation pressure': -0.25,
-            'brick-and-mortar pressure': -0.35,
-            'e-commerce disruption': -0.25,
-            'omnichannel challenges': -0.25,
-            'consumer behavior shifts': -0.25,
-            'market disruption': -0.35,
-            'supply chain disruption': -0.35,
-            'supply chain pressures': -0.35,
-            'supply chain challenges': -0.35,
-            'inflationary pressures': -0.35,
-            'cost inflation': -0.35,
-            'labor cost increases': -0.35,
-            'material cost increases': -0.35,
-            'transportation cost increases': -0.35,
-            'energy cost increases': -0.35,
-            'commodity price increases': -0.35
-        }
-
-        self.management_change_terms = {
-            'interim ceo': -0.4,
-            'interim chief executive': -0.4,
-            'management changes': -0.5,
-            'new management team': 0.1,
-            'added new members to the management team': 0.05,
-            'management transition': -0.25,
-            'leadership change': -0.2,
-            'chief financial officer': 0.0,
-            'interim cfo': -0.35
-        }
-
-        self.financial_context_patterns = {
-            r'(\d+\.\d+)\s+to\s+1\.00\s+as compared with.*covenant minimum of\s+(\d+\.\d+)': 'covenant_ratio',
-            r'cash.*\$(\d+,?\d*)\s+.*outstanding.*\$(\d+,?\d*)': 'cash_vs_debt',
-            r'decreased.*\$(\d+,?\d*),?\s+or\s+(\d+\.?\d*)%': 'sales_decline',
-            r'net loss.*\$(\d+,?\d*)': 'net_loss',
-            r'comparable sales decreased by\s+(\d+\.?\d*)%': 'comp_sales_decline',
-            r'operating loss was\s+\$(\d+\.\d+)\s+million': 'operating_loss',
-            r'impairment charges of\s+\$(\d+\.\d+)\s+million': 'impairment_amount'
-        }
-
-        # VALENCE SHIFTERS WITH MODERATED FACTORS
-        self.amplifiers = {
-            'highly': 1.0, 'huge': 1.0, 'hugely': 1.0, 'massive': 1.0, 'massively': 1.0,
-            'more': 1.0, 'most': 1.0, 'much': 1.0, 'majorly': 1.0, 'vast': 1.0,
-            'very': 1.0, 'decidedly': 1.0, 'definite': 1.0, 'immense': 1.0,
-            'immensely': 1.0, 'incalculable': 1.0, 'vastly': 1.0, 'uber': 1.0,
-            'particular': 1.0, 'particularly': 1.0, 'certain': 1.0, 'certainly': 1.0,
-            'colossal': 1.0, 'considerably': 1.0, 'deep': 1.0, 'deeply': 1.0,
-            'definitely': 1.0, 'enormous': 1.0, 'enormously': 1.0, 'especially': 1.0,
-            'extreme': 1.0, 'extremely': 1.0, 'greatly': 1.0, 'heavily': 1.0,
-            'heavy': 1.0, 'high': 1.0, 'serious': 1.0, 'seriously': 1.0,
-            'severe': 1.0, 'severely': 1.0, 'significant': 1.0, 'significantly': 1.0,
-            'sure': 1.0, 'surely': 1.0, 'totally': 1.0, 'true': 1.0, 'truly': 1.0,
-            'substantial': 1.0, 'substantially': 1.0, 'persistent': 1.0,
-            'persistently': 1.0, 'intense': 1.0, 'intensely': 1.0,
-            'continued': 1.0, 'continuing': 1.0
-        }
-
-        self.de_amplifiers = {
-            'least': 0.5, 'little': 0.5, 'incredibly': 0.5, 'sparsely': 0.5,
-            'fairly': 0.5, 'almost': 0.5, 'barely': 0.5, 'hardly': 0.5,
-            'only': 0.5, 'partly': 0.5, 'quite': 0.5, 'rarely': 0.5,
-            'seldom': 0.5, 'slightly': 0.5, 'somewhat': 0.5, 'few': 0.5,
-            'relatively': 0.5, 'moderately': 0.5, 'partially': 0.5
-        }
-
-        self.negators = {
-            'neither': -1.0, 'never': -1.0, 'none': -1.0, 'cant': -1.0, 'wont': -1.0,
-            'not': -1.0, 'dont': -1.0, 'no': -1.0, 'nothing': -1.0, 'nobody': -1.0,
-            'nowhere': -1.0, 'without': -1.0
-        }
-
-        self.adversative_conjunctions = {
-            'however': 0.5, 'whereas': 0.5, 'although': 0.5, 'but': 0.5,
-            'nevertheless': 0.5, 'nonetheless': 0.8, 'despite': 0.5,
-            'though': 0.5, 'yet': 0.5, 'while': 0.5, 'offset': 0.5,
-            'partially offset': 0.5
-        }
-
-        self.valence_shifters = {}
-        self.valence_shifters.update({word: ('amplifier', weight) for word, weight in self.amplifiers.items()})
-        self.valence_shifters.update({word: ('de_amplifier', weight) for word, weight in self.de_amplifiers.items()})
-        self.valence_shifters.update({word: ('negator', weight) for word, weight in self.negators.items()})
-        self.valence_shifters.update({word: ('adversative', weight) for word, weight in self.adversative_conjunctions.items()})
-
-        self.bankruptcy_lexicon = {}
-        self.bankruptcy_lexicon.update(self.critical_bankruptcy_terms)
-        self.bankruptcy_lexicon.update(self.high_risk_terms)
-        self.bankruptcy_lexicon.update(self.moderate_risk_terms)
-        self.bankruptcy_lexicon.update(self.economic_headwinds_terms)
-        self.bankruptcy_lexicon.update(self.management_change_terms)
-
-        self.uncertainty_words = {
-            'may', 'might', 'could', 'possibly', 'perhaps', 'potentially', 'uncertain',
-            'uncertainty', 'appears', 'seems', 'likely', 'unlikely', 'probably', 'believe',
-            'expect', 'anticipate', 'estimate', 'approximate', 'roughly', 'no assurance',
-            'no assurances', 'substantial uncertainty', 'not reasonably estimable',
-            'remains uncertain', 'continue to assess', 'extent and durations'
-        }
+        # Risk terms, financial-context patterns, valence shifters and uncertainty cues (lexicons/)
+        self.load_lexicon(lexicon_path)
 
         self.training_sentences = [
             {
@@ -303,19 +148,110 @@ class BankruptcyAwareFinBERTAnalyzer:
             }
         ]
 
+        # Blend and valence-shifter factors used by apply_valence_adjustment (see tuning.py)
+        self.scoring_weights = {
+            'base_blend': 0.3,
+            'risk_blend': 0.7,  # Increased risk weight
+            'amplifier': 0.3,  # Reduced from 0.5 to 0.3
+            'de_amplifier': 0.2,  # Reduced from 0.4 to 0.2
+            'adversative': 0.4,  # Retained at 0.4
+            'uncertainty': 0.2
+        }
+
+        # Per-category weights applied to risk indicator scores in calculate_risk_sentiment
+        self.category_weights = {
+            'critical_bankruptcy': 0.9,
+            'high_risk': 0.7,
+            'moderate_risk': 0.5,
+            'economic_headwinds': 0.6,
+            'management_change': 0.4
+        }
+
         self.stop_words = set(stopwords.words('english'))
 
-        print(f"✅ Loaded {len(self.bankruptcy_lexicon)} risk indicators")
+        # Default sentence splitter for analyze_text: 'punkt' (NLTK) or 'regex' (sentence_splitter.py)
+        self.sentence_splitter = 'punkt'
+
+        # FinBERT outputs keyed by sentence text, reused across documents (e.g. successive filings)
+        self.finbert_cache = OrderedDict()
+        self.finbert_cache_size = 200000
+        self.cache_stats = {'hits': 0, 'misses': 0, 'near_duplicate_hits': 0,
+                            'audited': 0, 'drift_total': 0.0, 'drift_max': 0.0}
+
+        # Optional SimHash index for reusing FinBERT results of near-identical sentences
+        self.near_duplicate_index = None
+        self.near_duplicate_audit_rate = 0.0
+
+        # Optional controller that picks the FinBERT batch size at runtime (see enable_adaptive_batching)
+        self.batch_sizer = None
+
+        print(f"✅ Loaded {len(self.bankruptcy_lexicon)} risk indicators (lexicon {self.lexicon_version})")
         print(f"📚 Training on {len(self.training_sentences)} labeled sentences")
 
+    def load_lexicon(self, path=None):
+        """
+        Load, or hot-swap in a running analyzer, the lexicon used for risk and valence scoring.
+
+        The compiled lexicon is swapped in as a single reference and the model and
+        FinBERT cache are left alone (FinBERT outputs do not depend on the lexicon).
+        Sentence and document results record lexicon_version so results scored under
+        another lexicon can be recognized and rescored.
+        """
+        lexicon = load_compiled_lexicon(path)
+        self.critical_bankruptcy_terms = lexicon.risk_terms['critical_bankruptcy']
+        self.high_risk_terms = lexicon.risk_terms['high_risk']
+        self.moderate_risk_terms = lexicon.risk_terms['moderate_risk']
+        self.economic_headwinds_terms = lexicon.risk_terms['economic_headwinds']
+        self.management_change_terms = lexicon.risk_terms['management_change']
+        self.financial_context_patterns = lexicon.financial_context_patterns
+        self.amplifiers = lexicon.shifters['amplifier']
+        self.de_amplifiers = lexicon.shifters['de_amplifier']
+        self.negators = lexicon.shifters['negator']
+        self.adversative_conjunctions = lexicon.shifters['adversative']
+        self.valence_shifters = lexicon.valence_shifters
+        self.bankruptcy_lexicon = lexicon.bankruptcy_lexicon
+        self.uncertainty_words = lexicon.uncertainty_words
+        self.lexicon = lexicon
+        self.lexicon_version = lexicon.version_id
+        return lexicon
+
     def preprocess_text(self, text):
         """Clean and preprocess text"""
         if not isinstance(text, str):
             return ""
 
-        text = re.sub(r'\s+', ' ', text.strip())
-        text = re.sub(r'[^\w\s\.\!\?\,\;\:\-\$\%]', ' ', text)
-        return text
+        return PREPROCESS_PATTERN.sub(' ', text.strip())
+
+    def preprocess_text_with_offsets(self, text):
+        """Clean text like preprocess_text and return it with a TextOffsetMap back to ``text``"""
+        if not isinstance(text, str):
+            return "", TextOffsetMap("")
+        return self.preprocess_text(text), TextOffsetMap(text)
+
+    def _finbert_scores_to_result(self, scores):
+        """Convert FinBERT class probabilities (negative, neutral, positive) into a sentiment result"""
+        negative_score = scores[0]
+        neutral_score = scores[1]
+        positive_score = scores[2]
+        sentiment_score = (positive_score - negative_score) * (1 - neutral_score * 0.5)
+        sentiment_score = max(-1.0, min(1.0, sentiment_score))
+        return {
+            'sentiment_score': float(sentiment_score),
+            'negative_prob': float(negative_score),
+            'neutral_prob': float(neutral_score),
+            'positive_prob': float(positive_score),
+            'confidence': float(max(scores))
+        }
+
+    def _neutral_finbert_result(self):
+        """Fallback FinBERT result used when inference fails"""
+        return {
+            'sentiment_score': 0.0,
+            'negative_prob': 0.0,
+            'neutral_prob': 1.0,
+            'positive_prob': 0.0,
+            'confidence': 0.0
+        }
 
     def get_finbert_sentiment(self, text):
         """Get sentiment from FinBERT model"""
@@ -325,47 +261,195 @@ class BankruptcyAwareFinBERTAnalyzer:
             with torch.no_grad():
                 outputs = self.model(**inputs)
                 predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
-            scores = predictions[0].numpy()
-            negative_score = scores[0]
-            neutral_score = scores[1]
-            positive_score = scores[2]
-            sentiment_score = (positive_score - negative_score) * (1 - neutral_score * 0.5)
-            sentiment_score = max(-1.0, min(1.0, sentiment_score))
-            return {
-                'sentiment_score': float(sentiment_score),
-                'negative_prob': float(negative_score),
-                'neutral_prob': float(neutral_score),
-                'positive_prob': float(positive_score),
-                'confidence': float(max(scores))
-            }
+            return self._finbert_scores_to_result(predictions[0].numpy())
         except Exception as e:
             print(f"Error in FinBERT processing: {e}")
-            return {
-                'sentiment_score': 0.0,
-                'negative_prob': 0.0,
-                'neutral_prob': 1.0,
-                'positive_prob': 0.0,
-                'confidence': 0.0
-            }
+            return self._neutral_finbert_result()
+
+    def get_finbert_sentiment_batch(self, texts, batch_size=32):
+        """Get sentiment from FinBERT for a list of texts, running the model on padded batches.
+
+        Results are cached by text, so sentences already seen (e.g. boilerplate repeated
+        across quarterly filings) are not sent through the model again. With
+        enable_near_duplicate_reuse, sentences that only differ in numbers, dates or a
+        few words also reuse the closest indexed result.
+        """
+        results = [None] * len(texts)
+        pending = {}
+        audit_references = {}
+        for i, text in enumerate(texts):
+            if text in pending:
+                pending[text].append(i)
+                continue
+            reused, audit_reference = self._reuse_finbert_result(text)
+            if reused is not None:
+                results[i] = reused
+                continue
+            if audit_reference is not None:
+                audit_references[text] = audit_reference
+            pending[text] = [i]
+
+        to_score = list(pending)
+        self.cache_stats['misses'] += len(to_score)
+        start = 0
+        while start < len(to_score):
+            sizer = self.batch_sizer
+            batch = to_score[start:start + (sizer.batch_size if sizer else batch_size)]
+            try:
+                inputs = self._tokenize_for_finbert(batch)
+                started = time.perf_counter()
+                batch_results = self._run_finbert(inputs)
+                if sizer:
+                    sizer.record(len(batch), int(inputs['attention_mask'].sum()), time.perf_counter() - started)
+                for text, result in zip(batch, batch_results):
+                    self._store_finbert_result(text, result, audit_references.get(text))
+            except Exception as e:
+                if sizer and is_out_of_memory(e) and len(batch) > sizer.min_size:
+                    # Retry the same sentences in a smaller batch
+                    sizer.back_off('out_of_memory')
+                    continue
+                print(f"Error in FinBERT batch processing: {e}")
+                batch_results = [self._neutral_finbert_result() for _ in batch]
+            for text, result in zip(batch, batch_results):
+                for i in pending[text]:
+                    results[i] = dict(result)
+            start += len(batch)
+        return results
+
+    def _tokenize_for_finbert(self, texts):
+        """Tokenize a batch of texts into padded FinBERT input tensors"""
+        return self.tokenizer(texts, return_tensors="pt", truncation=True,
+                              padding=True, max_length=512)
+
+    def _run_finbert(self, inputs):
+        """Run FinBERT on tokenized inputs, returning one sentiment result per row"""
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+            predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
+        return [self._finbert_scores_to_result(scores) for scores in predictions.numpy()]
+
+    def _reuse_finbert_result(self, text):
+        """
+        Look up a FinBERT result for text in the exact cache, then the near-duplicate index.
+
+        Returns (result, audit_reference): result is None when the text must be scored,
+        and audit_reference is the reused near-duplicate result when this hit was
+        selected for a drift audit.
+        """
+        cached = self.finbert_cache.get(text)
+        if cached is not None:
+            self.finbert_cache.move_to_end(text)
+            self.cache_stats['hits'] += 1
+            return dict(cached), None
+        if self.near_duplicate_index is not None:
+            near_duplicate, _ = self.near_duplicate_index.query(text)
+            if near_duplicate is not None:
+                self.cache_stats['near_duplicate_hits'] += 1
+                if self._should_audit_near_duplicate():
+                    return None, near_duplicate
+                return dict(near_duplicate), None
+        return None, None
+
+    def _store_finbert_result(self, text, result, audit_reference=None):
+        """Cache and index a freshly scored result, recording drift if it was an audited near-duplicate"""
+        self._cache_finbert_result(text, result)
+        if audit_reference is not None:
+            self._record_near_duplicate_drift(audit_reference, result)
+
+    def enable_near_duplicate_reuse(self, max_distance=3, audit_rate=0.05):
+        """
+        Reuse FinBERT results across near-identical sentences (numbers and dates masked).
+
+        ``audit_rate`` is the fraction of near-duplicate hits that are still scored by
+        the model so score drift from reuse can be measured (see cache_report).
+        """
+        self.near_duplicate_index = SimHashIndex(max_distance=max_distance)
+        self.near_duplicate_audit_rate = audit_rate
+        for text, result in self.finbert_cache.items():
+            self.near_duplicate_index.add(text, result)
+
+    def enable_adaptive_batching(self, initial=32, min_size=4, max_size=256, memory_limit_mb=None, max_latency=5.0):
+        """
+        Let FinBERT inference choose its batch size from measured latency, throughput and RSS.
+
+        The ``batch_size`` arguments of the analysis methods are then ignored in favor
+        of the sizer's current size; see batching.AdaptiveBatchSizer and batch_report.
+        """
+        self.batch_sizer = AdaptiveBatchSizer(initial=initial, min_size=min_size, max_size=max_size,
+                                              memory_limit_mb=memory_limit_mb, max_latency=max_latency)
+
+    def batch_report(self):
+        """Batch sizes chosen by adaptive batching so far, or None when it is disabled"""
+        return self.batch_sizer.report() if self.batch_sizer is not None else None
+
+    def load_backend(self, model_name):
+        """
+        Switch the sentence model, e.g. to a distilled student for CPU screening.
+
+        Cached FinBERT results came from the previous model, so the cache and any
+        near-duplicate index are reset.
+        """
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        self.model.eval()
+        self.model_name = model_name
+        self.finbert_cache.clear()
+        if self.near_duplicate_index is not None:
+            self.near_duplicate_index = SimHashIndex(max_distance=self.near_duplicate_index.max_distance)
+        print(f"✅ Switched sentence model to {model_name}")
+
+    def _should_audit_near_duplicate(self):
+        """Deterministically select every n-th near-duplicate hit for auditing"""
+        if self.near_duplicate_audit_rate <= 0:
+            return False
+        interval = max(1, round(1 / self.near_duplicate_audit_rate))
+        return self.cache_stats['near_duplicate_hits'] % interval == 0
+
+    def _record_near_duplicate_drift(self, reused_result, scored_result):
+        """Track how far a reused near-duplicate score is from the model's actual score"""
+        drift = abs(reused_result['sentiment_score'] - scored_result['sentiment_score'])
+        self.cache_stats['audited'] += 1
+        self.cache_stats['drift_total'] += drift
+        self.cache_stats['drift_max'] = max(self.cache_stats['drift_max'], drift)
+
+    def cache_report(self):
+        """Summarize exact-cache and near-duplicate reuse rates and audited score drift"""
+        stats = self.cache_stats
+        lookups = stats['hits'] + stats['misses'] + stats['near_duplicate_hits'] - stats['audited']
+        reused_near_duplicates = stats['near_duplicate_hits'] - stats['audited']
+        return {
+            'sentences': lookups,
+            'exact_reuse_rate': stats['hits'] / lookups if lookups else 0.0,
+            'near_duplicate_reuse_rate': reused_near_duplicates / lookups if lookups else 0.0,
+            'model_scored_rate': stats['misses'] / lookups if lookups else 0.0,
+            'audited_near_duplicates': stats['audited'],
+            'mean_score_drift': stats['drift_total'] / stats['audited'] if stats['audited'] else 0.0,
+            'max_score_drift': stats['drift_max']
+        }
+
+    def _cache_finbert_result(self, text, result):
+        """
+        Store a FinBERT result, evicting the least recently used entries beyond finbert_cache_size.
+
+        The near-duplicate index follows the cache, so it is bounded by the same size.
+        """
+        if self.near_duplicate_index is not None and text not in self.finbert_cache:
+            self.near_duplicate_index.add(text, result)
+        self.finbert_cache[text] = result
+        self.finbert_cache.move_to_end(text)
+        while len(self.finbert_cache) > self.finbert_cache_size:
+            evicted, _ = self.finbert_cache.popitem(last=False)
+            if self.near_duplicate_index is not None:
+                self.near_duplicate_index.remove(evicted)
 
     def find_risk_indicators(self, sentence):
         """Find risk-specific terms in sentence"""
         sentence_lower = sentence.lower()
         found_indicators = []
 
-        for term, score in sorted(self.bankruptcy_lexicon.items(), key=lambda x: len(x[0]), reverse=True):
+        # Longest terms first, so a matched phrase is removed before its sub-phrases are checked
+        for term, score, category in self.lexicon.risk_term_matcher:
             if term in sentence_lower:
-                category = 'unknown'
-                if term in self.critical_bankruptcy_terms:
-                    category = 'critical_bankruptcy'
-                elif term in self.high_risk_terms:
-                    category = 'high_risk'
-                elif term in self.moderate_risk_terms:
-                    category = 'moderate_risk'
-                elif term in self.economic_headwinds_terms:
-                    category = 'economic_headwinds'
-                elif term in self.management_change_terms:
-                    category = 'management_change'
                 found_indicators.append({
                     'term': term,
                     'score': score,
@@ -378,10 +462,10 @@ class BankruptcyAwareFinBERTAnalyzer:
     def find_financial_metrics(self, sentence):
         """Extract financial metrics with balanced severity"""
         metrics = []
+        sentence_lower = sentence.lower()
 
-        for pattern, metric_type in self.financial_context_patterns.items():
-            matches = re.finditer(pattern, sentence.lower())
-            for match in matches:
+        for pattern, metric_type in self.lexicon.compiled_patterns:
+            for match in pattern.finditer(sentence_lower):
                 if metric_type == 'covenant_ratio':
                     actual = float(match.group(1))
                     required = float(match.group(2))
@@ -435,20 +519,21 @@ class BankruptcyAwareFinBERTAnalyzer:
                     })
         return metrics
 
-    def find_valence_shifters_in_sentence(self, sentence):
-        """Find valence shifters in a sentence"""
+    def match_valence_shifters(self, sentence):
+        """
+        Tokenize a sentence and match valence shifters and uncertainty phrases in one pass.
+
+        Returns (shifters, words, summary) where summary holds the per-type totals
+        used by apply_valence_adjustment (see CompiledLexicon.match_valence_phrases).
+        """
         words = word_tokenize(sentence.lower())
         words = [w for w in words if w not in string.punctuation]
-        shifters = []
-        for i, word in enumerate(words):
-            if word in self.valence_shifters:
-                shifter_type, weight = self.valence_shifters[word]
-                shifters.append({
-                    'word': word,
-                    'type': shifter_type,
-                    'weight': weight,
-                    'position': i
-                })
+        shifters, summary = self.lexicon.match_valence_phrases(words)
+        return shifters, words, summary
+
+    def find_valence_shifters_in_sentence(self, sentence):
+        """Find valence shifters (single- or multi-word) in a sentence"""
+        shifters, words, _ = self.match_valence_shifters(sentence)
         return shifters, words
 
     def calculate_risk_sentiment(self, sentence):
@@ -460,17 +545,9 @@ class BankruptcyAwareFinBERTAnalyzer:
         risk_confidence = 0.0
 
         if risk_indicators:
-            category_weights = {
-                'critical_bankruptcy': 0.9,
-                'high_risk': 0.7,
-                'moderate_risk': 0.5,
-                'economic_headwinds': 0.6,
-                'management_change': 0.4
-            }
-
             weighted_scores = []
             for ind in risk_indicators:
-                category_weight = category_weights.get(ind['category'], 0.3)
+                category_weight = self.category_weights.get(ind['category'], 0.3)
                 weighted_scores.append(ind['score'] * category_weight)
             risk_score = sum(weighted_scores) / len(weighted_scores)
             risk_confidence = min(1.0, len(risk_indicators) * 0.3)
@@ -488,25 +565,34 @@ class BankruptcyAwareFinBERTAnalyzer:
             'financial_metrics': financial_metrics
         }
 
-    def apply_valence_adjustment(self, base_sentiment, risk_sentiment, shifters, sentence_words):
-        """Apply valence shifters to compute net sentiment score with adjusted factors"""
+    def apply_valence_adjustment(self, base_sentiment, risk_sentiment, shifters, sentence_words, valence_summary=None):
+        """
+        Apply valence shifters to compute net sentiment score with adjusted factors.
+
+        ``valence_summary`` is the per-type totals from match_valence_shifters; it is
+        recomputed from ``sentence_words`` when not given.
+        """
         if risk_sentiment['risk_confidence'] > 0.15:
-            combined_sentiment = (base_sentiment * 0.3 + risk_sentiment['risk_score'] * 0.7)  # Increased risk weight
+            combined_sentiment = (base_sentiment * self.scoring_weights['base_blend'] +
+                                  risk_sentiment['risk_score'] * self.scoring_weights['risk_blend'])
         else:
             combined_sentiment = base_sentiment
 
         # Apply minimum negative adjustment for critical bankruptcy terms
-        if any(ind['term'] in self.critical_bankruptcy_terms for ind in risk_sentiment['indicators']):
+        if any(ind['category'] == 'critical_bankruptcy' for ind in risk_sentiment['indicators']):
             combined_sentiment = min(combined_sentiment, -0.2)
 
-        if not shifters:
+        if valence_summary is None:
+            _, valence_summary = self.lexicon.match_valence_phrases(sentence_words)
+        # Phrases such as 'no assurance' only add uncertainty, without a shifter entry
+        if not shifters and not valence_summary['uncertainty_count']:
             return combined_sentiment
 
         adjusted_sentiment = combined_sentiment
-        negator_count = sum(1 for s in shifters if s['type'] == 'negator')
-        amplifier_strength = sum(s['weight'] for s in shifters if s['type'] == 'amplifier')
-        de_amplifier_strength = sum(s['weight'] for s in shifters if s['type'] == 'de_amplifier')
-        adversative_strength = sum(s['weight'] for s in shifters if s['type'] == 'adversative')
+        negator_count = valence_summary['negator_count']
+        amplifier_strength = valence_summary['amplifier_strength']
+        de_amplifier_strength = valence_summary['de_amplifier_strength']
+        adversative_strength = valence_summary['adversative_strength']
 
         # Negators fully reverse sentiment
         if negator_count % 2 == 1:
@@ -514,60 +600,73 @@ class BankruptcyAwareFinBERTAnalyzer:
 
         # Amplifiers enhance with moderated factor
         if amplifier_strength > 0:
-            amplification_factor = 1 + (amplifier_strength * 0.3)  # Reduced from 0.5 to 0.3
+            amplification_factor = 1 + (amplifier_strength * self.scoring_weights['amplifier'])
             adjusted_sentiment = adjusted_sentiment * amplification_factor
 
         # De-amplifiers reduce with moderated factor
         if de_amplifier_strength > 0:
-            de_amplification_factor = 1 - (de_amplifier_strength * 0.2)  # Reduced from 0.4 to 0.2
+            de_amplification_factor = 1 - (de_amplifier_strength * self.scoring_weights['de_amplifier'])
             adjusted_sentiment *= max(0.1, de_amplification_factor)
 
         # Adversative conjunctions weaken sentiment
         if adversative_strength > 0:
-            adversative_factor = 1 - (adversative_strength * 0.4)  # Retained at 0.4
+            adversative_factor = 1 - (adversative_strength * self.scoring_weights['adversative'])
             adjusted_sentiment *= max(0.1, adversative_factor)
 
-        # Uncertainty words reduce sentiment intensity
-        uncertainty_words_in_sentence = [w for w in sentence_words if w in self.uncertainty_words]
-        if uncertainty_words_in_sentence:
-            uncertainty_factor = max(0.3, 1 - len(uncertainty_words_in_sentence) * 0.2)
+        # Uncertainty words and phrases reduce sentiment intensity
+        uncertainty_count = valence_summary['uncertainty_count']
+        if uncertainty_count:
+            uncertainty_factor = max(0.3, 1 - uncertainty_count * self.scoring_weights['uncertainty'])
             adjusted_sentiment *= uncertainty_factor
 
         return max(-1.0, min(1.0, adjusted_sentiment))
 
+    def count_syllables(self, word):
+        """Approximate syllable count used by the readability metrics"""
+        vowels = 'aeiouy'
+        count = sum(1 for char in word.lower() if char in vowels)
+        if word.endswith('e'):
+            count -= 1
+        return max(1, count)
+
     def calculate_readability_metrics(self, text):
         """Calculate readability metrics"""
         sentences = sent_tokenize(text)
         words = word_tokenize(text.lower())
         words = [w for w in words if w.isalpha()]
+        syllables = [self.count_syllables(word) for word in words]
+        return self.readability_from_counts(
+            len(sentences), len(words), sum(syllables), sum(1 for count in syllables if count >= 3)
+        )
 
-        if not sentences or not words:
-            return {'fog_index': 0, 'flesch_kincaid': 0, 'avg_sentence_length': 0}
-
-        def count_syllables(word):
-            vowels = 'aeiouy'
-            count = sum(1 for char in word.lower() if char in vowels)
-            if word.endswith('e'):
-                count -= 1
-            return max(1, count)
+    def readability_from_sentence_results(self, sentence_results):
+        """Readability metrics from the word counts recorded on sentence results, without re-tokenizing"""
+        return self.readability_from_counts(
+            len(sentence_results),
+            sum(s['alpha_word_count'] for s in sentence_results),
+            sum(s['syllable_count'] for s in sentence_results),
+            sum(s['complex_word_count'] for s in sentence_results)
+        )
 
-        total_syllables = sum(count_syllables(word) for word in words)
-        complex_words = sum(1 for word in words if count_syllables(word) >= 3)
+    def readability_from_counts(self, total_sentences, total_words, total_syllables, complex_words):
+        """Fog index and Flesch-Kincaid grade from sentence, word and syllable totals"""
+        if not total_sentences or not total_words:
+            return {'fog_index': 0, 'flesch_kincaid': 0, 'avg_sentence_length': 0}
 
-        avg_sentence_length = len(words) / len(sentences)
-        avg_syllables_per_word = total_syllables / len(words)
+        avg_sentence_length = total_words / total_sentences
+        avg_syllables_per_word = total_syllables / total_words
 
-        fog_index = 0.4 * (avg_sentence_length + 100 * (complex_words / len(words)))
+        fog_index = 0.4 * (avg_sentence_length + 100 * (complex_words / total_words))
         flesch_kincaid = 0.39 * avg_sentence_length + 11.8 * avg_syllables_per_word - 15.59
 
         return {
             'fog_index': fog_index,
             'flesch_kincaid': flesch_kincaid,
             'avg_sentence_length': avg_sentence_length,
-            'complex_words_ratio': complex_words / len(words),
+            'complex_words_ratio': complex_words / total_words,
             'avg_syllables_per_word': avg_syllables_per_word,
-            'total_sentences': len(sentences),
-            'total_words': len(words)
+            'total_sentences': total_sentences,
+            'total_words': total_words
         }
 
     def calculate_sentiment_complexity_score(self, sentence_results, document_sentiment):
@@ -625,16 +724,35 @@ class BankruptcyAwareFinBERTAnalyzer:
         if not sentence.strip():
             return None
 
-        finbert_result = self.get_finbert_sentiment(sentence)
+        return self._build_sentence_result(sentence, self.get_finbert_sentiment(sentence))
+
+    def analyze_sentences(self, sentences, batch_size=32):
+        """Analyze a list of sentences, scoring them with FinBERT in batches.
+
+        Returns a list aligned with ``sentences``; blank sentences map to None.
+        """
+        to_score = [i for i, sentence in enumerate(sentences) if sentence.strip()]
+        finbert_results = self.get_finbert_sentiment_batch([sentences[i] for i in to_score], batch_size=batch_size)
+
+        results = [None] * len(sentences)
+        for i, finbert_result in zip(to_score, finbert_results):
+            results[i] = self._build_sentence_result(sentences[i], finbert_result)
+        return results
+
+    def _build_sentence_result(self, sentence, finbert_result):
+        """Combine a FinBERT result with lexicon risk scoring and valence shifters for one sentence"""
         risk_result = self.calculate_risk_sentiment(sentence)
-        shifters, sentence_words = self.find_valence_shifters_in_sentence(sentence)
+        shifters, sentence_words, valence_summary = self.match_valence_shifters(sentence)
         final_sentiment = self.apply_valence_adjustment(
             finbert_result['sentiment_score'],
             risk_result,
             shifters,
-            sentence_words
+            sentence_words,
+            valence_summary
         )
 
+        syllables = [self.count_syllables(word) for word in sentence_words if word.isalpha()]
+
         indicators_by_category = {}
         for ind in risk_result['indicators']:
             category = ind['category']
@@ -653,51 +771,287 @@ class BankruptcyAwareFinBERTAnalyzer:
             'final_sentiment_score': final_sentiment,
             'finbert_confidence': finbert_result['confidence'],
             'risk_confidence': risk_result['risk_confidence'],
-            'word_count': len(sentence_words)
+            'word_count': len(sentence_words),
+            # Readability inputs, so documents need not be re-tokenized
+            'alpha_word_count': len(syllables),
+            'syllable_count': sum(syllables),
+            'complex_word_count': sum(1 for count in syllables if count >= 3),
+            'lexicon_version': self.lexicon_version
         }
 
-    def analyze_text(self, text):
+    def tokenize_sentences(self, text, splitter=None):
+        """Split text into cleaned sentences with the 'punkt' or 'regex' splitter (default: self.sentence_splitter)"""
+        splitter = splitter or self.sentence_splitter
+        if splitter == 'punkt':
+            return sent_tokenize(self.preprocess_text(text))
+        if splitter == 'regex':
+            # The regex splitter needs bullets and line breaks, so it runs before cleaning
+            return [self.preprocess_text(sentence) for sentence in split_financial_sentences(text)]
+        raise ValueError(f"Unknown sentence splitter '{splitter}', expected 'punkt' or 'regex'")
+
+    def split_sentences(self, text, splitter=None):
+        """Preprocess a document and split it into the sentences that analyze_text scores"""
+        return [sentence for sentence in self.tokenize_sentences(text, splitter) if len(sentence.strip()) > 10]
+
+    def split_sentences_with_spans(self, text, splitter=None):
+        """
+        Split like split_sentences, pairing each sentence with its (start, end) offsets in ``text``.
+
+        Sentences are located in the cleaned text and mapped back through a
+        TextOffsetMap; the span is None if a sentence cannot be located.
+        """
+        splitter = splitter or self.sentence_splitter
+        clean_text, offsets = self.preprocess_text_with_offsets(text)
+        if splitter == 'punkt':
+            sentences = sent_tokenize(clean_text)
+        else:
+            sentences = self.tokenize_sentences(text, splitter)
+
+        spans = []
+        cursor = 0
+        for sentence in sentences:
+            if len(sentence.strip()) <= 10:
+                continue
+            sentence = sentence.strip()
+            start = clean_text.find(sentence, cursor)
+            if start < 0:
+                spans.append((sentence, None))
+                continue
+            cursor = start + len(sentence)
+            spans.append((sentence, offsets.span(start, cursor)))
+        return spans
+
+    def analyze_text(self, text, batch_size=32, splitter=None):
         """Main function to analyze financial text with bankruptcy-aware sentiment"""
         if not text or not isinstance(text, str):
             return None
 
-        clean_text = self.preprocess_text(text)
-        sentences = sent_tokenize(clean_text)
+        sentences = self.split_sentences_with_spans(text, splitter)
+        sentence_results = []
+
+        print(f"Analyzing {len(sentences)} sentences with Bankruptcy-Aware FinBERT...")
+
+        start = 0
+        while start < len(sentences):
+            step = self.batch_sizer.batch_size if self.batch_sizer else batch_size
+            batch = sentences[start:start + step]
+            batch_results = self.analyze_sentences([sentence for sentence, _ in batch], batch_size=batch_size)
+            for (_, span), result in zip(batch, batch_results):
+                if result:
+                    # (start, end) of the sentence in ``text``
+                    result['source_span'] = span
+                    sentence_results.append(result)
+            start += len(batch)
+            print(f"Processed {start}/{len(sentences)} sentences...")
+
+        document = self.aggregate_sentence_results(sentence_results)
+        if self.batch_sizer:
+            document['batch_sizing'] = self.batch_sizer.report()
+        return document
+
+    def analyze_text_approximate(self, text, sample_size=200, confidence=0.95, decision_threshold=0.0,
+                                 n_strata=10, batch_size=32, splitter=None, seed=0):
+        """
+        Estimate analyze_text's document scores from a stratified sample of sentences.
+
+        Every sentence is scanned with the (cheap) risk lexicon and financial-metric
+        patterns; sentences with hits are always scored, so bankruptcy_risk_score and
+        economic_headwinds_score are exact. The remaining sentences are split into
+        ``n_strata`` contiguous blocks and about ``sample_size`` of them are sampled
+        in proportion to block size. document_sentiment_score is estimated with a
+        stratified ratio estimator and a normal-approximation confidence interval.
+
+        If the interval contains ``decision_threshold`` (0.0 is the Positive/Negative
+        boundary), the document is escalated to a full analyze_text, which reuses the
+        sampled sentences' FinBERT results from the cache. Either way the result has
+        an 'approximation' entry with the estimate, interval and sample sizes.
+
+        Without escalation, total_sentences_analyzed, the valence shifter count and
+        readability cover every sentence, but sentence_details holds only the scored
+        sentences and the fields listed in approximation['sample_estimates']
+        (sentiment spread, complexity and FinBERT confidence) come from them, so
+        they lean towards the risk sentences scored in full.
+        """
+        if not text or not isinstance(text, str):
+            return None
+
+        sentences = [sentence for sentence, _ in self.split_sentences_with_spans(text, splitter)]
+        total = len(sentences)
+        census = []
+        rest = []
+        risk_flags = critical_risk_count = economic_headwinds_count = 0
+        for i, sentence in enumerate(sentences):
+            indicators = self.find_risk_indicators(sentence)
+            if indicators or self.find_financial_metrics(sentence):
+                census.append(i)
+                risk_flags += 1
+                categories = {indicator['category'] for indicator in indicators}
+                critical_risk_count += 'critical_bankruptcy' in categories
+                economic_headwinds_count += 'economic_headwinds' in categories
+            else:
+                rest.append(i)
+
+        approximation = {
+            'total_sentences': total,
+            'census_sentences': len(census),
+            'confidence': confidence,
+            'decision_threshold': decision_threshold
+        }
+        if len(rest) <= sample_size:
+            result = self.analyze_text(text, batch_size=batch_size, splitter=splitter)
+            if result is not None:
+                approximation.update({'escalated': False, 'exact': True, 'scored_sentences': total})
+                result['approximation'] = approximation
+            return result
+
+        rng = np.random.default_rng(seed)
+        strata = np.array_split(np.array(rest), max(1, min(n_strata, sample_size // 2)))
+        samples = []
+        for stratum in strata:
+            n = min(len(stratum), max(2, round(sample_size * len(stratum) / len(rest))))
+            samples.append(np.sort(rng.choice(stratum, size=n, replace=False)))
+
+        to_score = census + [int(i) for sample in samples for i in sample]
+        print(f"Scoring {len(to_score)} of {total} sentences ({len(census)} with risk hits, "
+              f"{len(to_score) - len(census)} sampled)...")
+        scored = dict(zip(to_score, self.analyze_sentences([sentences[i] for i in to_score], batch_size=batch_size)))
+
+        def weighted(indices):
+            weights = np.array([self.sentence_weight(scored[i]) for i in indices])
+            scores = np.array([scored[i]['final_sentiment_score'] for i in indices])
+            return weights * scores, weights
+
+        census_y, census_x = weighted(census)
+        y_total, x_total = census_y.sum(), census_x.sum()
+        stratum_samples = []
+        for stratum, sample in zip(strata, samples):
+            y, x = weighted(sample)
+            y_total += len(stratum) * y.mean()
+            x_total += len(stratum) * x.mean()
+            stratum_samples.append((len(stratum), y, x))
+        estimate = float(y_total / x_total) if x_total > 0 else 0.0
+
+        variance = 0.0
+        for population, y, x in stratum_samples:
+            if len(y) > 1 and population > len(y):
+                residuals = y - estimate * x
+                variance += population ** 2 * (1 - len(y) / population) * residuals.var(ddof=1) / len(y)
+        standard_error = float(math.sqrt(variance) / x_total) if x_total > 0 else 0.0
+        margin = NormalDist().inv_cdf((1 + confidence) / 2) * standard_error
+        interval = (estimate - margin, estimate + margin)
+
+        bankruptcy_risk = min(1.0, (risk_flags + critical_risk_count * 1.5) / total * 5)
+        approximation.update({
+            'exact': False,
+            'scored_sentences': len(to_score),
+            'document_sentiment_estimate': estimate,
+            'document_sentiment_ci': interval,
+            'bankruptcy_risk_ci': (bankruptcy_risk, bankruptcy_risk)
+        })
+
+        if interval[0] <= decision_threshold <= interval[1]:
+            print(f"Sentiment interval [{interval[0]:.3f}, {interval[1]:.3f}] contains {decision_threshold}; "
+                  f"running full analysis")
+            result = self.analyze_text(text, batch_size=batch_size, splitter=splitter)
+            approximation['escalated'] = True
+            result['approximation'] = approximation
+            return result
+
+        # Lexicon-only document totals, exact without FinBERT
+        shifter_count = alpha_words = syllable_total = complex_words = 0
+        for sentence in sentences:
+            shifters, sentence_words, _ = self.match_valence_shifters(sentence)
+            shifter_count += len(shifters)
+            syllables = [self.count_syllables(word) for word in sentence_words if word.isalpha()]
+            alpha_words += len(syllables)
+            syllable_total += sum(syllables)
+            complex_words += sum(1 for count in syllables if count >= 3)
+        readability = self.readability_from_counts(total, alpha_words, syllable_total, complex_words)
+
+        result = self.aggregate_sentence_results([scored[i] for i in to_score if scored[i]])
+        result.update({
+            'total_sentences_analyzed': total,
+            'valence_shifter_frequency': shifter_count,
+            'fog_index': readability['fog_index'],
+            'flesch_kincaid_score': readability['flesch_kincaid'],
+            'readability_metrics': readability,
+            'document_sentiment_score': estimate,
+            'sentiment_classification': "Negative" if estimate < 0 else "Positive",
+            'bankruptcy_risk_score': bankruptcy_risk,
+            'economic_headwinds_score': min(1.0, economic_headwinds_count / total * 3),
+            'sentences_with_risk_flags': risk_flags,
+            'sentences_with_economic_headwinds': economic_headwinds_count,
+            'sentences_with_critical_risk': critical_risk_count
+        })
+        approximation['escalated'] = False
+        approximation['sample_estimates'] = ['sentiment_std', 'sentiment_range', 'sentiment_complexity_score',
+                                             'avg_finbert_confidence']
+        result['approximation'] = approximation
+        return result
+
+    def analyze_sentence_stream(self, sentences, batch_size=32):
+        """
+        Analyze sentences arriving from an iterator (e.g. edgar.iter_mda_sentences) in batches.
 
+        Readability is computed from the analyzed sentences since the source text is
+        never held in memory as a whole.
+        """
         sentence_results = []
+        batch = []
+        for sentence in sentences:
+            batch.append(sentence)
+            if len(batch) == batch_size:
+                sentence_results.extend(result for result in self.analyze_sentences(batch, batch_size) if result)
+                batch = []
+        if batch:
+            sentence_results.extend(result for result in self.analyze_sentences(batch, batch_size) if result)
+
+        if not sentence_results:
+            return None
+        print(f"Analyzed {len(sentence_results)} streamed sentences with Bankruptcy-Aware FinBERT")
+        return self.aggregate_sentence_results(sentence_results)
+
+    def sentence_weight(self, result):
+        """Weight of a sentence result in the document score: length x FinBERT confidence plus risk confidence"""
+        base_weight = result['word_count'] * result['finbert_confidence']
+        risk_weight = result['risk_confidence'] * 1.5
+        if 'critical_bankruptcy' in result['risk_indicators_by_category']:
+            risk_weight *= 1.5
+        elif 'high_risk' in result['risk_indicators_by_category']:
+            risk_weight *= 1.2
+        return base_weight + risk_weight
+
+    def aggregate_sentence_results(self, sentence_results, text=None):
+        """
+        Combine sentence-level results into the document-level analyze_text result.
+
+        Readability comes from the per-sentence word counts; ``text`` (or the joined
+        sentences) is only re-tokenized for results that predate those counts.
+        """
         total_sentiment = 0.0
         total_weights = 0.0
         risk_flags = 0
         economic_headwinds_count = 0
         critical_risk_count = 0
 
-        print(f"Analyzing {len(sentences)} sentences with Bankruptcy-Aware FinBERT...")
-
-        for i, sentence in enumerate(sentences):
-            if len(sentence.strip()) > 10:
-                result = self.analyze_sentence(sentence)
-                if result:
-                    sentence_results.append(result)
-                    base_weight = result['word_count'] * result['finbert_confidence']
-                    risk_weight = result['risk_confidence'] * 1.5
-                    if 'critical_bankruptcy' in result['risk_indicators_by_category']:
-                        risk_weight *= 1.5
-                    elif 'high_risk' in result['risk_indicators_by_category']:
-                        risk_weight *= 1.2
-                    total_weight = base_weight + risk_weight
-                    total_sentiment += result['final_sentiment_score'] * total_weight
-                    total_weights += total_weight
-                    if result['risk_indicators'] or result['financial_metrics']:
-                        risk_flags += 1
-                    if 'economic_headwinds' in result['risk_indicators_by_category']:
-                        economic_headwinds_count += 1
-                    if 'critical_bankruptcy' in result['risk_indicators_by_category']:
-                        critical_risk_count += 1
-                if (i + 1) % 10 == 0:
-                    print(f"Processed {i + 1}/{len(sentences)} sentences...")
+        for result in sentence_results:
+            total_weight = self.sentence_weight(result)
+            total_sentiment += result['final_sentiment_score'] * total_weight
+            total_weights += total_weight
+            if result['risk_indicators'] or result['financial_metrics']:
+                risk_flags += 1
+            if 'economic_headwinds' in result['risk_indicators_by_category']:
+                economic_headwinds_count += 1
+            if 'critical_bankruptcy' in result['risk_indicators_by_category']:
+                critical_risk_count += 1
 
         document_sentiment = total_sentiment / total_weights if total_weights > 0 else 0.0
-        readability = self.calculate_readability_metrics(text)
+        if all('syllable_count' in s for s in sentence_results):
+            readability = self.readability_from_sentence_results(sentence_results)
+        else:
+            readability = self.calculate_readability_metrics(
+                text if text is not None else ' '.join(s['sentence'] for s in sentence_results)
+            )
         sentiment_complexity = self.calculate_sentiment_complexity_score(sentence_results, document_sentiment)
 
         def classify_sentiment(score):
@@ -742,34 +1096,88 @@ class BankruptcyAwareFinBERTAnalyzer:
             'fog_index': readability['fog_index'],
             'flesch_kincaid_score': readability['flesch_kincaid'],
             'readability_metrics': readability,
+            'lexicon_version': self.lexicon_version,
             'sentence_details': sentence_results
         }
 
+    def update_scoring_weights(self, scoring_weights=None, category_weights=None):
+        """Override blend/shifter factors and risk category weights, e.g. with values found by tuning.py"""
+        unknown = set(scoring_weights or {}) - set(self.scoring_weights)
+        if unknown:
+            raise ValueError(f"Unknown scoring weights: {sorted(unknown)}")
+        self.scoring_weights.update(scoring_weights or {})
+        self.category_weights.update(category_weights or {})
+
+    def evaluate_labeled_sentences(self, examples, batch_size=32):
+        """
+        Score labeled sentences with batched inference and compute calibration metrics.
+
+        ``examples`` is a list of dicts (or a DataFrame) with 'text', 'target_sentiment'
+        and optionally 'category'. Returns a dict with the per-sentence DataFrame, a
+        per-category metrics DataFrame and overall metrics.
+        """
+        examples = pd.DataFrame(examples).reset_index(drop=True)
+        if 'category' not in examples:
+            examples['category'] = 'uncategorized'
+        examples['category'] = examples['category'].fillna('uncategorized')
+
+        texts = examples['text'].fillna('').astype(str).tolist()
+        sentence_results = self.analyze_sentences(texts, batch_size=batch_size)
+        scored = [i for i, result in enumerate(sentence_results) if result]
+
+        per_sentence = pd.DataFrame({
+            'sentence_id': scored,
+            'category': examples['category'].to_numpy()[scored],
+            'target_score': examples['target_sentiment'].to_numpy(dtype=float)[scored],
+            'actual_score': [sentence_results[i]['final_sentiment_score'] for i in scored],
+            'finbert_base_score': [sentence_results[i]['finbert_base_score'] for i in scored],
+            'risk_score': [sentence_results[i]['risk_score'] for i in scored],
+            'risk_indicators': [sentence_results[i]['risk_indicators'] for i in scored],
+            'financial_metrics': [sentence_results[i]['financial_metrics'] for i in scored],
+            'valence_shifters': [sentence_results[i]['valence_shifters'] for i in scored],
+            'text_preview': [texts[i][:60] + "..." for i in scored]
+        })
+        signed_error = per_sentence['actual_score'].to_numpy() - per_sentence['target_score'].to_numpy()
+        per_sentence['signed_error'] = signed_error
+        per_sentence['error'] = np.abs(signed_error)
+        per_sentence['squared_error'] = signed_error ** 2
+        per_sentence['sign_match'] = (per_sentence['actual_score'] < 0) == (per_sentence['target_score'] < 0)
+
+        by_category = per_sentence.groupby('category').agg(
+            count=('error', 'size'),
+            mae=('error', 'mean'),
+            mse=('squared_error', 'mean'),
+            bias=('signed_error', 'mean'),
+            max_error=('error', 'max'),
+            sign_accuracy=('sign_match', 'mean')
+        )
+        by_category['rmse'] = np.sqrt(by_category.pop('mse'))
+        by_category = by_category.sort_values('mae', ascending=False)
+
+        overall = {
+            'count': len(per_sentence),
+            'mae': float(per_sentence['error'].mean()) if len(per_sentence) else 0.0,
+            'rmse': float(np.sqrt(per_sentence['squared_error'].mean())) if len(per_sentence) else 0.0,
+            'bias': float(per_sentence['signed_error'].mean()) if len(per_sentence) else 0.0,
+            'sign_accuracy': float(per_sentence['sign_match'].mean()) if len(per_sentence) else 0.0
+        }
+
+        return {
+            'per_sentence': per_sentence,
+            'by_category': by_category,
+            'overall': overall
+        }
+
     def evaluate_training_sentences(self):
         """Evaluate the model on training sentences to check calibration"""
         print("\n🎯 Evaluating model on training sentences...")
 
-        results = []
-        for i, training_example in enumerate(self.training_sentences):
-            result = self.analyze_sentence(training_example['text'])
-            if result:
-                actual_score = result['final_sentiment_score']
-                target_score = training_example['target_sentiment']
-                error = abs(actual_score - target_score)
-                results.append({
-                    'sentence_id': i,
-                    'category': training_example['category'],
-                    'target_score': target_score,
-                    'actual_score': actual_score,
-                    'error': error,
-                    'risk_indicators': result['risk_indicators'],
-                    'financial_metrics': result['financial_metrics'],
-                    'valence_shifters': result['valence_shifters'],
-                    'text_preview': training_example['text'][:60] + "..."
-                })
-
-        total_error = sum(r['error'] for r in results)
-        avg_error = total_error / len(results) if results else 0
+        evaluation = self.evaluate_labeled_sentences(self.training_sentences)
+        results = evaluation['per_sentence'][[
+            'sentence_id', 'category', 'target_score', 'actual_score', 'error',
+            'risk_indicators', 'financial_metrics', 'valence_shifters', 'text_preview'
+        ]].to_dict('records')
+        avg_error = evaluation['overall']['mae']
 
         print(f"📊 Average Error: {avg_error:.3f}")
         print(f"📈 Model Accuracy: {max(0, 1 - avg_error):.1%}")
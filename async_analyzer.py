@@ -0,0 +1,182 @@
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncAnalyzer:
+    """
+    asyncio front end for a BankruptcyAwareFinBERTAnalyzer.
+
+    Model inference runs on a single dedicated thread, so the FinBERT cache and the
+    model are never used concurrently; sentence splitting, lexicon scoring and
+    aggregation run on a small scoring pool. Sentences from all in-flight calls
+    go into one queue that a background task drains into shared FinBERT batches:
+    while a batch is in the model, new sentences accumulate for the next one, and
+    a lone caller waits at most ``max_batch_delay`` seconds for company. At most
+    ``max_concurrency`` documents are analyzed at once.
+
+    Use as ``async with AsyncAnalyzer(analyzer) as scorer: await scorer.analyze_text(text)``.
+    """
+
+    def __init__(self, analyzer, max_concurrency=4, batch_size=32, max_batch_delay=0.005, scoring_workers=2):
+        self.analyzer = analyzer
+        self.batch_size = batch_size
+        self.max_batch_delay = max_batch_delay
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._inference_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='finbert')
+        self._scoring_executor = ThreadPoolExecutor(max_workers=scoring_workers, thread_name_prefix='scoring')
+        self._pending = []
+        self._has_pending = asyncio.Event()
+        self._batcher = None
+        self.stats = {'batches': 0, 'sentences': 0, 'largest_batch': 0}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Stop the batching task, fail sentences still queued and shut down the executors"""
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+        for _, future in self._pending:
+            if not future.done():
+                future.set_exception(RuntimeError("AsyncAnalyzer closed"))
+        self._pending = []
+        self._inference_executor.shutdown(wait=False, cancel_futures=True)
+        self._scoring_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _current_batch_size(self):
+        sizer = self.analyzer.batch_sizer
+        return sizer.batch_size if sizer is not None else self.batch_size
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._has_pending.wait()
+            if len(self._pending) < self._current_batch_size():
+                # Give other in-flight calls a moment to add their sentences
+                await asyncio.sleep(self.max_batch_delay)
+            size = self._current_batch_size()
+            batch, self._pending = self._pending[:size], self._pending[size:]
+            if not self._pending:
+                self._has_pending.clear()
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            self.stats['batches'] += 1
+            self.stats['sentences'] += len(batch)
+            self.stats['largest_batch'] = max(self.stats['largest_batch'], len(batch))
+            try:
+                results = await loop.run_in_executor(
+                    self._inference_executor, self.analyzer.get_finbert_sentiment_batch,
+                    [text for text, _ in batch], len(batch)
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def get_finbert_sentiment_batch(self, texts):
+        """FinBERT results for ``texts``, scored in batches shared with other in-flight calls"""
+        if not texts:
+            return []
+        loop = asyncio.get_running_loop()
+        if self._batcher is None or self._batcher.done():
+            self._batcher = loop.create_task(self._run_batches())
+        futures = [loop.create_future() for _ in texts]
+        self._pending.extend(zip(texts, futures))
+        self._has_pending.set()
+        return await asyncio.gather(*futures)
+
+    def _build_sentence_results(self, sentences, to_score, finbert_results):
+        results = [None] * len(sentences)
+        for i, finbert_result in zip(to_score, finbert_results):
+            results[i] = self.analyzer._build_sentence_result(sentences[i], finbert_result)
+        return results
+
+    async def _analyze_sentences(self, sentences):
+        to_score = [i for i, sentence in enumerate(sentences) if sentence.strip()]
+        finbert_results = await self.get_finbert_sentiment_batch([sentences[i] for i in to_score])
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._scoring_executor, self._build_sentence_results,
+                                          sentences, to_score, finbert_results)
+
+    async def analyze_sentences(self, sentences):
+        """Async analyze_sentences: results aligned with ``sentences``, None for blank ones"""
+        async with self._semaphore:
+            return await self._analyze_sentences(list(sentences))
+
+    async def analyze_sentence(self, sentence):
+        """Async analyze_sentence"""
+        return (await self.analyze_sentences([sentence]))[0]
+
+    async def analyze_text(self, text, splitter=None):
+        """Async analyze_text; concurrent calls share FinBERT batches"""
+        if not text or not isinstance(text, str):
+            return None
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            sentences = await loop.run_in_executor(self._scoring_executor, self.analyzer.split_sentences_with_spans,
+                                                   text, splitter)
+            results = await self._analyze_sentences([sentence for sentence, _ in sentences])
+            sentence_results = []
+            for (_, span), result in zip(sentences, results):
+                if result:
+                    result['source_span'] = span
+                    sentence_results.append(result)
+            return await loop.run_in_executor(self._scoring_executor, self.analyzer.aggregate_sentence_results,
+                                              sentence_results)
+
+
+async def _analyze_documents(analyzer, texts, max_concurrency, batch_size):
+    async with AsyncAnalyzer(analyzer, max_concurrency=max_concurrency, batch_size=batch_size) as scorer:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(scorer.analyze_text(text) for text in texts.values()))
+        elapsed = time.perf_counter() - started
+        stats = dict(scorer.stats)
+    return results, elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze documents concurrently through the asyncio API")
+    parser.add_argument('paths', nargs='*', help="Text files to analyze (default: the dashboard's sample companies)")
+    parser.add_argument('--concurrency', type=int, default=4, help="Documents analyzed at once")
+    parser.add_argument('--batch-size', type=int, default=32, help="FinBERT inference batch size")
+    args = parser.parse_args()
+
+    from analyzer import BankruptcyAwareFinBERTAnalyzer
+
+    if args.paths:
+        texts = {}
+        for path in args.paths:
+            with open(path, encoding='utf-8', errors='ignore') as f:
+                texts[path] = f.read()
+    else:
+        from sample_data import company_data
+        texts = company_data
+
+    analyzer = BankruptcyAwareFinBERTAnalyzer()
+    results, elapsed, stats = asyncio.run(_analyze_documents(analyzer, texts, args.concurrency, args.batch_size))
+    for name, result in zip(texts, results):
+        if result:
+            print(f"{name}: sentiment {result['document_sentiment_score']:.3f}, "
+                  f"bankruptcy risk {result['bankruptcy_risk_score']:.3f}")
+    print(f"\n⚡ {len(texts)} documents in {elapsed:.2f}s: {stats['sentences']} sentences in {stats['batches']} "
+          f"shared batches (largest {stats['largest_batch']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import os
+from collections import Counter
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def memory_budget_mb(fraction=0.8):
+    """``fraction`` of the container memory limit, or of physical memory when there is none"""
+    limit = None
+    try:
+        with open('/sys/fs/cgroup/memory.max') as f:
+            value = f.read().strip()
+        if value != 'max':
+            limit = int(value) / (1024 * 1024)
+    except (OSError, ValueError):
+        pass
+    if limit is None:
+        try:
+            limit = os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+        except (OSError, ValueError, AttributeError):
+            return None
+    return limit * fraction
+
+
+def is_out_of_memory(error):
+    """Whether an inference error was the allocator running out of memory"""
+    return isinstance(error, MemoryError) or (isinstance(error, RuntimeError) and 'out of memory' in str(error).lower())
+
+
+class AdaptiveBatchSizer:
+    """
+    Choose the FinBERT batch size from measured batch latency, throughput and RSS.
+
+    The size is hill-climbed: after ``probe_batches`` batches at one size it grows
+    by ``growth`` while token throughput improves by more than ``tolerance`` and the
+    projected RSS (activation memory scales with batch size) stays under the memory
+    budget; if throughput falls, it steps back and caps growth there until
+    ``reprobe_interval`` batches later. A batch slower than ``max_latency`` seconds
+    or an out-of-memory error halve the size immediately, as does RSS over the
+    budget that has risen since the current size was set (including the starting
+    size); RSS is process-wide (model, caches), so memory already over budget
+    before a size took effect does not shrink it on its own. A memory back-off
+    also caps growth. report() gives the sizes used.
+    """
+
+    def __init__(self, initial=32, min_size=4, max_size=256, memory_limit_mb=None, max_latency=5.0,
+                 growth=2, tolerance=0.05, probe_batches=2, reprobe_interval=50):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.batch_size = max(min_size, min(initial, max_size))
+        self.memory_limit_mb = memory_limit_mb or memory_budget_mb()
+        self.max_latency = max_latency
+        self.growth = growth
+        self.tolerance = tolerance
+        self.probe_batches = probe_batches
+        self.reprobe_interval = reprobe_interval
+
+        self.baseline_rss_mb = current_rss_mb()
+        self.peak_rss_mb = self.baseline_rss_mb
+        self.ceiling = max_size
+        self.previous = None
+        # RSS when the current size took effect, to tell whether batches at this size raised memory
+        self.rss_at_resize = self.baseline_rss_mb
+        self.samples = []
+        self.throughput = {}
+        self.batches = 0
+        self.batches_since_cap = 0
+        self.sizes_used = Counter()
+        self.backoffs = Counter()
+        self.changes = []
+
+    def _resize(self, size, reason):
+        size = max(self.min_size, min(size, self.max_size))
+        if size != self.batch_size:
+            self.changes.append({'batch': self.batches, 'from': self.batch_size, 'to': size, 'reason': reason})
+            self.batch_size = size
+            self.rss_at_resize = current_rss_mb()
+        self.samples = []
+
+    def back_off(self, reason):
+        """Halve the batch size; memory pressure also caps later growth at the new size"""
+        self.backoffs[reason] += 1
+        if reason in ('memory', 'out_of_memory'):
+            self.ceiling = max(self.min_size, self.batch_size // 2)
+            self.batches_since_cap = 0
+        self.previous = None
+        self._resize(self.batch_size // 2, reason)
+
+    def record(self, sentences, tokens, seconds):
+        """Account for one finished batch of ``sentences`` holding ``tokens`` real (unpadded) tokens"""
+        self.batches += 1
+        self.batches_since_cap += 1
+        self.sizes_used[sentences] += 1
+        rss = current_rss_mb()
+        self.peak_rss_mb = max(self.peak_rss_mb, rss)
+
+        if self.memory_limit_mb and rss > self.memory_limit_mb and rss > self.rss_at_resize:
+            self.back_off('memory')
+            return
+        if seconds > self.max_latency and self.batch_size > self.min_size:
+            self.back_off('latency')
+            return
+        if sentences < self.batch_size:
+            # A short final batch says little about this size
+            return
+
+        self.samples.append(tokens / seconds if seconds > 0 else 0.0)
+        if len(self.samples) < self.probe_batches:
+            return
+        throughput = sum(self.samples) / len(self.samples)
+        self.throughput[self.batch_size] = throughput
+
+        if self.ceiling < self.max_size and self.batches_since_cap >= self.reprobe_interval:
+            self.ceiling = self.max_size
+        if self.previous is not None and throughput < self.throughput.get(self.previous, 0.0) * (1 - self.tolerance):
+            self.ceiling = self.previous
+            self.batches_since_cap = 0
+            size, self.previous = self.previous, None
+            self._resize(size, 'throughput')
+            return
+
+        grown = self.batch_size * self.growth
+        projected_rss = self.baseline_rss_mb + (rss - self.baseline_rss_mb) * self.growth
+        improved = self.previous is None or throughput > self.throughput.get(self.previous, 0.0) * (1 + self.tolerance)
+        if (grown <= self.ceiling and improved
+                and (not self.memory_limit_mb or projected_rss <= self.memory_limit_mb)):
+            self.previous = self.batch_size
+            self._resize(grown, 'growth')
+        else:
+            self.samples = []
+
+    def report(self):
+        """Sizes chosen so far, why they changed and measured throughput per size"""
+        return {
+            'batch_size': self.batch_size,
+            'batches': self.batches,
+            'sizes_used': dict(sorted(self.sizes_used.items())),
+            'tokens_per_second': {size: round(value, 1) for size, value in sorted(self.throughput.items())},
+            'backoffs': dict(self.backoffs),
+            'changes': list(self.changes),
+            'peak_rss_mb': round(self.peak_rss_mb, 1),
+            'memory_limit_mb': round(self.memory_limit_mb, 1) if self.memory_limit_mb else None
+        }
+
+
+def print_batch_report(report, label=None):
+    print(f"\n📦 Adaptive batching{f' ({label})' if label else ''}: {report['batches']} batches, now {report['batch_size']} sentences "
+          f"(peak RSS {report['peak_rss_mb']:.0f} MB of {report['memory_limit_mb'] or 0:.0f} MB budget)")
+    print("   Sizes used: " + ", ".join(f"{size}×{count}" for size, count in report['sizes_used'].items()))
+    if report['tokens_per_second']:
+        print("   Tokens/s: " + ", ".join(f"{size}: {value:.0f}" for size, value in report['tokens_per_second'].items()))
+    for change in report['changes']:
+        print(f"   Batch {change['batch']}: {change['from']} -> {change['to']} ({change['reason']})")
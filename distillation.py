@@ -0,0 +1,219 @@
+import argparse
+import copy
+import json
+import os
+import re
+import time
+import numpy as np
+import torch
+from transformers import AutoModelForSequenceClassification
+
+LABELS = ('negative', 'neutral', 'positive')
+
+
+def collect_corpus_sentences(analyzer, path):
+    """Split every filing under ``path`` (see trends.load_filing_directory) into unique analyzer sentences"""
+    from trends import load_filing_directory
+
+    sentences = {}
+    for filings in load_filing_directory(path).values():
+        for _, text in filings:
+            for sentence in analyzer.split_sentences(text):
+                sentences.setdefault(sentence.strip(), None)
+    return list(sentences)
+
+
+def teacher_logits(analyzer, sentences, batch_size=32):
+    """Raw teacher logits for each sentence, shape (len(sentences), num_labels)"""
+    logits = []
+    for start in range(0, len(sentences), batch_size):
+        inputs = analyzer._tokenize_for_finbert(sentences[start:start + batch_size])
+        with torch.no_grad():
+            logits.append(analyzer.model(**inputs).logits.numpy())
+    return np.concatenate(logits) if logits else np.zeros((0, analyzer.model.config.num_labels), dtype=np.float32)
+
+
+def build_student(teacher_model, num_layers=4, hidden_size=None):
+    """
+    Smaller copy of the teacher's architecture.
+
+    With the teacher's hidden size the student starts from the teacher's embeddings,
+    classifier and evenly spaced encoder layers; a smaller ``hidden_size`` (with one
+    attention head per 64 dimensions) starts from random weights.
+    """
+    config = copy.deepcopy(teacher_model.config)
+    config.num_hidden_layers = num_layers
+    if hidden_size and hidden_size != teacher_model.config.hidden_size:
+        config.hidden_size = hidden_size
+        config.num_attention_heads = max(1, hidden_size // 64)
+        config.intermediate_size = hidden_size * 4
+        return AutoModelForSequenceClassification.from_config(config)
+
+    student = AutoModelForSequenceClassification.from_config(config)
+    teacher_layers = np.linspace(0, teacher_model.config.num_hidden_layers - 1, num_layers).round().astype(int)
+    teacher_state = teacher_model.state_dict()
+    student_state = {}
+    for key in student.state_dict():
+        match = re.search(r'\.layer\.(\d+)\.', key)
+        source = key
+        if match:
+            source = key.replace(match.group(0), f".layer.{teacher_layers[int(match.group(1))]}.", 1)
+        student_state[key] = teacher_state[source]
+    student.load_state_dict(student_state)
+    return student
+
+
+def distill(analyzer, sentences, output_dir, num_layers=4, hidden_size=None, epochs=3,
+            batch_size=32, learning_rate=5e-5, temperature=2.0, seed=0):
+    """
+    Train a student to match the analyzer's model on ``sentences`` and save it to ``output_dir``.
+
+    The loss is the KL divergence between temperature-softened teacher and student
+    distributions (scaled by temperature squared). The saved directory holds the
+    student and the teacher's tokenizer, so it can be passed to
+    BankruptcyAwareFinBERTAnalyzer(model_name=...) or load_backend.
+    """
+    torch.manual_seed(seed)
+    rng = np.random.default_rng(seed)
+
+    print(f"Scoring {len(sentences)} sentences with the teacher ({analyzer.model_name})...")
+    targets = torch.softmax(torch.as_tensor(teacher_logits(analyzer, sentences, batch_size)) / temperature, dim=-1)
+
+    student = build_student(analyzer.model, num_layers=num_layers, hidden_size=hidden_size)
+    optimizer = torch.optim.AdamW(student.parameters(), lr=learning_rate)
+    student.train()
+    order = np.arange(len(sentences))
+    for epoch in range(epochs):
+        rng.shuffle(order)
+        total_loss = 0.0
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            inputs = analyzer._tokenize_for_finbert([sentences[i] for i in batch])
+            log_probs = torch.log_softmax(student(**inputs).logits / temperature, dim=-1)
+            loss = torch.nn.functional.kl_div(log_probs, targets[batch], reduction='batchmean') * temperature ** 2
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            total_loss += loss.item() * len(batch)
+        print(f"Epoch {epoch + 1}/{epochs}: distillation loss {total_loss / max(1, len(order)):.4f}")
+
+    student.eval()
+    os.makedirs(output_dir, exist_ok=True)
+    student.save_pretrained(output_dir)
+    analyzer.tokenizer.save_pretrained(output_dir)
+    with open(os.path.join(output_dir, 'distillation.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'teacher': analyzer.model_name,
+            'sentences': len(sentences),
+            'num_layers': num_layers,
+            'hidden_size': student.config.hidden_size,
+            'epochs': epochs,
+            'temperature': temperature
+        }, f, indent=2)
+    print(f"💾 Student saved to {output_dir}")
+    return student
+
+
+def _score_sentences(analyzer, sentences, batch_size):
+    """FinBERT results from a cold cache, and the sentences per second achieved"""
+    analyzer.finbert_cache.clear()
+    started = time.perf_counter()
+    results = analyzer.get_finbert_sentiment_batch(sentences, batch_size=batch_size)
+    elapsed = time.perf_counter() - started
+    return results, len(sentences) / elapsed if elapsed > 0 else 0.0
+
+
+def _label(result):
+    return int(np.argmax([result['negative_prob'], result['neutral_prob'], result['positive_prob']]))
+
+
+def agreement_report(teacher, student, texts, batch_size=32):
+    """
+    Compare a student analyzer against the teacher analyzer.
+
+    Sentence groups are the teacher's training_sentences and the sentences of
+    ``texts`` (e.g. sample_data.company_data). For each group: label agreement,
+    mean absolute difference of the FinBERT sentiment score, sign agreement of the
+    final (lexicon- and valence-adjusted) score, and sentences per second for both.
+    """
+    groups = {
+        'training_sentences': [example['text'] for example in teacher.training_sentences],
+        'company_texts': [sentence for text in texts for sentence in teacher.split_sentences(text)]
+    }
+
+    report = {}
+    for group, sentences in groups.items():
+        teacher_results, teacher_speed = _score_sentences(teacher, sentences, batch_size)
+        student_results, student_speed = _score_sentences(student, sentences, batch_size)
+        teacher_final = [teacher._build_sentence_result(s, r)['final_sentiment_score']
+                         for s, r in zip(sentences, teacher_results)]
+        student_final = [student._build_sentence_result(s, r)['final_sentiment_score']
+                         for s, r in zip(sentences, student_results)]
+        report[group] = {
+            'sentences': len(sentences),
+            'label_agreement': float(np.mean([_label(t) == _label(s) for t, s in zip(teacher_results, student_results)])),
+            'finbert_score_mae': float(np.mean([abs(t['sentiment_score'] - s['sentiment_score'])
+                                                for t, s in zip(teacher_results, student_results)])),
+            'final_sign_agreement': float(np.mean([(t < 0) == (s < 0) for t, s in zip(teacher_final, student_final)])),
+            'teacher_sentences_per_second': teacher_speed,
+            'student_sentences_per_second': student_speed,
+            'speedup': student_speed / teacher_speed if teacher_speed else 0.0
+        }
+
+    report['training_mae'] = {
+        'teacher': teacher.evaluate_labeled_sentences(teacher.training_sentences, batch_size)['overall']['mae'],
+        'student': student.evaluate_labeled_sentences(student.training_sentences, batch_size)['overall']['mae']
+    }
+    return report
+
+
+def print_agreement_report(report):
+    print("\n=== STUDENT VS TEACHER ===")
+    for group in ('training_sentences', 'company_texts'):
+        stats = report[group]
+        print(f"{group.replace('_', ' ').title()} ({stats['sentences']} sentences): "
+              f"label agreement {stats['label_agreement']:.1%}, FinBERT score MAE {stats['finbert_score_mae']:.3f}, "
+              f"final sign agreement {stats['final_sign_agreement']:.1%}")
+        print(f"  Teacher {stats['teacher_sentences_per_second']:.1f} sent/s, "
+              f"student {stats['student_sentences_per_second']:.1f} sent/s ({stats['speedup']:.1f}x)")
+    print(f"Training sentence MAE vs targets: teacher {report['training_mae']['teacher']:.3f}, "
+          f"student {report['training_mae']['student']:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distill FinBERT into a smaller student model for CPU screening")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train = subparsers.add_parser('train', help="Train a student on a local corpus of filings")
+    train.add_argument('corpus', help="Directory of filings (one company, or a directory of company directories)")
+    train.add_argument('output', help="Directory to save the student model")
+    train.add_argument('--layers', type=int, default=4, help="Student encoder layers")
+    train.add_argument('--hidden-size', type=int, help="Student hidden size (default: the teacher's)")
+    train.add_argument('--epochs', type=int, default=3)
+    train.add_argument('--batch-size', type=int, default=32)
+    train.add_argument('--learning-rate', type=float, default=5e-5)
+    train.add_argument('--temperature', type=float, default=2.0)
+
+    report = subparsers.add_parser('report', help="Agreement and speed of a student versus the teacher")
+    report.add_argument('student', help="Directory of a student saved by 'train'")
+    report.add_argument('--batch-size', type=int, default=32)
+    args = parser.parse_args()
+
+    from analyzer import BankruptcyAwareFinBERTAnalyzer
+
+    teacher = BankruptcyAwareFinBERTAnalyzer()
+    if args.command == 'train':
+        sentences = collect_corpus_sentences(teacher, args.corpus)
+        distill(teacher, sentences, args.output, num_layers=args.layers, hidden_size=args.hidden_size,
+                epochs=args.epochs, batch_size=args.batch_size, learning_rate=args.learning_rate,
+                temperature=args.temperature)
+        return
+
+    from sample_data import company_data
+
+    student = BankruptcyAwareFinBERTAnalyzer(model_name=args.student)
+    print_agreement_report(agreement_report(teacher, student, list(company_data.values()), args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
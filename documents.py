@@ -0,0 +1,82 @@
+import codecs
+import hashlib
+import os
+import re
+from striprtf.striprtf import rtf_to_text
+from edgar import iter_text_lines
+
+CHUNK_SIZE = 65536
+
+SUPPORTED_EXTENSIONS = ('.rtf', '.htm', '.html', '.txt')
+
+# RTF destinations holding images, embedded objects and theme data; they carry no
+# text but often make up most of a filing's bytes
+RTF_BINARY_GROUP = re.compile(
+    r'\{\\(?:\*\\)?(?:pict|shppict|nonshppict|object|objdata|blipuid|datastore|themedata|'
+    r'colorschememapping|latentstyles|xmlnstbl|rsidtbl|generator)\b'
+)
+
+
+def file_hash(data):
+    """Content hash used to cache parsed documents"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def iter_decoded_chunks(data, chunk_size=CHUNK_SIZE, encoding='utf-8'):
+    """Decode raw bytes in fixed-size chunks without splitting multi-byte characters"""
+    decoder = codecs.getincrementaldecoder(encoding)(errors='ignore')
+    for start in range(0, len(data), chunk_size):
+        yield decoder.decode(data[start:start + chunk_size])
+    yield decoder.decode(b'', final=True)
+
+
+def strip_rtf_binary_groups(rtf):
+    """Remove picture/object/theme groups from RTF source before text conversion"""
+    pieces = []
+    position = 0
+    for match in RTF_BINARY_GROUP.finditer(rtf):
+        if match.start() < position:
+            continue
+        pieces.append(rtf[position:match.start()])
+        depth = 0
+        i = match.start()
+        while i < len(rtf):
+            char = rtf[i]
+            if char == '\\':
+                i += 2
+                continue
+            if char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth == 0:
+                    i += 1
+                    break
+            i += 1
+        position = i
+    pieces.append(rtf[position:])
+    return ''.join(pieces)
+
+
+def looks_like_html(data):
+    """Whether raw document bytes contain HTML markup (EDGAR .txt submissions often do)"""
+    return bool(re.search(rb'<(html|div|p|table|font)\b', data[:4096], re.IGNORECASE))
+
+
+def parse_document(data, filename, chunk_size=CHUNK_SIZE):
+    """
+    Convert an uploaded RTF, HTML or plain-text filing to plain text.
+
+    HTML and text are decoded and stripped chunk by chunk; RTF has its binary groups
+    removed and is then converted with striprtf.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise ValueError(f"Unsupported document type '{extension}', expected one of {SUPPORTED_EXTENSIONS}")
+
+    if extension == '.rtf':
+        rtf = ''.join(iter_decoded_chunks(data, chunk_size, encoding='latin-1'))
+        return rtf_to_text(strip_rtf_binary_groups(rtf), errors='ignore')
+
+    is_html = extension in ('.htm', '.html') or looks_like_html(data)
+    return '\n'.join(iter_text_lines(iter_decoded_chunks(data, chunk_size), is_html=is_html))
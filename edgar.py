@@ -0,0 +1,289 @@
+import argparse
+import glob
+import os
+import re
+from html.parser import HTMLParser
+
+READ_SIZE = 65536
+
+BLOCK_TAGS = {
+    'p', 'div', 'br', 'tr', 'li', 'ul', 'ol', 'table', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'pre', 'hr', 'title', 'center', 'blockquote', 'page'
+}
+SKIP_TAGS = {'script', 'style', 'head', 'xbrl', 'ix:header'}
+
+# Start/end headings of the MD&A section by form family
+MDA_HEADINGS = {
+    '10-K': (re.compile(r'^item\s*7\s*[\.:\-–—]?(?!\s*a\b)(\s|$)'), re.compile(r'^item\s*(7\s*a|8)\b')),
+    '10-Q': (re.compile(r'^item\s*2\s*[\.:\-–—]?(\s|$)'), re.compile(r'^item\s*[34]\b'))
+}
+MAX_HEADING_CHARS = 200
+
+# First-line markers of an EDGAR full-submission file
+SUBMISSION_MARKERS = ('<SEC-DOCUMENT>', '<SEC-HEADER>', '<IMS-DOCUMENT>', '<DOCUMENT>', 'PRIVACY-ENHANCED MESSAGE')
+
+
+class _StreamingTextExtractor(HTMLParser):
+    """Incrementally strip markup, emitting completed lines of visible text"""
+
+    def __init__(self, is_html):
+        super().__init__(convert_charrefs=True)
+        self.is_html = is_html
+        self.skip_depth = 0
+        self.current = []
+        self.lines = []
+
+    def _break_line(self):
+        line = re.sub(r'\s+', ' ', ''.join(self.current)).strip()
+        self.current = []
+        if line:
+            self.lines.append(line)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag in BLOCK_TAGS or tag in ('td', 'th'):
+            if tag in ('td', 'th'):
+                self.current.append(' ')
+            else:
+                self._break_line()
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self._break_line()
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        data = data.replace('\xa0', ' ')
+        if self.is_html:
+            self.current.append(data)
+            return
+        parts = data.split('\n')
+        for part in parts[:-1]:
+            self.current.append(part)
+            self._break_line()
+        self.current.append(parts[-1])
+
+    def drain(self):
+        lines, self.lines = self.lines, []
+        return lines
+
+    def close(self):
+        super().close()
+        self._break_line()
+
+
+def iter_text_lines(chunks, is_html=True):
+    """Strip markup from an iterable of text chunks, yielding visible text lines as they complete"""
+    extractor = _StreamingTextExtractor(is_html=is_html)
+    for chunk in chunks:
+        extractor.feed(chunk)
+        yield from extractor.drain()
+    extractor.close()
+    yield from extractor.drain()
+
+
+def _form_family(form_type):
+    form_type = form_type.upper()
+    if form_type.startswith('10-K'):
+        return '10-K'
+    if form_type.startswith('10-Q'):
+        return '10-Q'
+    return None
+
+
+def iter_document_lines(path, read_size=READ_SIZE):
+    """
+    Stream the visible text lines of the primary 10-K/10-Q document in an EDGAR file.
+
+    Handles full-submission .txt files (SGML <DOCUMENT> wrappers around HTML or plain
+    text) as well as standalone .htm/.txt documents. The file is read in bounded
+    ``read_size`` pieces and markup is stripped incrementally, so memory stays flat
+    regardless of exhibits and XBRL attached to the submission.
+    Yields (form_family, line) pairs; form_family is '10-K', '10-Q' or None if unknown.
+    """
+    with open(path, encoding='utf-8', errors='ignore') as f:
+        first = f.readline(read_size)
+        if not any(marker in first.upper() for marker in SUBMISSION_MARKERS):
+            yield from _iter_standalone_lines(f, first, read_size)
+            return
+
+        form_family = None
+        extractor = None
+        in_document = False
+        done = False
+        line = first
+        while line and not done:
+            stripped = line.strip()
+            upper = stripped.upper()
+            if extractor is None:
+                if upper.startswith('<DOCUMENT>'):
+                    in_document = True
+                    form_family = None
+                elif in_document and upper.startswith('<TYPE>'):
+                    form_family = _form_family(stripped[6:].strip())
+                elif in_document and form_family and upper.startswith('<TEXT>'):
+                    extractor = _StreamingTextExtractor(is_html=None)
+                elif upper.startswith('</DOCUMENT>'):
+                    in_document = False
+            elif upper.startswith('</TEXT>'):
+                extractor.close()
+                for text_line in extractor.drain():
+                    yield form_family, text_line
+                done = True
+            else:
+                if extractor.is_html is None and stripped:
+                    extractor.is_html = bool(re.search(r'<(html|div|p|table|font)\b', line, re.IGNORECASE))
+                extractor.feed(line)
+                for text_line in extractor.drain():
+                    yield form_family, text_line
+            if not done:
+                line = f.readline(read_size)
+
+
+def _iter_standalone_lines(f, first, read_size):
+    extension_html = os.path.splitext(f.name)[1].lower() in ('.htm', '.html')
+    extractor = _StreamingTextExtractor(
+        is_html=extension_html or bool(re.search(r'<(html|div|p|table|font)\b', first, re.IGNORECASE))
+    )
+    form_family = None
+    chunk = first
+    while chunk:
+        extractor.feed(chunk)
+        for text_line in extractor.drain():
+            if form_family is None:
+                match = re.search(r'\bform\s+(10-[kq])\b', text_line, re.IGNORECASE)
+                if match:
+                    form_family = _form_family(match.group(1))
+            yield form_family, text_line
+        chunk = f.readline(read_size)
+    extractor.close()
+    for text_line in extractor.drain():
+        yield form_family, text_line
+
+
+def iter_mda_lines(path, min_section_chars=2000, default_form='10-K'):
+    """
+    Stream the lines of the MD&A section (Item 7 of a 10-K, Item 2 of a 10-Q).
+
+    Table-of-contents entries also match the Item headings, so a candidate section
+    is buffered until it holds ``min_section_chars`` characters; a candidate that
+    reaches its end heading sooner is discarded and the search continues.
+    """
+    buffered = []
+    buffered_chars = 0
+    in_section = False
+    streaming = False
+
+    for form_family, line in iter_document_lines(path):
+        start_pattern, end_pattern = MDA_HEADINGS[form_family or default_form]
+        heading = line.lower() if len(line) <= MAX_HEADING_CHARS else ''
+
+        if not in_section:
+            if heading and start_pattern.match(heading):
+                in_section = True
+                buffered, buffered_chars = [line], len(line)
+            continue
+
+        if heading and end_pattern.match(heading):
+            if streaming:
+                return
+            in_section = False
+            buffered, buffered_chars = [], 0
+            continue
+
+        if heading and start_pattern.match(heading) and not streaming:
+            buffered, buffered_chars = [line], len(line)
+            continue
+
+        if streaming:
+            yield line
+        else:
+            buffered.append(line)
+            buffered_chars += len(line)
+            if buffered_chars >= min_section_chars:
+                streaming = True
+                yield from buffered
+                buffered = []
+
+    if in_section and not streaming:
+        yield from buffered
+
+
+def iter_mda_sentences(analyzer, path, buffer_chars=20000):
+    """
+    Stream MD&A sentences from an EDGAR file, split with the analyzer's sentence splitter.
+
+    Text is accumulated until ``buffer_chars`` characters and split; every sentence
+    except the possibly incomplete last one is emitted, and the raw text from the
+    start of that last sentence is carried into the next buffer. Splitting is
+    unfiltered so a short fragment cut at the boundary is rejoined with its
+    continuation; split_sentences' length filter applies only when yielding.
+    """
+    buffer = ''
+    for line in iter_mda_lines(path):
+        buffer = f"{buffer}\n{line}" if buffer else line
+        if len(buffer) >= buffer_chars:
+            sentences = analyzer.tokenize_sentences(buffer)
+            if len(sentences) > 1:
+                yield from (sentence for sentence in sentences[:-1] if len(sentence.strip()) > 10)
+                buffer = _carry_over(analyzer, buffer, sentences[-1])
+    if buffer:
+        yield from analyzer.split_sentences(buffer)
+
+
+def _carry_over(analyzer, buffer, last_sentence):
+    """Raw text of ``buffer`` from where its cleaned ``last_sentence`` starts"""
+    clean_text, offsets = analyzer.preprocess_text_with_offsets(buffer)
+    start = clean_text.rfind(last_sentence.strip())
+    if start < 0:
+        # Not locatable in the cleaned text; carry the cleaned sentence itself
+        return last_sentence
+    return buffer[offsets.to_source(start):]
+
+
+def analyze_filing(analyzer, path, batch_size=32):
+    """Analyze the MD&A section of an EDGAR filing on disk"""
+    return analyzer.analyze_sentence_stream(iter_mda_sentences(analyzer, path), batch_size=batch_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze the MD&A section of EDGAR filings on local disk")
+    parser.add_argument('paths', nargs='+', help="EDGAR .txt/.htm files, directories or glob patterns")
+    parser.add_argument('--batch-size', type=int, default=32, help="FinBERT inference batch size")
+    parser.add_argument('--extract-only', action='store_true', help="Print the extracted MD&A text instead of analyzing it")
+    args = parser.parse_args()
+
+    files = []
+    for pattern in args.paths:
+        if os.path.isdir(pattern):
+            files.extend(sorted(os.path.join(pattern, name) for name in os.listdir(pattern)
+                                if name.lower().endswith(('.txt', '.htm', '.html'))))
+        else:
+            files.extend(sorted(glob.glob(pattern)))
+
+    if args.extract_only:
+        for path in files:
+            print(f"===== {path} =====")
+            for line in iter_mda_lines(path):
+                print(line)
+        return
+
+    from analyzer import BankruptcyAwareFinBERTAnalyzer
+
+    analyzer = BankruptcyAwareFinBERTAnalyzer()
+    for path in files:
+        result = analyze_filing(analyzer, path, batch_size=args.batch_size)
+        if result is None:
+            print(f"⚠️ {path}: no MD&A section found")
+            continue
+        print(f"📄 {path}: sentiment {result['document_sentiment_score']:.3f} ({result['sentiment_classification']}), "
+              f"bankruptcy risk {result['bankruptcy_risk_score']:.3f}, "
+              f"{result['total_sentences_analyzed']} sentences")
+
+
+if __name__ == "__main__":
+    main()
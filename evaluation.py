@@ -0,0 +1,81 @@
+import argparse
+import os
+import time
+import pandas as pd
+
+
+def load_labeled_sentences(path):
+    """
+    Load a labeled evaluation set from a CSV or JSONL file.
+
+    Each row needs a 'text' and a 'target_sentiment' column; 'category' is optional.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.jsonl', '.ndjson'):
+        examples = pd.read_json(path, lines=True)
+    elif extension == '.csv':
+        examples = pd.read_csv(path)
+    else:
+        raise ValueError(f"Unsupported labeled set format '{extension}', expected .csv or .jsonl")
+
+    missing = {'text', 'target_sentiment'} - set(examples.columns)
+    if missing:
+        raise ValueError(f"Labeled set {path} is missing required columns: {sorted(missing)}")
+
+    examples = examples.dropna(subset=['text', 'target_sentiment'])
+    examples['target_sentiment'] = examples['target_sentiment'].astype(float)
+    if 'category' not in examples:
+        examples['category'] = 'uncategorized'
+    return examples[['text', 'target_sentiment', 'category']].reset_index(drop=True)
+
+
+def print_evaluation_report(evaluation, top_errors=3):
+    """Print overall and per-category calibration metrics plus the worst sentences"""
+    overall = evaluation['overall']
+    print(f"\n📊 Evaluated {overall['count']} sentences")
+    print(f"MAE: {overall['mae']:.3f}  RMSE: {overall['rmse']:.3f}  "
+          f"Bias: {overall['bias']:+.3f}  Sign accuracy: {overall['sign_accuracy']:.1%}")
+
+    print("\n=== ERROR BY CATEGORY ===")
+    print(evaluation['by_category'].to_string(float_format=lambda value: f"{value:.3f}"))
+
+    if top_errors:
+        print(f"\n❌ Sentences needing calibration (Top {top_errors} by error):")
+        worst = evaluation['per_sentence'].nlargest(top_errors, 'error')
+        for row in worst.itertuples():
+            print(f"Category: {row.category}")
+            print(f"Text: {row.text_preview}")
+            print(f"Target: {row.target_score:.2f}, Actual: {row.actual_score:.2f}, Error: {row.error:.2f}")
+            print(f"Risk Indicators: {row.risk_indicators}")
+            print(f"Valence Shifters: {row.valence_shifters}")
+            print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the bankruptcy-aware analyzer on a labeled sentence set")
+    parser.add_argument('labeled_set', help="CSV or JSONL file with text, target_sentiment and category columns")
+    parser.add_argument('--batch-size', type=int, default=32, help="FinBERT inference batch size")
+    parser.add_argument('--top-errors', type=int, default=10, help="Number of worst sentences to print")
+    parser.add_argument('--output', help="Optional CSV path for per-sentence results")
+    args = parser.parse_args()
+
+    from analyzer import BankruptcyAwareFinBERTAnalyzer
+
+    examples = load_labeled_sentences(args.labeled_set)
+    analyzer = BankruptcyAwareFinBERTAnalyzer()
+
+    print(f"🎯 Scoring {len(examples)} labeled sentences...")
+    started = time.perf_counter()
+    evaluation = analyzer.evaluate_labeled_sentences(examples, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - started
+    print(f"⏱️ Scored in {elapsed:.1f}s ({len(examples) / max(elapsed, 1e-9):.1f} sentences/sec)")
+
+    print_evaluation_report(evaluation, top_errors=args.top_errors)
+
+    if args.output:
+        evaluation['per_sentence'].to_csv(args.output, index=False)
+        print(f"💾 Per-sentence results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
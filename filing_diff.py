@@ -0,0 +1,189 @@
+import argparse
+import difflib
+import time
+
+
+def _finbert_result_from_details(details):
+    """Rebuild the FinBERT fields _build_sentence_result needs from a prior sentence result"""
+    return {
+        'sentiment_score': details['finbert_base_score'],
+        'confidence': details['finbert_confidence']
+    }
+
+
+def align_sentences(prior_sentences, new_sentences, near_duplicate_threshold=0.9):
+    """
+    Align the sentences of a new filing against a prior one.
+
+    In-order exact matches come from difflib's matching blocks, then moved sentences
+    are matched exactly by text, and finally each remaining new sentence is paired
+    with its most similar unmatched prior sentence when the character similarity
+    ratio reaches ``near_duplicate_threshold``.
+    Returns (alignment, removed) where alignment has one (status, prior_index) pair per
+    new sentence, status being 'unchanged', 'near_duplicate' or 'inserted'.
+    """
+    alignment = [('inserted', None)] * len(new_sentences)
+    matched_prior = set()
+
+    matcher = difflib.SequenceMatcher(None, prior_sentences, new_sentences, autojunk=False)
+    for i, j, size in matcher.get_matching_blocks():
+        for offset in range(size):
+            alignment[j + offset] = ('unchanged', i + offset)
+            matched_prior.add(i + offset)
+
+    unmatched_prior = {}
+    for i, sentence in enumerate(prior_sentences):
+        if i not in matched_prior:
+            unmatched_prior.setdefault(sentence, []).append(i)
+    for j, sentence in enumerate(new_sentences):
+        if alignment[j][0] == 'inserted' and unmatched_prior.get(sentence):
+            i = unmatched_prior[sentence].pop(0)
+            alignment[j] = ('unchanged', i)
+            matched_prior.add(i)
+
+    candidates = [i for i in range(len(prior_sentences)) if i not in matched_prior]
+    sentence_matcher = difflib.SequenceMatcher(None, autojunk=False)
+    for j, sentence in enumerate(new_sentences):
+        if alignment[j][0] != 'inserted' or not candidates:
+            continue
+        best_index, best_ratio = None, near_duplicate_threshold
+        sentence_matcher.set_seq2(sentence)
+        for i in candidates:
+            sentence_matcher.set_seq1(prior_sentences[i])
+            if (sentence_matcher.real_quick_ratio() < best_ratio
+                    or sentence_matcher.quick_ratio() < best_ratio):
+                continue
+            ratio = sentence_matcher.ratio()
+            if ratio >= best_ratio:
+                best_index, best_ratio = i, ratio
+        if best_index is not None:
+            alignment[j] = ('near_duplicate', best_index)
+            candidates.remove(best_index)
+
+    aligned_prior = {prior for _, prior in alignment}
+    removed = [i for i in range(len(prior_sentences)) if i not in aligned_prior]
+    return alignment, removed
+
+
+def analyze_filing_diff(analyzer, prior_result, new_text, near_duplicate_threshold=0.9, batch_size=32):
+    """
+    Analyze a new filing, running FinBERT only on sentences that changed since ``prior_result``.
+
+    ``prior_result`` is the analyze_text result of the previous filing. Unchanged
+    sentences reuse their prior results; near-duplicates reuse the prior FinBERT score
+    but re-run lexicon, financial-metric and valence scoring on the new wording, as do
+    unchanged sentences scored under a different lexicon_version. Every sentence
+    result carries its ``source_span`` in ``new_text``, reused ones included.
+    Returns the usual analyze_text result extended with a 'filing_diff' summary.
+    """
+    if not new_text or not isinstance(new_text, str):
+        return None
+
+    prior_details = prior_result['sentence_details']
+    prior_sentences = [details['sentence'] for details in prior_details]
+    new_spans = analyzer.split_sentences_with_spans(new_text)
+    new_sentences = [sentence for sentence, _ in new_spans]
+    alignment, removed = align_sentences(prior_sentences, new_sentences, near_duplicate_threshold)
+
+    inserted_indices = [j for j, (status, _) in enumerate(alignment) if status == 'inserted']
+    print(f"Scoring {len(inserted_indices)} new of {len(new_sentences)} sentences "
+          f"(reusing {len(new_sentences) - len(inserted_indices)} from the prior filing)...")
+    inserted_results = analyzer.analyze_sentences([new_sentences[j] for j in inserted_indices], batch_size=batch_size)
+    inserted_by_index = dict(zip(inserted_indices, inserted_results))
+
+    sentence_results = []
+    changed_results = []
+    for j, (status, prior_index) in enumerate(alignment):
+        if status == 'unchanged' and prior_details[prior_index].get('lexicon_version') == analyzer.lexicon_version:
+            result = dict(prior_details[prior_index])
+        elif status in ('unchanged', 'near_duplicate'):
+            result = analyzer._build_sentence_result(
+                new_sentences[j], _finbert_result_from_details(prior_details[prior_index])
+            )
+        else:
+            result = inserted_by_index[j]
+        if result is None:
+            continue
+        # Results reused from the prior filing still point into the prior text
+        result['source_span'] = new_spans[j][1]
+        result['diff_status'] = status
+        sentence_results.append(result)
+        if status != 'unchanged':
+            changed_results.append(result)
+
+    document = analyzer.aggregate_sentence_results(sentence_results, new_text)
+    document['filing_diff'] = summarize_new_risk_language(prior_details, changed_results, alignment, removed)
+    return document
+
+
+def summarize_new_risk_language(prior_details, changed_results, alignment, removed):
+    """Summarize find_risk_indicators hits that appear in inserted or reworded sentences"""
+    prior_terms = {term for details in prior_details for term in details['risk_indicators']}
+    statuses = [status for status, _ in alignment]
+
+    new_terms_by_category = {}
+    new_risk_sentences = []
+    for result in changed_results:
+        if not result['risk_indicators'] and not result['financial_metrics']:
+            continue
+        new_risk_sentences.append({
+            'sentence': result['sentence'],
+            'diff_status': result['diff_status'],
+            'final_sentiment_score': result['final_sentiment_score'],
+            'risk_indicators_by_category': result['risk_indicators_by_category']
+        })
+        for category, category_terms in result['risk_indicators_by_category'].items():
+            for term in category_terms:
+                if term not in prior_terms:
+                    terms = new_terms_by_category.setdefault(category, [])
+                    if term not in terms:
+                        terms.append(term)
+
+    return {
+        'unchanged_sentences': statuses.count('unchanged'),
+        'near_duplicate_sentences': statuses.count('near_duplicate'),
+        'inserted_sentences': statuses.count('inserted'),
+        'removed_sentences': len(removed),
+        'removed_risk_sentences': [prior_details[i]['sentence'] for i in removed if prior_details[i]['risk_indicators']],
+        'new_risk_terms_by_category': new_terms_by_category,
+        'new_risk_sentences': sorted(new_risk_sentences, key=lambda s: s['final_sentiment_score'])
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score only the new language in a filing relative to the prior one")
+    parser.add_argument('prior', help="Text file of the prior filing")
+    parser.add_argument('new', help="Text file of the new filing")
+    parser.add_argument('--threshold', type=float, default=0.9, help="Similarity ratio for near-duplicate sentences")
+    parser.add_argument('--batch-size', type=int, default=32, help="FinBERT inference batch size")
+    args = parser.parse_args()
+
+    from analyzer import BankruptcyAwareFinBERTAnalyzer
+
+    with open(args.prior, encoding='utf-8', errors='ignore') as f:
+        prior_text = f.read()
+    with open(args.new, encoding='utf-8', errors='ignore') as f:
+        new_text = f.read()
+
+    analyzer = BankruptcyAwareFinBERTAnalyzer()
+    prior_result = analyzer.analyze_text(prior_text, batch_size=args.batch_size)
+    started = time.perf_counter()
+    result = analyze_filing_diff(analyzer, prior_result, new_text, args.threshold, args.batch_size)
+    elapsed = time.perf_counter() - started
+    diff = result['filing_diff']
+
+    print("\n=== FILING DIFF ===")
+    print(f"Unchanged: {diff['unchanged_sentences']}  Near-duplicate: {diff['near_duplicate_sentences']}  "
+          f"Inserted: {diff['inserted_sentences']}  Removed: {diff['removed_sentences']}  ({elapsed:.1f}s)")
+    print(f"Document Sentiment Score: {prior_result['document_sentiment_score']:.3f} -> {result['document_sentiment_score']:.3f}")
+    print(f"Bankruptcy Risk Score: {prior_result['bankruptcy_risk_score']:.3f} -> {result['bankruptcy_risk_score']:.3f}")
+
+    print("\n=== NEW RISK LANGUAGE ===")
+    for category, terms in diff['new_risk_terms_by_category'].items():
+        print(f"{category.replace('_', ' ').title()}: {', '.join(terms)}")
+    for sentence in diff['new_risk_sentences'][:10]:
+        print(f"\n[{sentence['diff_status']}] {sentence['final_sentiment_score']:.3f}: {sentence['sentence'][:120]}")
+
+
+if __name__ == "__main__":
+    main()
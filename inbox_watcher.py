@@ -0,0 +1,140 @@
+import argparse
+import os
+import time
+from documents import SUPPORTED_EXTENSIONS, file_hash
+from job_queue import JobQueue, print_status
+
+# Editors and copy tools write these while a file is still arriving
+PARTIAL_SUFFIXES = ('.tmp', '.part', '.crdownload', '~')
+
+INBOX_PRIORITY = 10
+
+
+class InboxWatcher:
+    """
+    Poll a directory for new or changed filings and queue them for analysis.
+
+    A file is ready once its size and modification time have not changed for
+    ``settle_seconds``, so half-copied files are not read. Ready files are queued
+    under their path relative to the inbox, so exported results name the filing,
+    and their content hash is recorded for deduplication: renamed copies and files
+    whose content was already queued are skipped, while an edited file is queued
+    again, once its previous version has finished if that is still running. Inbox jobs are queued at INBOX_PRIORITY, ahead of bulk backlog jobs
+    sharing the queue.
+    """
+
+    def __init__(self, inbox, queue, settle_seconds=2.0):
+        self.inbox = inbox
+        self.queue = queue
+        self.settle_seconds = settle_seconds
+        # path -> ((size, mtime_ns), monotonic time that signature was first seen)
+        self.candidates = {}
+        # path -> signature of the version the queue has accepted or already holds
+        self.seen = {}
+
+    def _iter_files(self):
+        for root, subdirectories, names in os.walk(self.inbox):
+            subdirectories[:] = sorted(name for name in subdirectories if not name.startswith('.'))
+            for name in sorted(names):
+                if name.startswith('.') or name.endswith(PARTIAL_SUFFIXES):
+                    continue
+                if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS:
+                    yield os.path.join(root, name)
+
+    def scan(self):
+        """
+        Return paths that have settled and whose current version the queue has not accepted.
+
+        A ready path stays a candidate until enqueue_ready marks it seen, so a
+        version the queue could not take yet is offered again on the next scan.
+        """
+        now = time.monotonic()
+        ready = []
+        present = set()
+        for path in self._iter_files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            present.add(path)
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if self.seen.get(path) == signature:
+                continue
+            previous = self.candidates.get(path)
+            if previous is None or previous[0] != signature:
+                self.candidates[path] = (signature, now)
+            elif now - previous[1] >= self.settle_seconds:
+                ready.append(path)
+
+        for path in list(self.candidates):
+            if path not in present:
+                del self.candidates[path]
+        for path in list(self.seen):
+            if path not in present:
+                del self.seen[path]
+        return ready
+
+    def enqueue_ready(self):
+        """Queue settled files whose content is new; returns their paths"""
+        queued = []
+        for path in self.scan():
+            try:
+                with open(path, 'rb') as f:
+                    content_hash = file_hash(f.read())
+            except OSError:
+                continue
+            document_id = os.path.relpath(path, self.inbox)
+            status = self.queue.enqueue_file(document_id, os.path.abspath(path), content_hash, priority=INBOX_PRIORITY)
+            if status == 'running':
+                # The previous version is still being analyzed; keep this one as a candidate
+                continue
+            self.seen[path] = self.candidates.pop(path)[0]
+            if status == 'queued':
+                queued.append(path)
+        return queued
+
+    def watch(self, analyzer, poll_interval=1.0, batch_size=32, max_attempts=3):
+        """
+        Run until interrupted: queue settled files and analyze them with the warm analyzer.
+
+        One job runs between scans, so a newly landed filing waits for at most the
+        document in flight rather than the whole backlog.
+        """
+        recovered = self.queue.recover()
+        if recovered:
+            print(f"♻️ Resuming {recovered} interrupted jobs")
+        print(f"👀 Watching {self.inbox} (poll {poll_interval:.1f}s, settle {self.settle_seconds:.1f}s)")
+        while True:
+            for path in self.enqueue_ready():
+                print(f"📥 Queued {os.path.relpath(path, self.inbox)}")
+            if not self.queue.run(analyzer, max_attempts=max_attempts, batch_size=batch_size, limit=1, resume=False):
+                time.sleep(poll_interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch an inbox directory and score filings as they arrive")
+    parser.add_argument('inbox', help="Directory new filings are dropped into (searched recursively)")
+    parser.add_argument('--queue', default='inbox.db', help="SQLite job queue holding results (see job_queue.py)")
+    parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds between directory scans")
+    parser.add_argument('--settle', type=float, default=2.0,
+                        help="Seconds a file must stay unchanged before it is analyzed")
+    parser.add_argument('--batch-size', type=int, default=32, help="FinBERT inference batch size")
+    parser.add_argument('--max-attempts', type=int, default=3, help="Attempts before a filing is marked failed")
+    args = parser.parse_args()
+
+    from analyzer import BankruptcyAwareFinBERTAnalyzer
+
+    analyzer = BankruptcyAwareFinBERTAnalyzer()
+    queue = JobQueue(args.queue)
+    stale = queue.requeue_stale(analyzer)
+    if stale:
+        print(f"🔄 Re-scoring {stale} filings finished with another model or lexicon version")
+    watcher = InboxWatcher(args.inbox, queue, settle_seconds=args.settle)
+    try:
+        watcher.watch(analyzer, args.poll_interval, args.batch_size, args.max_attempts)
+    except KeyboardInterrupt:
+        print_status(queue)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from contextlib import closing, contextmanager
+from datetime import datetime, timezone
+from documents import looks_like_html, parse_document
+
+STATUSES = ('pending', 'running', 'done', 'failed')
+
+# A running job's claimant refreshes heartbeat_at this often (seconds); other
+# runners treat a claim whose heartbeat is older than STALE_AFTER as abandoned
+HEARTBEAT_INTERVAL = 30
+STALE_AFTER = 600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    document_id TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    model_name TEXT,
+    lexicon_version TEXT,
+    result BLOB,
+    content_hash TEXT,
+    claimed_by TEXT,
+    heartbeat_at REAL,
+    enqueued_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, priority DESC, id);
+"""
+
+CONTENT_HASH_INDEX = "CREATE INDEX IF NOT EXISTS jobs_content_hash ON jobs (content_hash)"
+
+# Columns added after the first release of the queue, for databases created before them
+ADDED_COLUMNS = {'content_hash': 'TEXT', 'claimed_by': 'TEXT', 'heartbeat_at': 'REAL'}
+
+
+def _now():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _json_default(value):
+    # numpy scalars from the document aggregates
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def read_document(path):
+    """
+    Text of a queued file.
+
+    RTF and HTML filings, and .txt files holding HTML markup, are converted with
+    parse_document; other files are read as plain UTF-8 text unchanged.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.rtf', '.htm', '.html'):
+        with open(path, 'rb') as f:
+            return parse_document(f.read(), path)
+    if extension == '.txt':
+        with open(path, 'rb') as f:
+            data = f.read()
+        if looks_like_html(data):
+            return parse_document(data, path)
+    with open(path, encoding='utf-8', errors='ignore') as f:
+        return f.read()
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def encode_result(result):
+    """zlib-compressed JSON of an analyze_text result"""
+    return zlib.compress(json.dumps(result, default=_json_default).encode('utf-8'))
+
+
+def decode_result(blob):
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+
+class JobQueue:
+    """
+    Persistent, resumable queue of documents to analyze.
+
+    Each document is one row with its status, attempt count, last error and, once
+    done, its checkpointed analyze_text result (compressed JSON) together with the
+    model and lexicon version that produced it. Jobs are claimed highest priority
+    first inside an immediate transaction, so several runners can share a queue:
+    each claim records the claiming runner (host, pid and a per-instance token)
+    and a heartbeat refreshed while the job runs. recover only resets claims that
+    were abandoned, i.e. made by this instance, by a dead process on this host or
+    with a heartbeat older than ``stale_after`` seconds, so a runner starting next
+    to a live one leaves its jobs alone. requeue_stale sends finished jobs back
+    when the model or lexicon changes.
+    """
+
+    def __init__(self, path, heartbeat_interval=HEARTBEAT_INTERVAL, stale_after=STALE_AFTER):
+        self.path = path
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.claimant = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        with closing(self._connect()) as connection, connection:
+            connection.executescript(SCHEMA)
+            columns = {row['name'] for row in connection.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in ADDED_COLUMNS.items():
+                if column not in columns:
+                    connection.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+            connection.execute(CONTENT_HASH_INDEX)
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        connection.execute('PRAGMA journal_mode=WAL')
+        return connection
+
+    def enqueue(self, documents, priority=0):
+        """
+        Add (document_id, path) pairs; already queued documents keep their state.
+
+        Returns the number of new jobs.
+        """
+        enqueued_at = _now()
+        with closing(self._connect()) as connection:
+            connection.execute('BEGIN')
+            cursor = connection.executemany(
+                "INSERT OR IGNORE INTO jobs (document_id, path, priority, enqueued_at) VALUES (?, ?, ?, ?)",
+                [(document_id, path, priority, enqueued_at) for document_id, path in documents]
+            )
+            connection.execute('COMMIT')
+            return cursor.rowcount
+
+    def enqueue_file(self, document_id, path, content_hash, priority=0):
+        """
+        Queue a file unless a job already holds the same content.
+
+        A document_id already queued with different content (an edited file) is
+        reset to 'pending' with the new hash, replacing its previous result, unless
+        that job is running. Returns 'queued' when a job was added or reset,
+        'duplicate' when the content is already queued and 'running' when the new
+        content must be offered again after the running job finishes.
+        """
+        with closing(self._connect()) as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                if connection.execute("SELECT 1 FROM jobs WHERE content_hash = ? LIMIT 1", (content_hash,)).fetchone():
+                    return 'duplicate'
+                cursor = connection.execute(
+                    "UPDATE jobs SET path = ?, content_hash = ?, priority = ?, status = 'pending', attempts = 0, "
+                    "error = NULL, result = NULL, model_name = NULL, lexicon_version = NULL, enqueued_at = ?, "
+                    "started_at = NULL, finished_at = NULL WHERE document_id = ? AND status != 'running'",
+                    (path, content_hash, priority, _now(), document_id)
+                )
+                if not cursor.rowcount:
+                    cursor = connection.execute(
+                        "INSERT OR IGNORE INTO jobs (document_id, path, priority, content_hash, enqueued_at) "
+                        "VALUES (?, ?, ?, ?, ?)", (document_id, path, priority, content_hash, _now())
+                    )
+                return 'queued' if cursor.rowcount else 'running'
+            finally:
+                connection.execute('COMMIT')
+
+    def enqueue_directory(self, directory, priority=0):
+        """Queue every file under ``directory`` (recursively), keyed by its relative path"""
+        documents = []
+        for root, subdirectories, names in os.walk(directory):
+            subdirectories.sort()
+            for name in sorted(names):
+                path = os.path.join(root, name)
+                documents.append((os.path.relpath(path, directory), os.path.abspath(path)))
+        return self.enqueue(documents, priority)
+
+    def set_priority(self, priority, document_ids):
+        with closing(self._connect()) as connection:
+            connection.executemany("UPDATE jobs SET priority = ? WHERE document_id = ?",
+                                   [(priority, document_id) for document_id in document_ids])
+
+    def _is_abandoned(self, claimed_by, heartbeat_at, now):
+        if claimed_by is None or claimed_by == self.claimant:
+            return True
+        if heartbeat_at is None or now - heartbeat_at > self.stale_after:
+            return True
+        host, pid, _ = claimed_by.rsplit(':', 2)
+        return host == socket.gethostname() and not _process_alive(int(pid))
+
+    def recover(self):
+        """Return abandoned 'running' jobs to 'pending', leaving live runners' claims alone; returns how many"""
+        now = time.time()
+        with closing(self._connect()) as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            rows = connection.execute("SELECT id, claimed_by, heartbeat_at FROM jobs WHERE status = 'running'").fetchall()
+            abandoned = [(row['id'],) for row in rows if self._is_abandoned(row['claimed_by'], row['heartbeat_at'], now)]
+            connection.executemany("UPDATE jobs SET status = 'pending', started_at = NULL, claimed_by = NULL, "
+                                   "heartbeat_at = NULL WHERE id = ?", abandoned)
+            connection.execute('COMMIT')
+        return len(abandoned)
+
+    def requeue_stale(self, analyzer):
+        """Send finished jobs scored by another model or lexicon version back to 'pending'"""
+        with closing(self._connect()) as connection:
+            return connection.execute(
+                "UPDATE jobs SET status = 'pending', attempts = 0, error = NULL "
+                "WHERE status = 'done' AND (model_name IS NOT ? OR lexicon_version IS NOT ?)",
+                (analyzer.model_name, analyzer.lexicon_version)
+            ).rowcount
+
+    def retry_failed(self):
+        """Give failed jobs a fresh set of attempts"""
+        with closing(self._connect()) as connection:
+            return connection.execute("UPDATE jobs SET status = 'pending', attempts = 0 "
+                                      "WHERE status = 'failed'").rowcount
+
+    def claim(self):
+        """Mark the highest-priority pending job as running and return it, or None when none remain"""
+        with closing(self._connect()) as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            row = connection.execute("SELECT id, document_id, path, attempts FROM jobs WHERE status = 'pending' "
+                                     "ORDER BY priority DESC, id LIMIT 1").fetchone()
+            if row is not None:
+                connection.execute("UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ?, "
+                                   "claimed_by = ?, heartbeat_at = ? WHERE id = ?",
+                                   (_now(), self.claimant, time.time(), row['id']))
+            connection.execute('COMMIT')
+        return dict(row) if row is not None else None
+
+    def heartbeat(self, job_id):
+        """Refresh the heartbeat of a job this instance claimed"""
+        with closing(self._connect()) as connection:
+            connection.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND claimed_by = ?",
+                               (time.time(), job_id, self.claimant))
+
+    @contextmanager
+    def _keep_alive(self, job_id):
+        """Refresh the job's heartbeat from a background thread while the block runs"""
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(self.heartbeat_interval):
+                self.heartbeat(job_id)
+
+        thread = threading.Thread(target=beat, name=f'heartbeat-{job_id}', daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def complete(self, job_id, result, analyzer):
+        """Checkpoint a finished job's result"""
+        with closing(self._connect()) as connection:
+            connection.execute(
+                "UPDATE jobs SET status = 'done', error = NULL, result = ?, model_name = ?, lexicon_version = ?, "
+                "finished_at = ? WHERE id = ?",
+                (encode_result(result), analyzer.model_name, analyzer.lexicon_version, _now(), job_id)
+            )
+
+    def fail(self, job_id, error, max_attempts=3):
+        """Record an error; the job goes back to 'pending' until it has used ``max_attempts``"""
+        with closing(self._connect()) as connection:
+            connection.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = ?, finished_at = ? WHERE id = ?",
+                (max_attempts, error, _now(), job_id)
+            )
+
+    def release(self, job_id):
+        """Put a claimed job back without counting the attempt (e.g. on Ctrl-C)"""
+        with closing(self._connect()) as connection:
+            connection.execute("UPDATE jobs SET status = 'pending', attempts = MAX(0, attempts - 1), "
+                               "started_at = NULL WHERE id = ?", (job_id,))
+
+    def counts(self):
+        """Number of jobs per status"""
+        with closing(self._connect()) as connection:
+            counts = dict(connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {status: counts.get(status, 0) for status in STATUSES}
+
+    def failures(self):
+        with closing(self._connect()) as connection:
+            return [dict(row) for row in connection.execute(
+                "SELECT document_id, attempts, error FROM jobs WHERE status = 'failed' ORDER BY id")]
+
+    def results(self, include_details=False):
+        """Yield (document_id, result) for finished jobs in queue order"""
+        with closing(self._connect()) as connection:
+            for row in connection.execute("SELECT document_id, result FROM jobs WHERE status = 'done' ORDER BY id"):
+                result = decode_result(row['result'])
+                if not include_details:
+                    result.pop('sentence_details', None)
+                yield row['document_id'], result
+
+    def run(self, analyzer, max_attempts=3, batch_size=32, limit=None, resume=True):
+        """
+        Process pending jobs until none remain (or ``limit`` jobs have run).
+
+        With ``resume``, abandoned jobs from a previous run are resumed first. Each
+        result is checkpointed as soon as its document finishes, so a crash loses at
+        most the document in flight. Returns the number of jobs processed.
+        """
+        if resume:
+            recovered = self.recover()
+            if recovered:
+                print(f"♻️ Resuming {recovered} interrupted jobs")
+
+        processed = 0
+        while limit is None or processed < limit:
+            job = self.claim()
+            if job is None:
+                break
+            started = time.perf_counter()
+            try:
+                with self._keep_alive(job['id']):
+                    result = analyzer.analyze_text(read_document(job['path']), batch_size=batch_size)
+                if result is None:
+                    raise ValueError("no analyzable text")
+                self.complete(job['id'], result, analyzer)
+                print(f"✅ {job['document_id']} ({time.perf_counter() - started:.1f}s)")
+            except KeyboardInterrupt:
+                self.release(job['id'])
+                raise
+            except Exception as e:
+                self.fail(job['id'], f"{type(e).__name__}: {e}", max_attempts)
+                print(f"❌ {job['document_id']} attempt {job['attempts'] + 1}/{max_attempts}: {e}")
+            processed += 1
+        return processed
+
+
+def print_status(queue):
+    counts = queue.counts()
+    print(f"\n📋 {sum(counts.values())} jobs: " + ", ".join(f"{counts[status]} {status}" for status in STATUSES))
+    for failure in queue.failures():
+        print(f"  ❌ {failure['document_id']} ({failure['attempts']} attempts): {failure['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumable, checkpointed analysis of a filing corpus")
+    parser.add_argument('queue', help="SQLite queue database")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    add = subparsers.add_parser('add', help="Queue every file under a directory")
+    add.add_argument('path')
+    add.add_argument('--priority', type=int, default=0, help="Higher runs first")
+
+    run = subparsers.add_parser('run', help="Process pending jobs, resuming interrupted ones")
+    run.add_argument('--batch-size', type=int, default=32, help="FinBERT inference batch size")
+    run.add_argument('--max-attempts', type=int, default=3, help="Attempts before a job is marked failed")
+    run.add_argument('--limit', type=int, help="Stop after this many jobs")
+    run.add_argument('--retry-failed', action='store_true', help="Give failed jobs another round of attempts")
+
+    subparsers.add_parser('status', help="Job counts and failures")
+
+    export = subparsers.add_parser('export', help="Write document-level results of finished jobs to CSV")
+    export.add_argument('output')
+    args = parser.parse_args()
+
+    queue = JobQueue(args.queue)
+    if args.command == 'add':
+        print(f"📥 Queued {queue.enqueue_directory(args.path, args.priority)} new documents")
+    elif args.command == 'run':
+        from analyzer import BankruptcyAwareFinBERTAnalyzer
+
+        analyzer = BankruptcyAwareFinBERTAnalyzer()
+        stale = queue.requeue_stale(analyzer)
+        if stale:
+            print(f"🔄 Re-scoring {stale} documents finished with another model or lexicon version")
+        if args.retry_failed:
+            queue.retry_failed()
+        queue.run(analyzer, max_attempts=args.max_attempts, batch_size=args.batch_size, limit=args.limit)
+    elif args.command == 'export':
+        import pandas as pd
+
+        rows = []
+        for document_id, result in queue.results():
+            result.pop('readability_metrics', None)
+            rows.append({'document_id': document_id, **{key: value for key, value in result.items()
+                                                        if not isinstance(value, (dict, list))}})
+        pd.DataFrame(rows).to_csv(args.output, index=False)
+        print(f"💾 Saved {len(rows)} results to {args.output}")
+    print_status(queue)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import pickle
+import re
+
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lexicons', 'bankruptcy_lexicon.json')
+
+# Category precedence when a term appears in more than one category
+RISK_CATEGORIES = ('critical_bankruptcy', 'high_risk', 'moderate_risk', 'economic_headwinds', 'management_change')
+SHIFTER_TYPES = ('amplifier', 'de_amplifier', 'negator', 'adversative')
+
+# Bump when CompiledLexicon's attributes change so stale on-disk artifacts are rebuilt
+ARTIFACT_FORMAT = 2
+
+# Per-sentence totals returned by CompiledLexicon.match_valence_phrases
+VALENCE_SUMMARY_KEYS = ('negator_count', 'amplifier_strength', 'de_amplifier_strength',
+                        'adversative_strength', 'uncertainty_count')
+
+
+class CompiledLexicon:
+    """
+    Matcher artifacts compiled from a lexicon file.
+
+    Holds the term dicts the analyzer exposes as attributes plus the structures its
+    matchers use directly: risk terms ordered longest first with their score and
+    category resolved, compiled financial-context regexes, and the merged valence
+    shifter lookup, and a token trie over shifter and uncertainty phrases.
+    ``version_id`` combines the declared version with the content
+    hash, so editing a file without bumping its version still changes it.
+    """
+
+    def __init__(self, lexicon, content_hash):
+        unknown = set(lexicon.get('risk_terms', {})) - set(RISK_CATEGORIES)
+        unknown |= set(lexicon.get('valence_shifters', {})) - set(SHIFTER_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown lexicon sections: {sorted(unknown)}")
+
+        self.name = lexicon.get('name', 'lexicon')
+        self.version = str(lexicon.get('version', '0'))
+        self.content_hash = content_hash
+        self.version_id = f"{self.name}-{self.version}+{content_hash[:12]}"
+
+        self.risk_terms = {category: dict(lexicon.get('risk_terms', {}).get(category, {}))
+                           for category in RISK_CATEGORIES}
+        self.bankruptcy_lexicon = {}
+        for category in RISK_CATEGORIES:
+            self.bankruptcy_lexicon.update(self.risk_terms[category])
+        term_categories = {}
+        for category in RISK_CATEGORIES:
+            for term in self.risk_terms[category]:
+                term_categories.setdefault(term, category)
+        self.risk_term_matcher = tuple(
+            (term, score, term_categories[term])
+            for term, score in sorted(self.bankruptcy_lexicon.items(), key=lambda x: len(x[0]), reverse=True)
+        )
+
+        self.financial_context_patterns = dict(lexicon.get('financial_context_patterns', {}))
+        self.compiled_patterns = tuple(
+            (re.compile(pattern), metric_type) for pattern, metric_type in self.financial_context_patterns.items()
+        )
+
+        self.shifters = {shifter_type: dict(lexicon.get('valence_shifters', {}).get(shifter_type, {}))
+                         for shifter_type in SHIFTER_TYPES}
+        self.valence_shifters = {}
+        for shifter_type in SHIFTER_TYPES:
+            self.valence_shifters.update({word: (shifter_type, weight)
+                                          for word, weight in self.shifters[shifter_type].items()})
+
+        self.uncertainty_words = set(lexicon.get('uncertainty_words', []))
+
+        # Nested {token: node} dicts; a node's None key holds (shifter or None, is_uncertainty)
+        self.phrase_trie = {}
+        phrases = {phrase: [shifter, False] for phrase, shifter in self.valence_shifters.items()}
+        for phrase in self.uncertainty_words:
+            phrases.setdefault(phrase, [None, False])[1] = True
+        for phrase, (shifter, is_uncertainty) in phrases.items():
+            node = self.phrase_trie
+            for token in phrase.split():
+                node = node.setdefault(token, {})
+            node[None] = (shifter, is_uncertainty)
+
+    def match_valence_phrases(self, words):
+        """
+        Match single- and multi-word valence shifters and uncertainty phrases in one pass.
+
+        ``words`` is the lowercased token list of a sentence. At each position the
+        longest phrase in the trie wins and matching resumes after it, so 'no
+        assurance' counts as uncertainty rather than as the negator 'no'.
+        Returns (shifters, summary): shifter dicts with word/type/weight/position,
+        and totals for VALENCE_SUMMARY_KEYS.
+        """
+        shifters = []
+        summary = dict.fromkeys(VALENCE_SUMMARY_KEYS, 0)
+        i = 0
+        while i < len(words):
+            node = self.phrase_trie.get(words[i])
+            if node is None:
+                i += 1
+                continue
+            match, match_end = node.get(None), i + 1
+            j = i + 1
+            while j < len(words):
+                node = node.get(words[j])
+                if node is None:
+                    break
+                j += 1
+                if None in node:
+                    match, match_end = node[None], j
+            if match is None:
+                i += 1
+                continue
+
+            shifter, is_uncertainty = match
+            if shifter is not None:
+                shifter_type, weight = shifter
+                shifters.append({
+                    'word': ' '.join(words[i:match_end]),
+                    'type': shifter_type,
+                    'weight': weight,
+                    'position': i
+                })
+                if shifter_type == 'negator':
+                    summary['negator_count'] += 1
+                else:
+                    summary[f'{shifter_type}_strength'] += weight
+            if is_uncertainty:
+                summary['uncertainty_count'] += 1
+            i = match_end
+        return shifters, summary
+
+
+def load_compiled_lexicon(path=None, cache_dir=None):
+    """
+    Load a lexicon JSON file as a CompiledLexicon, reusing an on-disk artifact when possible.
+
+    Artifacts are pickled under ``cache_dir`` (default: a .compiled directory next to
+    the lexicon) keyed by the SHA-256 of the file's bytes, so any edit produces a
+    fresh artifact. An unwritable cache directory just means compiling every time.
+    """
+    path = path or DEFAULT_LEXICON_PATH
+    with open(path, 'rb') as f:
+        raw = f.read()
+    content_hash = hashlib.sha256(raw).hexdigest()
+
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), '.compiled')
+    artifact_path = os.path.join(cache_dir, f"{content_hash}-{ARTIFACT_FORMAT}.pkl")
+    if os.path.exists(artifact_path):
+        try:
+            with open(artifact_path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            pass
+
+    compiled = CompiledLexicon(json.loads(raw.decode('utf-8')), content_hash)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temporary_path = f"{artifact_path}.{os.getpid()}.tmp"
+        with open(temporary_path, 'wb') as f:
+            pickle.dump(compiled, f)
+        os.replace(temporary_path, artifact_path)
+    except OSError:
+        pass
+    return compiled
@@ -0,0 +1,116 @@
+import hashlib
+import re
+import numpy as np
+
+MONTH_PATTERN = re.compile(
+    r'\b(?:january|february|march|april|june|july|august|september|october|november|december|'
+    r'jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec)\.?\b'
+)
+NUMBER_PATTERN = re.compile(r'\$?\d[\d,]*(?:\.\d+)?%?')
+TOKEN_PATTERN = re.compile(r'<num>|<month>|[a-z]+')
+
+
+def normalize_sentence(sentence):
+    """Lowercase a sentence and mask numbers, amounts, percentages and month names"""
+    text = sentence.lower()
+    text = NUMBER_PATTERN.sub(' <num> ', text)
+    text = MONTH_PATTERN.sub(' <month> ', text)
+    return TOKEN_PATTERN.findall(text)
+
+
+def _feature_hashes(tokens):
+    """64-bit hashes of the unigrams and bigrams of a token list"""
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(f.encode(), digest_size=8).digest(), 'little') for f in features],
+        dtype=np.uint64
+    )
+
+
+def simhash(sentence):
+    """
+    64-bit SimHash fingerprint of a sentence after number/date masking.
+
+    Returns None for sentences without word tokens (e.g. table rows of numbers),
+    which would otherwise all share one fingerprint.
+    """
+    tokens = normalize_sentence(sentence)
+    if all(token in ('<num>', '<month>') for token in tokens):
+        return None
+    bits = np.unpackbits(_feature_hashes(tokens).view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(bits)
+    return int(np.packbits(votes > 0, bitorder='little').view(np.uint64)[0])
+
+
+class SimHashIndex:
+    """
+    Near-duplicate lookup over SimHash fingerprints.
+
+    The 64-bit fingerprint is split into ``max_distance + 1`` bands; by the pigeonhole
+    principle any fingerprint within ``max_distance`` bits shares at least one band
+    exactly, so only sentences in matching band buckets are compared. Sentences
+    sharing a fingerprint are reference counted so remove() can mirror evictions
+    from the exact cache. Sentences without word tokens are never indexed or matched.
+    """
+
+    def __init__(self, max_distance=3):
+        self.max_distance = max_distance
+        self.n_bands = max_distance + 1
+        self.band_bits = [(64 * b // self.n_bands, 64 * (b + 1) // self.n_bands) for b in range(self.n_bands)]
+        # band key -> fingerprints in insertion order (dict used as an ordered set)
+        self.buckets = [{} for _ in range(self.n_bands)]
+        self.values = {}
+        self.counts = {}
+
+    def _band_keys(self, fingerprint):
+        return [(fingerprint >> start) & ((1 << (end - start)) - 1) for start, end in self.band_bits]
+
+    def add(self, sentence, value):
+        """Index ``value`` under the fingerprint of ``sentence``; returns the fingerprint (None if not indexed)"""
+        fingerprint = simhash(sentence)
+        if fingerprint is None:
+            return None
+        if fingerprint not in self.values:
+            for band, key in enumerate(self._band_keys(fingerprint)):
+                self.buckets[band].setdefault(key, {})[fingerprint] = None
+        self.values[fingerprint] = value
+        self.counts[fingerprint] = self.counts.get(fingerprint, 0) + 1
+        return fingerprint
+
+    def remove(self, sentence):
+        """Drop one reference to the fingerprint of ``sentence``, unindexing it when none remain"""
+        fingerprint = simhash(sentence)
+        count = self.counts.get(fingerprint)
+        if count is None:
+            return
+        if count > 1:
+            self.counts[fingerprint] = count - 1
+            return
+        del self.counts[fingerprint]
+        del self.values[fingerprint]
+        for band, key in enumerate(self._band_keys(fingerprint)):
+            bucket = self.buckets[band][key]
+            del bucket[fingerprint]
+            if not bucket:
+                del self.buckets[band][key]
+
+    def query(self, sentence):
+        """Return (value, hamming_distance) of the closest indexed sentence, or (None, None)"""
+        fingerprint = simhash(sentence)
+        if fingerprint is None:
+            return None, None
+        if fingerprint in self.values:
+            return self.values[fingerprint], 0
+
+        best, best_distance = None, self.max_distance + 1
+        for band, key in enumerate(self._band_keys(fingerprint)):
+            for candidate in self.buckets[band].get(key, ()):
+                distance = bin(candidate ^ fingerprint).count('1')
+                if distance < best_distance:
+                    best, best_distance = candidate, distance
+        if best is None:
+            return None, None
+        return self.values[best], best_distance
+
+    def __len__(self):
+        return len(self.values)
@@ -0,0 +1,260 @@
+import argparse
+import csv
+import json
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+
+DEFAULT_NEWS_DB = os.environ.get('NEWS_DB', 'news.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    company TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    url TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL DEFAULT '',
+    published_at TEXT NOT NULL DEFAULT '',
+    UNIQUE (company, url, title)
+);
+CREATE INDEX IF NOT EXISTS articles_company_published ON articles (company, published_at);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, description, content='articles', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    INSERT INTO articles_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+
+CREATE TABLE IF NOT EXISTS article_scores (
+    article_id INTEGER PRIMARY KEY REFERENCES articles (id) ON DELETE CASCADE,
+    model_name TEXT NOT NULL,
+    lexicon_version TEXT NOT NULL,
+    finbert_base_score REAL NOT NULL,
+    final_sentiment_score REAL NOT NULL,
+    risk_score REAL NOT NULL,
+    risk_indicators TEXT NOT NULL,
+    scored_at TEXT NOT NULL
+);
+"""
+
+
+def normalize_timestamp(value):
+    """ISO-8601 UTC 'YYYY-MM-DDTHH:MM:SSZ' so published_at sorts and range-compares as text"""
+    if not value:
+        return ''
+    try:
+        timestamp = datetime.fromisoformat(str(value).strip().replace('Z', '+00:00'))
+    except ValueError:
+        return str(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def article_text(article):
+    """Text scored for an article: the headline followed by its description"""
+    title = article['title'].strip()
+    description = (article.get('description') or '').strip()
+    if not description:
+        return title
+    return f"{title}{'' if title.endswith(('.', '!', '?')) else '.'} {description}"
+
+
+class NewsStore:
+    """
+    SQLite store of news articles with a full-text index and cached sentiment scores.
+
+    Articles are keyed by (company, url, title), so re-importing a dump is
+    idempotent, and indexed on (company, published_at) for company/date-range
+    queries. An FTS5 table over title and description, kept in sync by triggers,
+    serves keyword search. Scores are stored per article together with the model
+    and lexicon version that produced them, and are recomputed when either changes.
+    Each call opens its own connection, so a store can be shared across threads.
+    """
+
+    def __init__(self, path=DEFAULT_NEWS_DB):
+        self.path = path
+        with closing(self._connect()) as connection, connection:
+            connection.executescript(SCHEMA)
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA foreign_keys=ON')
+        return connection
+
+    def import_articles(self, articles, company=None):
+        """
+        Insert articles (dicts in NewsAPI or snake_case form) in one transaction.
+
+        ``company`` applies to articles without a 'company' field. Returns the
+        number of new articles; duplicates are skipped.
+        """
+        rows = []
+        for article in articles:
+            source = article.get('source') or ''
+            if isinstance(source, dict):
+                source = source.get('name') or ''
+            row_company = article.get('company') or company
+            if not row_company or not article.get('title'):
+                continue
+            rows.append((
+                row_company,
+                article['title'].strip(),
+                (article.get('description') or '').strip(),
+                article.get('url') or '',
+                source,
+                normalize_timestamp(article.get('publishedAt') or article.get('published_at'))
+            ))
+
+        with closing(self._connect()) as connection, connection:
+            cursor = connection.executemany(
+                "INSERT OR IGNORE INTO articles (company, title, description, url, source, published_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            return cursor.rowcount
+
+    def import_file(self, path, company=None):
+        """Import a JSON array, JSON lines or CSV article dump"""
+        with open(path, encoding='utf-8') as f:
+            if path.lower().endswith('.csv'):
+                articles = list(csv.DictReader(f))
+            elif path.lower().endswith(('.jsonl', '.ndjson')):
+                articles = [json.loads(line) for line in f if line.strip()]
+            else:
+                articles = json.load(f)
+                if isinstance(articles, dict):
+                    articles = articles.get('articles', [])
+        return self.import_articles(articles, company)
+
+    def query(self, company=None, start=None, end=None, search=None, limit=50):
+        """
+        Articles newest first with their cached scores (None when unscored).
+
+        ``start`` and ``end`` bound published_at inclusively (dates or timestamps);
+        ``search`` is an FTS5 query over title and description.
+        """
+        clauses, params = [], []
+        if company:
+            clauses.append('a.company = ?')
+            params.append(company)
+        if start:
+            clauses.append('a.published_at >= ?')
+            params.append(normalize_timestamp(start))
+        if end:
+            clauses.append('a.published_at <= ?')
+            # A bare date includes the whole day
+            params.append(f"{end}T23:59:59Z" if len(str(end)) == 10 else normalize_timestamp(end))
+        if search:
+            clauses.append('a.id IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)')
+            params.append(search)
+
+        sql = ("SELECT a.*, s.model_name, s.lexicon_version, s.finbert_base_score, s.final_sentiment_score, "
+               "s.risk_score, s.risk_indicators FROM articles a LEFT JOIN article_scores s ON s.article_id = a.id")
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY a.published_at DESC, a.id DESC LIMIT ?'
+        params.append(limit)
+
+        with closing(self._connect()) as connection:
+            articles = [dict(row) for row in connection.execute(sql, params)]
+        for article in articles:
+            if article['risk_indicators'] is not None:
+                article['risk_indicators'] = json.loads(article['risk_indicators'])
+        return articles
+
+    def unscored_articles(self, analyzer, company=None, limit=None):
+        """Articles without a score from the analyzer's current model and lexicon version"""
+        sql = ("SELECT a.id, a.title, a.description FROM articles a "
+               "LEFT JOIN article_scores s ON s.article_id = a.id "
+               "WHERE (s.article_id IS NULL OR s.model_name != ? OR s.lexicon_version != ?)")
+        params = [analyzer.model_name, analyzer.lexicon_version]
+        if company:
+            sql += ' AND a.company = ?'
+            params.append(company)
+        sql += ' ORDER BY a.published_at DESC'
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        with closing(self._connect()) as connection:
+            return [dict(row) for row in connection.execute(sql, params)]
+
+    def score_articles(self, analyzer, company=None, batch_size=32):
+        """
+        Score unscored articles in FinBERT batches and cache the results.
+
+        Each article's headline and description are scored together as one
+        analyzer sentence; scores are written after every batch, so an interrupted
+        run keeps its progress. Returns the number of articles scored.
+        """
+        articles = self.unscored_articles(analyzer, company)
+        scored_at = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        for start in range(0, len(articles), batch_size):
+            batch = articles[start:start + batch_size]
+            results = analyzer.analyze_sentences([article_text(article) for article in batch], batch_size=batch_size)
+            rows = [
+                (article['id'], analyzer.model_name, analyzer.lexicon_version, result['finbert_base_score'],
+                 result['final_sentiment_score'], result['risk_score'], json.dumps(result['risk_indicators']), scored_at)
+                for article, result in zip(batch, results) if result
+            ]
+            with closing(self._connect()) as connection, connection:
+                connection.executemany("INSERT OR REPLACE INTO article_scores VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(articles)
+
+    def __len__(self):
+        with closing(self._connect()) as connection:
+            return connection.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local news store with full-text search and cached sentiment scores")
+    parser.add_argument('--db', default=DEFAULT_NEWS_DB, help="SQLite database path (default: $NEWS_DB or news.db)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    load = subparsers.add_parser('import', help="Bulk-import article dumps (JSON array, NewsAPI response, JSONL or CSV)")
+    load.add_argument('paths', nargs='+')
+    load.add_argument('--company', help="Company for articles without a 'company' field")
+
+    score = subparsers.add_parser('score', help="Score articles not yet scored by the current model and lexicon")
+    score.add_argument('--company')
+    score.add_argument('--batch-size', type=int, default=32, help="FinBERT inference batch size")
+
+    search = subparsers.add_parser('query', help="List articles by company, date range and keywords")
+    search.add_argument('--company')
+    search.add_argument('--from', dest='start', help="Earliest publication date, e.g. 2024-01-01")
+    search.add_argument('--to', dest='end', help="Latest publication date")
+    search.add_argument('--search', help="Full-text query, e.g. 'bankruptcy OR restructuring'")
+    search.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    store = NewsStore(args.db)
+    if args.command == 'import':
+        for path in args.paths:
+            print(f"📰 Imported {store.import_file(path, args.company)} new articles from {path}")
+        print(f"✅ {args.db} holds {len(store)} articles")
+    elif args.command == 'score':
+        from analyzer import BankruptcyAwareFinBERTAnalyzer
+
+        analyzer = BankruptcyAwareFinBERTAnalyzer()
+        print(f"✅ Scored {store.score_articles(analyzer, args.company, args.batch_size)} articles")
+    else:
+        for article in store.query(args.company, args.start, args.end, args.search, args.limit):
+            score = article['final_sentiment_score']
+            print(f"{article['published_at'][:10]}  {'unscored' if score is None else f'{score:+.3f}':>8}  "
+                  f"[{article['company']}] {article['title'][:100]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import argparse
+import queue
+import threading
+import time
+
+STAGES = ('tokenize', 'inference', 'scoring')
+
+# End-of-stream marker passed down the queues
+_DONE = object()
+
+
+def _put(stage_queue, item, stop):
+    """Put into a bounded queue, giving up if another stage has failed"""
+    while not stop.is_set():
+        try:
+            stage_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(stage_queue, stop):
+    """Get from a queue, returning _DONE if another stage has failed"""
+    while not stop.is_set():
+        try:
+            return stage_queue.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+def analyze_text_pipelined(analyzer, text, batch_size=32, queue_size=4, splitter=None):
+    """
+    analyze_text with tokenization, FinBERT inference and lexicon scoring overlapped.
+
+    A producer thread splits and cleans the text, serves cached sentences and
+    tokenizes the rest batch by batch; an inference thread runs the model; the
+    calling thread runs risk-lexicon and valence scoring. Stages are connected by
+    queues of at most ``queue_size`` batches, so memory stays bounded when one
+    stage is slower than the others. Cache lookups and stores are serialized with
+    a lock shared by the two threads.
+    Returns the analyze_text result with a 'pipeline_utilization' entry giving each
+    stage's busy seconds and share of wall time; the busiest stage is the bottleneck.
+    """
+    if not text or not isinstance(text, str):
+        return None
+
+    tokenized = queue.Queue(maxsize=queue_size)
+    scored = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    cache_lock = threading.Lock()
+    errors = []
+    busy = dict.fromkeys(STAGES, 0.0)
+    batches = dict.fromkeys(STAGES, 0)
+
+    def tokenize_stage():
+        try:
+            started = time.perf_counter()
+            sentences = analyzer.split_sentences_with_spans(text, splitter)
+            busy['tokenize'] += time.perf_counter() - started
+
+            for start in range(0, len(sentences), batch_size):
+                started = time.perf_counter()
+                batch = sentences[start:start + batch_size]
+                finbert_results = [None] * len(batch)
+                pending = {}
+                audit_references = {}
+                with cache_lock:
+                    for i, (sentence, _) in enumerate(batch):
+                        if sentence in pending:
+                            pending[sentence].append(i)
+                            continue
+                        reused, audit_reference = analyzer._reuse_finbert_result(sentence)
+                        if reused is not None:
+                            finbert_results[i] = reused
+                            continue
+                        if audit_reference is not None:
+                            audit_references[sentence] = audit_reference
+                        pending[sentence] = [i]
+                inputs = analyzer._tokenize_for_finbert(list(pending)) if pending else None
+                busy['tokenize'] += time.perf_counter() - started
+                batches['tokenize'] += 1
+                if not _put(tokenized, (batch, finbert_results, pending, audit_references, inputs), stop):
+                    return
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            _put(tokenized, _DONE, stop)
+
+    def inference_stage():
+        try:
+            while True:
+                item = _get(tokenized, stop)
+                if item is _DONE:
+                    break
+                started = time.perf_counter()
+                batch, finbert_results, pending, audit_references, inputs = item
+                if inputs is not None:
+                    try:
+                        batch_results = analyzer._run_finbert(inputs)
+                        with cache_lock:
+                            analyzer.cache_stats['misses'] += len(pending)
+                            for text_key, result in zip(pending, batch_results):
+                                analyzer._store_finbert_result(text_key, result, audit_references.get(text_key))
+                    except Exception as e:
+                        print(f"Error in FinBERT batch processing: {e}")
+                        batch_results = [analyzer._neutral_finbert_result() for _ in pending]
+                    for text_key, result in zip(pending, batch_results):
+                        for i in pending[text_key]:
+                            finbert_results[i] = dict(result)
+                busy['inference'] += time.perf_counter() - started
+                batches['inference'] += 1
+                if not _put(scored, (batch, finbert_results), stop):
+                    return
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            _put(scored, _DONE, stop)
+
+    wall_started = time.perf_counter()
+    threads = [threading.Thread(target=tokenize_stage, name='tokenize', daemon=True),
+               threading.Thread(target=inference_stage, name='inference', daemon=True)]
+    for thread in threads:
+        thread.start()
+
+    sentence_results = []
+    try:
+        while True:
+            item = _get(scored, stop)
+            if item is _DONE:
+                break
+            started = time.perf_counter()
+            batch, finbert_results = item
+            for (sentence, span), finbert_result in zip(batch, finbert_results):
+                result = analyzer._build_sentence_result(sentence, finbert_result)
+                result['source_span'] = span
+                sentence_results.append(result)
+            busy['scoring'] += time.perf_counter() - started
+            batches['scoring'] += 1
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    if errors:
+        raise errors[0]
+
+    wall = time.perf_counter() - wall_started
+    print(f"Analyzed {len(sentence_results)} sentences in {batches['scoring']} pipelined batches ({wall:.2f}s)")
+    document = analyzer.aggregate_sentence_results(sentence_results)
+    document['pipeline_utilization'] = {
+        stage: {
+            'busy_seconds': busy[stage],
+            'utilization': busy[stage] / wall if wall > 0 else 0.0,
+            'batches': batches[stage]
+        } for stage in STAGES
+    }
+    document['pipeline_utilization']['wall_seconds'] = wall
+    return document
+
+
+def bottleneck_stage(utilization):
+    """Name of the stage with the highest utilization"""
+    return max(STAGES, key=lambda stage: utilization[stage]['utilization'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sequential and pipelined analysis and report per-stage utilization")
+    parser.add_argument('paths', nargs='*', help="Text files to analyze (default: the dashboard's sample companies)")
+    parser.add_argument('--batch-size', type=int, default=32, help="FinBERT inference batch size")
+    parser.add_argument('--queue-size', type=int, default=4, help="Batches buffered between stages")
+    args = parser.parse_args()
+
+    from analyzer import BankruptcyAwareFinBERTAnalyzer
+
+    if args.paths:
+        texts = {}
+        for path in args.paths:
+            with open(path, encoding='utf-8', errors='ignore') as f:
+                texts[path] = f.read()
+    else:
+        from sample_data import company_data
+        texts = company_data
+
+    analyzer = BankruptcyAwareFinBERTAnalyzer()
+    for name, text in texts.items():
+        # Separate caches so neither run is served from the other's results
+        analyzer.finbert_cache.clear()
+        started = time.perf_counter()
+        analyzer.analyze_text(text, batch_size=args.batch_size)
+        sequential = time.perf_counter() - started
+
+        analyzer.finbert_cache.clear()
+        result = analyze_text_pipelined(analyzer, text, args.batch_size, args.queue_size)
+        utilization = result['pipeline_utilization']
+        print(f"\n=== {name} ===")
+        print(f"Sequential: {sequential:.2f}s  Pipelined: {utilization['wall_seconds']:.2f}s  "
+              f"Sentiment: {result['document_sentiment_score']:.3f}")
+        for stage in STAGES:
+            print(f"  {stage:<10} busy {utilization[stage]['busy_seconds']:.2f}s  "
+                  f"utilization {utilization[stage]['utilization']:.0%}")
+        print(f"  Bottleneck: {bottleneck_stage(utilization)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import argparse
+import heapq
+import itertools
+import os
+
+# name -> (which sentence results qualify, ranking key where larger is worse)
+RANKINGS = {
+    'most_negative': (
+        lambda result: True,
+        lambda result: (-result['final_sentiment_score'], -result['risk_score'])
+    ),
+    'most_risk_flagged': (
+        lambda result: bool(result['risk_indicators'] or result['financial_metrics']),
+        lambda result: (-result['risk_score'], len(result['risk_indicators']) + len(result['financial_metrics']),
+                        -result['final_sentiment_score'])
+    )
+}
+
+
+def _red_flag_entry(result, document_id, sentence_index):
+    return {
+        'document_id': document_id,
+        'sentence_index': sentence_index,
+        'source_span': result.get('source_span'),
+        'sentence': result['sentence'],
+        'final_sentiment_score': result['final_sentiment_score'],
+        'risk_score': result['risk_score'],
+        'risk_indicators': result['risk_indicators'],
+        'financial_metrics': [metric['type'] for metric in result['financial_metrics']]
+    }
+
+
+class RedFlagCollector:
+    """
+    Keep the k worst sentences under each of RANKINGS while sentence results stream past.
+
+    Each ranking is a min-heap of size k keyed on badness, so memory stays at k
+    entries per ranking however many sentences are added.
+    """
+
+    def __init__(self, k=10):
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        self.k = k
+        self.heaps = {name: [] for name in RANKINGS}
+        self.sentences_seen = 0
+        self._order = itertools.count()
+
+    def add(self, result, document_id=None, sentence_index=None):
+        """Offer one sentence result (as built by analyze_sentences) to every ranking"""
+        self.sentences_seen += 1
+        entry = None
+        for name, (eligible, rank) in RANKINGS.items():
+            if not eligible(result):
+                continue
+            heap = self.heaps[name]
+            key = rank(result)
+            if len(heap) >= self.k and key <= heap[0][0]:
+                continue
+            if entry is None:
+                entry = _red_flag_entry(result, document_id, sentence_index)
+            item = (key, next(self._order), entry)
+            if len(heap) < self.k:
+                heapq.heappush(heap, item)
+            else:
+                heapq.heapreplace(heap, item)
+
+    def add_results(self, sentence_results, document_id=None):
+        """Offer a list of sentence results, e.g. an analyze_text result's sentence_details"""
+        for i, result in enumerate(sentence_results):
+            if result:
+                self.add(result, document_id, i)
+
+    def red_flags(self):
+        """The collected sentences per ranking, worst first"""
+        flags = {name: [entry for _, _, entry in sorted(heap, key=lambda item: item[0], reverse=True)]
+                 for name, heap in self.heaps.items()}
+        flags['sentences_scanned'] = self.sentences_seen
+        return flags
+
+
+def find_red_flags(analyzer, documents, k=10, batch_size=32, splitter=None):
+    """
+    Stream (document_id, text) pairs through the analyzer keeping only the k worst sentences.
+
+    Sentence results are discarded batch by batch, so memory is bounded by one
+    document's sentence list plus the k retained entries; each entry carries the
+    sentence's source_span within its document.
+    """
+    collector = RedFlagCollector(k)
+    for document_id, text in documents:
+        if not text or not isinstance(text, str):
+            continue
+        sentences = analyzer.split_sentences_with_spans(text, splitter)
+        for start in range(0, len(sentences), batch_size):
+            batch = sentences[start:start + batch_size]
+            results = analyzer.analyze_sentences([sentence for sentence, _ in batch], batch_size=batch_size)
+            for offset, ((_, span), result) in enumerate(zip(batch, results)):
+                if result:
+                    result['source_span'] = span
+                    collector.add(result, document_id, start + offset)
+    return collector.red_flags()
+
+
+def iter_corpus_documents(path):
+    """Yield (relative path, text) for every file under ``path``, reading one file at a time"""
+    if os.path.isfile(path):
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            yield os.path.basename(path), f.read()
+        return
+    for directory, subdirectories, names in os.walk(path):
+        subdirectories.sort()
+        for name in sorted(names):
+            file_path = os.path.join(directory, name)
+            with open(file_path, encoding='utf-8', errors='ignore') as f:
+                yield os.path.relpath(file_path, path), f.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract the k riskiest sentences from a filing or corpus")
+    parser.add_argument('path', help="A filing text file or a directory of filings (searched recursively)")
+    parser.add_argument('-k', type=int, default=10, help="Sentences to keep per ranking")
+    parser.add_argument('--batch-size', type=int, default=32, help="FinBERT inference batch size")
+    args = parser.parse_args()
+    if args.k < 1:
+        parser.error("-k must be at least 1")
+
+    from analyzer import BankruptcyAwareFinBERTAnalyzer
+
+    analyzer = BankruptcyAwareFinBERTAnalyzer()
+    flags = find_red_flags(analyzer, iter_corpus_documents(args.path), k=args.k, batch_size=args.batch_size)
+
+    print(f"\n🚩 Red flags from {flags['sentences_scanned']} sentences")
+    for name in RANKINGS:
+        print(f"\n=== {name.replace('_', ' ').upper()} ===")
+        for entry in flags[name]:
+            print(f"{entry['final_sentiment_score']:.3f} / risk {entry['risk_score']:.3f}  "
+                  f"[{entry['document_id']} @ {entry['source_span']}] {entry['sentence'][:120]}")
+
+
+if __name__ == "__main__":
+    main()
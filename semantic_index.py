@@ -0,0 +1,201 @@
+import argparse
+import json
+import os
+import numpy as np
+
+DEFAULT_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+MANIFEST_NAME = 'manifest.json'
+SEARCH_CHUNK_ROWS = 65536
+
+
+class SemanticIndex:
+    """
+    Embedding index over analyzed sentences for finding paraphrased risk language.
+
+    Sentences are embedded in batches with sentence-transformers and stored as
+    normalized float32 shards (``embeddings-NNNNN.npy``) next to JSONL sentence
+    records. Shards are opened memory-mapped and scanned in ``SEARCH_CHUNK_ROWS``
+    blocks, so the corpus does not have to fit in memory; only the records of the
+    top-k hits are read back from disk via a per-shard byte-offset table.
+    """
+
+    def __init__(self, directory, model_name=None):
+        self.directory = directory
+        self._model = None
+        os.makedirs(directory, exist_ok=True)
+
+        manifest_path = os.path.join(directory, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as f:
+                self.manifest = json.load(f)
+            if model_name and model_name != self.manifest['model_name']:
+                raise ValueError(f"Index at {directory} was built with '{self.manifest['model_name']}', not '{model_name}'")
+        else:
+            self.manifest = {'model_name': model_name or DEFAULT_MODEL, 'dimension': None, 'shards': []}
+
+        self.shards = [self._open_shard(shard) for shard in self.manifest['shards']]
+
+    @property
+    def model(self):
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.manifest['model_name'])
+        return self._model
+
+    def _open_shard(self, shard):
+        return {
+            'embeddings': np.load(os.path.join(self.directory, shard['embeddings']), mmap_mode='r'),
+            'offsets': np.load(os.path.join(self.directory, shard['offsets']), mmap_mode='r'),
+            'records': os.path.join(self.directory, shard['records'])
+        }
+
+    def _write_manifest(self):
+        with open(os.path.join(self.directory, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+
+    def embed(self, texts, batch_size=64):
+        """Unit-normalized float32 embeddings, so a dot product is the cosine similarity"""
+        embeddings = self.model.encode(list(texts), batch_size=batch_size, convert_to_numpy=True,
+                                       normalize_embeddings=True, show_progress_bar=False)
+        return np.asarray(embeddings, dtype=np.float32)
+
+    def add(self, records, batch_size=64):
+        """
+        Embed and index records as a new shard.
+
+        Each record is a dict with a 'sentence' key plus any JSON-serializable
+        metadata (document id, scores, source span) returned with search hits.
+        """
+        records = [record for record in records if record.get('sentence')]
+        if not records:
+            return 0
+
+        shard_id = len(self.manifest['shards'])
+        shard = {
+            'embeddings': f"embeddings-{shard_id:05d}.npy",
+            'offsets': f"offsets-{shard_id:05d}.npy",
+            'records': f"records-{shard_id:05d}.jsonl",
+            'count': len(records)
+        }
+
+        embeddings = None
+        for start in range(0, len(records), batch_size * 16):
+            batch = self.embed([record['sentence'] for record in records[start:start + batch_size * 16]], batch_size)
+            if embeddings is None:
+                dimension = batch.shape[1]
+                if self.manifest['dimension'] not in (None, dimension):
+                    raise ValueError(f"Embedding dimension {dimension} does not match index dimension {self.manifest['dimension']}")
+                self.manifest['dimension'] = dimension
+                embeddings = np.lib.format.open_memmap(
+                    os.path.join(self.directory, shard['embeddings']), mode='w+',
+                    dtype=np.float32, shape=(len(records), dimension)
+                )
+            embeddings[start:start + len(batch)] = batch
+        embeddings.flush()
+        del embeddings
+
+        offsets = np.empty(len(records), dtype=np.int64)
+        with open(os.path.join(self.directory, shard['records']), 'wb') as f:
+            for i, record in enumerate(records):
+                offsets[i] = f.tell()
+                f.write(json.dumps(record).encode('utf-8') + b'\n')
+        np.save(os.path.join(self.directory, shard['offsets']), offsets)
+
+        self.manifest['shards'].append(shard)
+        self._write_manifest()
+        self.shards.append(self._open_shard(shard))
+        return len(records)
+
+    def add_analysis(self, result, document_id, batch_size=64):
+        """Index the sentence_details of an analyze_text result under ``document_id``"""
+        records = [{
+            'document_id': document_id,
+            'sentence_index': i,
+            'sentence': details['sentence'],
+            'final_sentiment_score': details['final_sentiment_score'],
+            'risk_indicators': details['risk_indicators'],
+            'source_span': details.get('source_span')
+        } for i, details in enumerate(result['sentence_details'])]
+        return self.add(records, batch_size=batch_size)
+
+    def _read_record(self, shard, row):
+        with open(shard['records'], 'rb') as f:
+            f.seek(int(shard['offsets'][row]))
+            return json.loads(f.readline())
+
+    def search(self, query, k=10, min_similarity=None):
+        """
+        Return the ``k`` indexed sentences most similar to ``query``.
+
+        Each hit is its stored record plus a 'similarity' (cosine) key, most similar first.
+        """
+        if not self.shards or k <= 0:
+            return []
+        query_vector = self.embed([query])[0]
+
+        candidates = []
+        for shard_index, shard in enumerate(self.shards):
+            embeddings = shard['embeddings']
+            for start in range(0, len(embeddings), SEARCH_CHUNK_ROWS):
+                similarities = embeddings[start:start + SEARCH_CHUNK_ROWS] @ query_vector
+                if len(similarities) > k:
+                    top = np.argpartition(similarities, -k)[-k:]
+                else:
+                    top = np.arange(len(similarities))
+                candidates.extend((float(similarities[row]), shard_index, start + int(row)) for row in top)
+
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        hits = []
+        for similarity, shard_index, row in candidates[:k]:
+            if min_similarity is not None and similarity < min_similarity:
+                break
+            record = self._read_record(self.shards[shard_index], row)
+            record['similarity'] = similarity
+            hits.append(record)
+        return hits
+
+    def __len__(self):
+        return sum(shard['count'] for shard in self.manifest['shards'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Semantic search for paraphrased risk language across analyzed filings")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help="Analyze filings and add their sentences to the index")
+    build.add_argument('index', help="Index directory")
+    build.add_argument('path', help="Directory of one company's filings, or a directory of company directories")
+    build.add_argument('--model', help=f"sentence-transformers model (default {DEFAULT_MODEL})")
+    build.add_argument('--batch-size', type=int, default=32, help="FinBERT inference batch size")
+    build.add_argument('--embedding-batch-size', type=int, default=64, help="Sentence embedding batch size")
+
+    search = subparsers.add_parser('search', help="Find indexed sentences similar to a query")
+    search.add_argument('index', help="Index directory")
+    search.add_argument('query', help="e.g. 'substantial doubt about our ability to continue'")
+    search.add_argument('-k', type=int, default=10, help="Number of sentences to return")
+    search.add_argument('--min-similarity', type=float, help="Drop hits below this cosine similarity")
+    args = parser.parse_args()
+
+    if args.command == 'search':
+        index = SemanticIndex(args.index)
+        for hit in index.search(args.query, k=args.k, min_similarity=args.min_similarity):
+            print(f"{hit['similarity']:.3f}  [{hit.get('document_id', '')}] {hit['sentence'][:140]}")
+        return
+
+    from analyzer import BankruptcyAwareFinBERTAnalyzer
+    from trends import load_filing_directory
+
+    index = SemanticIndex(args.index, model_name=args.model)
+    analyzer = BankruptcyAwareFinBERTAnalyzer()
+    for company, filings in load_filing_directory(args.path).items():
+        for period, text in filings:
+            result = analyzer.analyze_text(text, batch_size=args.batch_size)
+            if result is None:
+                continue
+            added = index.add_analysis(result, f"{company}/{period}", batch_size=args.embedding_batch_size)
+            print(f"🔎 Indexed {added} sentences from {company}/{period}")
+    print(f"✅ Index at {args.index} holds {len(index)} sentences")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import re
+import numpy as np
+import pandas as pd
+from lexicon import RISK_CATEGORIES
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+(?:['\-][a-z0-9]+)*")
+
+SORT_COLUMNS = ('sentence_index', 'final_sentiment_score', 'risk_score', 'finbert_base_score', 'word_count')
+
+
+class SentenceExplorer:
+    """
+    Filterable table of an analysis' sentence_details.
+
+    The table and its indexes are built once per result: row positions per risk
+    category, row positions sorted by final sentiment score (range queries are two
+    binary searches) and an inverted index from lowercased words to row positions.
+    Queries intersect index hits and return row positions; only the requested page
+    is materialized as a DataFrame.
+    """
+
+    def __init__(self, sentence_results):
+        rows = [result for result in sentence_results if result]
+        spans = [result.get('source_span') or (None, None) for result in rows]
+        self.table = pd.DataFrame({
+            'sentence_index': np.arange(len(rows)),
+            'final_sentiment_score': [result['final_sentiment_score'] for result in rows],
+            'risk_score': [result['risk_score'] for result in rows],
+            'finbert_base_score': [result['finbert_base_score'] for result in rows],
+            'word_count': [result['word_count'] for result in rows],
+            'risk_indicators': [', '.join(result['risk_indicators']) for result in rows],
+            'financial_metrics': [', '.join(metric['type'] for metric in result['financial_metrics']) for result in rows],
+            'valence_shifters': [', '.join(result['valence_shifters']) for result in rows],
+            'sentence': [result['sentence'] for result in rows],
+            'span_start': pd.array([start for start, _ in spans], dtype='Int64'),
+            'span_end': pd.array([end for _, end in spans], dtype='Int64')
+        })
+
+        categories = {}
+        postings = {}
+        for i, result in enumerate(rows):
+            for category in result['risk_indicators_by_category']:
+                categories.setdefault(category, []).append(i)
+            for word in set(WORD_PATTERN.findall(result['sentence'].lower())):
+                postings.setdefault(word, []).append(i)
+        self.category_index = {category: np.array(positions, dtype=np.int64)
+                               for category, positions in categories.items()}
+        self.word_index = {word: np.array(positions, dtype=np.int64) for word, positions in postings.items()}
+
+        scores = self.table['final_sentiment_score'].to_numpy()
+        self.score_order = np.argsort(scores, kind='stable')
+        self.sorted_scores = scores[self.score_order]
+
+    def __len__(self):
+        return len(self.table)
+
+    def categories(self):
+        """Risk categories present in the document, in RISK_CATEGORIES order"""
+        return [category for category in RISK_CATEGORIES if category in self.category_index]
+
+    def rows_in_category(self, categories):
+        """Row positions with an indicator in any of ``categories``"""
+        hits = [self.category_index[category] for category in categories if category in self.category_index]
+        return np.unique(np.concatenate(hits)) if hits else np.zeros(0, dtype=np.int64)
+
+    def rows_in_score_range(self, low, high):
+        """Row positions whose final sentiment score lies in [low, high]"""
+        start = np.searchsorted(self.sorted_scores, low, side='left')
+        end = np.searchsorted(self.sorted_scores, high, side='right')
+        return np.sort(self.score_order[start:end])
+
+    def rows_matching(self, keywords):
+        """Row positions containing every word of ``keywords`` (case-insensitive, whole words)"""
+        words = WORD_PATTERN.findall(keywords.lower())
+        if not words:
+            return np.arange(len(self.table))
+        postings = sorted((self.word_index.get(word, np.zeros(0, dtype=np.int64)) for word in words), key=len)
+        rows = postings[0]
+        for positions in postings[1:]:
+            rows = np.intersect1d(rows, positions, assume_unique=True)
+        return rows
+
+    def query(self, categories=None, score_range=None, keywords=None, sort_by='sentence_index', ascending=True):
+        """
+        Row positions matching all given filters, ordered by ``sort_by``.
+
+        ``categories`` keeps sentences flagged in any of the listed risk categories,
+        ``score_range`` is an inclusive (low, high) final sentiment range and
+        ``keywords`` requires every word to appear in the sentence.
+        """
+        filters = []
+        if categories:
+            filters.append(self.rows_in_category(categories))
+        if score_range is not None:
+            filters.append(self.rows_in_score_range(*score_range))
+        if keywords and keywords.strip():
+            filters.append(self.rows_matching(keywords))
+
+        if not filters:
+            rows = np.arange(len(self.table))
+        else:
+            filters.sort(key=len)
+            rows = filters[0]
+            for positions in filters[1:]:
+                rows = np.intersect1d(rows, positions, assume_unique=True)
+
+        if sort_by != 'sentence_index':
+            values = self.table[sort_by].to_numpy()[rows]
+            rows = rows[np.argsort(values if ascending else -values, kind='stable')]
+        elif not ascending:
+            rows = rows[::-1]
+        return rows
+
+    def page(self, rows, page=1, page_size=50):
+        """The DataFrame slice for 1-based ``page`` of ``rows``"""
+        start = (max(1, page) - 1) * page_size
+        return self.table.iloc[rows[start:start + page_size]]
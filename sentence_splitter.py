@@ -0,0 +1,152 @@
+import re
+import time
+
+# Tokens ending in a period that do not end a sentence in SEC filings
+ABBREVIATIONS = {
+    'no.', 'nos.', 'inc.', 'corp.', 'co.', 'ltd.', 'llc.', 'l.p.', 'l.l.c.', 'plc.', 'n.a.',
+    'mr.', 'mrs.', 'ms.', 'dr.', 'st.', 'jr.', 'sr.', 'vs.', 'v.', 'approx.', 'est.', 'dept.',
+    'e.g.', 'i.e.', 'cf.', 'fig.', 'sec.', 'art.', 'para.', 'ch.', 'vol.', 'pp.', 'p.',
+    'jan.', 'feb.', 'mar.', 'apr.', 'jun.', 'jul.', 'aug.', 'sep.', 'sept.', 'oct.', 'nov.', 'dec.',
+    'u.s.', 'u.s.a.', 'u.k.', 'mo.', 'qtr.', 'yr.', 'mil.', 'bil.', 'mm.', 'avg.', 'ref.'
+}
+
+# Bullets start a new paragraph
+BULLET_CHARS = '•●◦▪■□◆‣∙·'
+SENTENCE_BOUNDARY = re.compile(r'[.!?]["\'”’)\]]*\s+(?=["\'“‘(\[]?[A-Z0-9$])')
+INITIALISM = re.compile(r'(?:[A-Za-z]\.){2,}')
+WHITESPACE = re.compile(r'\s+')
+HEADING_MAX_WORDS = 6
+
+
+def _split_lines(lines):
+    """Join the wrapped lines of a paragraph, keeping short heading lines as their own segments"""
+    segments = []
+    current = []
+    for i, line in enumerate(lines):
+        is_heading = (
+            i + 1 < len(lines)
+            and line.count(' ') < HEADING_MAX_WORDS
+            and line[0].isupper()
+            and line[-1] not in '.!?,;:'
+            and lines[i + 1][0].isupper()
+        )
+        current.append(line)
+        if is_heading or line[-1] in '.!?:':
+            segments.append(' '.join(current))
+            current = []
+    if current:
+        segments.append(' '.join(current))
+    return segments
+
+
+def _split_segment(segment):
+    """Split one paragraph segment at sentence punctuation, skipping abbreviations and initialisms"""
+    sentences = []
+    start = 0
+    for match in SENTENCE_BOUNDARY.finditer(segment):
+        period = match.start()
+        token_start = max(start, segment.rfind(' ', start, period) + 1)
+        token = segment[token_start:period + 1]
+        if segment[period] == '.':
+            lowered = token.lower().lstrip('("\'“')
+            if lowered in ABBREVIATIONS or INITIALISM.fullmatch(lowered):
+                continue
+        sentences.append(segment[start:match.end()].strip())
+        start = match.end()
+    tail = segment[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def split_financial_sentences(text):
+    """
+    Rule-based sentence splitter tuned for SEC filings.
+
+    Handles decimal amounts ("$1.259 billion"), abbreviations ("No. 2", "Inc.",
+    "U.S."), bullet lists, paragraph breaks and short headings without terminal
+    punctuation. Operates on raw text; callers clean each sentence afterwards.
+    """
+    if not text:
+        return []
+    for bullet in BULLET_CHARS:
+        if bullet in text:
+            text = text.replace(bullet, '\n\n')
+
+    sentences = []
+    paragraph = []
+    for line in text.split('\n'):
+        line = ' '.join(line.split())
+        if line:
+            paragraph.append(line)
+        elif paragraph:
+            for segment in _split_lines(paragraph):
+                sentences.extend(_split_segment(segment))
+            paragraph = []
+    if paragraph:
+        for segment in _split_lines(paragraph):
+            sentences.extend(_split_segment(segment))
+    return sentences
+
+
+def _boundaries(sentences):
+    """Sentence end offsets in whitespace-free text, used to compare splitters"""
+    offsets = set()
+    position = 0
+    for sentence in sentences:
+        position += len(WHITESPACE.sub('', sentence))
+        offsets.add(position)
+    return offsets
+
+
+def compare_splitters(analyzer, texts, repeats=5):
+    """
+    Benchmark the regex splitter against NLTK Punkt as used by analyze_text.
+
+    Both splitters run through analyzer.tokenize_sentences so the cleaned sentences
+    are comparable. Returns timing and boundary precision/recall/F1 of the regex
+    splitter using Punkt's boundaries as the reference.
+    """
+    timings = {}
+    splits = {}
+    for splitter in ('punkt', 'regex'):
+        started = time.perf_counter()
+        for _ in range(repeats):
+            splits[splitter] = [analyzer.tokenize_sentences(text, splitter=splitter) for text in texts]
+        timings[splitter] = (time.perf_counter() - started) / repeats
+
+    true_positives = reference_total = predicted_total = 0
+    for punkt_sentences, regex_sentences in zip(splits['punkt'], splits['regex']):
+        reference = _boundaries(punkt_sentences)
+        predicted = _boundaries(regex_sentences)
+        true_positives += len(reference & predicted)
+        reference_total += len(reference)
+        predicted_total += len(predicted)
+
+    precision = true_positives / predicted_total if predicted_total else 0.0
+    recall = true_positives / reference_total if reference_total else 0.0
+    return {
+        'punkt_seconds': timings['punkt'],
+        'regex_seconds': timings['regex'],
+        'speedup': timings['punkt'] / timings['regex'] if timings['regex'] else 0.0,
+        'punkt_sentences': sum(len(s) for s in splits['punkt']),
+        'regex_sentences': sum(len(s) for s in splits['regex']),
+        'boundary_precision': precision,
+        'boundary_recall': recall,
+        'boundary_f1': 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    }
+
+
+if __name__ == "__main__":
+    from analyzer import BankruptcyAwareFinBERTAnalyzer
+    from sample_data import company_data
+
+    analyzer = BankruptcyAwareFinBERTAnalyzer()
+    report = compare_splitters(analyzer, list(company_data.values()))
+
+    print("\n=== SENTENCE SPLITTER BENCHMARK (bundled company_data) ===")
+    print(f"Punkt: {report['punkt_seconds'] * 1000:.1f} ms, {report['punkt_sentences']} sentences")
+    print(f"Regex: {report['regex_seconds'] * 1000:.1f} ms, {report['regex_sentences']} sentences")
+    print(f"Speedup: {report['speedup']:.1f}x")
+    print(f"Boundary agreement vs Punkt: precision {report['boundary_precision']:.1%}, "
+          f"recall {report['boundary_recall']:.1%}, F1 {report['boundary_f1']:.1%}")
@@ -0,0 +1,319 @@
+import argparse
+import itertools
+import json
+import os
+import time
+import zlib
+from collections import Counter
+import numpy as np
+
+MANIFEST_NAME = 'manifest.json'
+INDEX_NAME = 'documents.jsonl'
+COLUMNS_NAME = 'columns.bin'
+BLOCKS_NAME = 'blocks.bin'
+DICTIONARY_NAME = 'dictionary.bin'
+
+# zlib only uses the last 32 KB of a preset dictionary
+ZLIB_DICTIONARY_SIZE = 32 * 1024
+ZSTD_DICTIONARY_SIZE = 110 * 1024
+
+SCORE_COLUMNS = ('finbert_base_score', 'risk_score', 'final_sentiment_score', 'finbert_confidence', 'risk_confidence')
+COUNT_COLUMNS = ('word_count', 'alpha_word_count', 'syllable_count', 'complex_word_count')
+COLUMN_DTYPE = np.dtype([(name, '<f4') for name in SCORE_COLUMNS] + [(name, '<u4') for name in COUNT_COLUMNS]
+                        + [('span_start', '<i8'), ('span_end', '<i8')])
+
+# Variable-length sentence fields, stored in compressed blocks in this order
+TEXT_FIELDS = ('sentence', 'risk_indicators', 'risk_indicators_by_category', 'financial_metrics',
+               'valence_shifters', 'lexicon_version')
+
+
+def _payload(result):
+    return json.dumps([result.get(field) for field in TEXT_FIELDS], separators=(',', ':')).encode('utf-8')
+
+
+class SentenceStore:
+    """
+    Append-only on-disk store of analyze_text sentence_details.
+
+    Numeric fields are fixed-width rows in ``columns.bin`` (scores as float32,
+    counts as uint32, source spans as int64 with -1 for none). Sentence text,
+    indicators, metrics and shifters are JSON-encoded and compressed in blocks of
+    ``block_sentences`` with a dictionary trained on the corpus, so boilerplate
+    repeated across filings costs a few bytes per sentence; zstd is used when the
+    zstandard package is installed, otherwise zlib with a preset dictionary.
+    ``documents.jsonl`` is the offset index: per document its first column row,
+    sentence count and the (offset, length) of each block, so a document or a
+    single sentence is read with a seek per block. Re-adding a document id
+    supersedes the earlier entry.
+    """
+
+    def __init__(self, directory, block_sentences=256, level=None):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        manifest_path = os.path.join(directory, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        else:
+            try:
+                import zstandard  # noqa: F401
+                codec = 'zstd'
+            except ImportError:
+                codec = 'zlib'
+            self.manifest = {'codec': codec, 'level': level or (19 if codec == 'zstd' else 9),
+                             'block_sentences': block_sentences, 'dictionary': None}
+            self._write_manifest()
+
+        self.documents = {}
+        index_path = os.path.join(directory, INDEX_NAME)
+        if os.path.exists(index_path):
+            with open(index_path, encoding='utf-8') as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self.documents[entry['document_id']] = entry
+        self._load_codec()
+
+    def _write_manifest(self):
+        with open(os.path.join(self.directory, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _load_codec(self):
+        dictionary = None
+        if self.manifest['dictionary']:
+            with open(self._path(self.manifest['dictionary']), 'rb') as f:
+                dictionary = f.read()
+
+        if self.manifest['codec'] == 'zstd':
+            import zstandard
+            dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            compressor = zstandard.ZstdCompressor(level=self.manifest['level'], dict_data=dict_data)
+            decompressor = zstandard.ZstdDecompressor(dict_data=dict_data)
+            self._compress = compressor.compress
+            self._decompress = decompressor.decompress
+            return
+
+        level = self.manifest['level']
+
+        def compress(data):
+            compressor = zlib.compressobj(level, zdict=dictionary) if dictionary else zlib.compressobj(level)
+            return compressor.compress(data) + compressor.flush()
+
+        def decompress(data):
+            decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+            return decompressor.decompress(data) + decompressor.flush()
+
+        self._compress = compress
+        self._decompress = decompress
+
+    def train_dictionary(self, sentence_results):
+        """
+        Build the shared compression dictionary from sample sentence results.
+
+        Must run before the first document is added (add does it from that
+        document otherwise). With zlib the dictionary is the most repeated
+        sentence payloads, most frequent last since zlib favors nearby matches.
+        """
+        if self.documents:
+            raise ValueError("The dictionary must be trained before documents are added")
+        samples = [_payload(result) for result in sentence_results if result]
+        if not samples:
+            return
+
+        if self.manifest['codec'] == 'zstd':
+            import zstandard
+            try:
+                dictionary = zstandard.train_dictionary(ZSTD_DICTIONARY_SIZE, samples).as_bytes()
+            except zstandard.ZstdError:
+                # Too few samples to train on; compress without a dictionary
+                return
+        else:
+            dictionary = b''.join(sample for sample, _ in reversed(Counter(samples).most_common()))
+            dictionary = dictionary[-ZLIB_DICTIONARY_SIZE:]
+
+        with open(self._path(DICTIONARY_NAME), 'wb') as f:
+            f.write(dictionary)
+        self.manifest['dictionary'] = DICTIONARY_NAME
+        self._write_manifest()
+        self._load_codec()
+
+    def add(self, document_id, sentence_details):
+        """Append a document's sentence_details; returns the number of sentences stored"""
+        results = [result for result in sentence_details if result]
+        if not self.documents and not self.manifest['dictionary']:
+            self.train_dictionary(results)
+
+        columns = np.zeros(len(results), dtype=COLUMN_DTYPE)
+        for i, result in enumerate(results):
+            for name in SCORE_COLUMNS + COUNT_COLUMNS:
+                columns[name][i] = result.get(name, 0)
+            span = result.get('source_span')
+            columns['span_start'][i], columns['span_end'][i] = span if span else (-1, -1)
+
+        block_size = self.manifest['block_sentences']
+        blocks = []
+        with open(self._path(BLOCKS_NAME), 'ab') as f:
+            offset = f.tell()
+            for start in range(0, len(results), block_size):
+                payloads = b','.join(_payload(result) for result in results[start:start + block_size])
+                block = self._compress(b'[' + payloads + b']')
+                f.write(block)
+                blocks.append([offset, len(block)])
+                offset += len(block)
+
+        with open(self._path(COLUMNS_NAME), 'ab') as f:
+            row_start = f.tell() // COLUMN_DTYPE.itemsize
+            f.write(columns.tobytes())
+
+        entry = {
+            'document_id': document_id,
+            'row_start': row_start,
+            'sentences': len(results),
+            'blocks': blocks,
+            'raw_bytes': len(json.dumps(results, default=str).encode('utf-8'))
+        }
+        with open(self._path(INDEX_NAME), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        self.documents[document_id] = entry
+        return len(results)
+
+    def _read_block(self, f, block):
+        offset, length = block
+        f.seek(offset)
+        return json.loads(self._decompress(f.read(length)))
+
+    def _read_columns(self, row_start, count):
+        with open(self._path(COLUMNS_NAME), 'rb') as f:
+            return np.fromfile(f, dtype=COLUMN_DTYPE, count=count, offset=row_start * COLUMN_DTYPE.itemsize)
+
+    @staticmethod
+    def _sentence_result(payload, row):
+        result = dict(zip(TEXT_FIELDS, payload))
+        for name in SCORE_COLUMNS:
+            result[name] = float(row[name])
+        for name in COUNT_COLUMNS:
+            result[name] = int(row[name])
+        result['source_span'] = (int(row['span_start']), int(row['span_end'])) if row['span_start'] >= 0 else None
+        return result
+
+    def load(self, document_id):
+        """A document's sentence_details, in the shape analyze_text produced them"""
+        entry = self.documents[document_id]
+        rows = self._read_columns(entry['row_start'], entry['sentences'])
+        payloads = []
+        with open(self._path(BLOCKS_NAME), 'rb') as f:
+            for block in entry['blocks']:
+                payloads.extend(self._read_block(f, block))
+        return [self._sentence_result(payload, row) for payload, row in zip(payloads, rows)]
+
+    def sentence(self, document_id, sentence_id):
+        """One sentence result, decompressing only the block that holds it"""
+        entry = self.documents[document_id]
+        if not 0 <= sentence_id < entry['sentences']:
+            raise IndexError(f"{document_id} has {entry['sentences']} sentences")
+        block_size = self.manifest['block_sentences']
+        with open(self._path(BLOCKS_NAME), 'rb') as f:
+            payload = self._read_block(f, entry['blocks'][sentence_id // block_size])[sentence_id % block_size]
+        row = self._read_columns(entry['row_start'] + sentence_id, 1)[0]
+        return self._sentence_result(payload, row)
+
+    def scores(self, document_id):
+        """A document's numeric columns as a structured array, without touching the text blocks"""
+        entry = self.documents[document_id]
+        return self._read_columns(entry['row_start'], entry['sentences'])
+
+    def __contains__(self, document_id):
+        return document_id in self.documents
+
+    def __len__(self):
+        return len(self.documents)
+
+    def storage_report(self):
+        """JSON size of the stored sentence_details versus bytes on disk"""
+        raw = sum(entry['raw_bytes'] for entry in self.documents.values())
+        stored = sum(os.path.getsize(self._path(name)) for name in
+                     (COLUMNS_NAME, BLOCKS_NAME, INDEX_NAME, DICTIONARY_NAME) if os.path.exists(self._path(name)))
+        return {
+            'documents': len(self.documents),
+            'sentences': sum(entry['sentences'] for entry in self.documents.values()),
+            'codec': self.manifest['codec'],
+            'raw_json_bytes': raw,
+            'stored_bytes': stored,
+            'compression_ratio': raw / stored if stored else 0.0
+        }
+
+
+def iter_analyzed_documents(analyzer, path, batch_size=32):
+    """Yield (company/period, sentence_details) for every filing under ``path`` (see trends.load_filing_directory)"""
+    from trends import load_filing_directory
+
+    for company, filings in load_filing_directory(path).items():
+        for period, text in filings:
+            result = analyzer.analyze_text(text, batch_size=batch_size)
+            if result is not None:
+                yield f"{company}/{period}", result['sentence_details']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compressed on-disk store of analyzed sentence details")
+    parser.add_argument('store', help="Store directory")
+    parser.add_argument('--train-documents', type=int, default=20,
+                        help="Documents used to train the compression dictionary of a new store")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help="Analyze filings and store their sentence details")
+    build.add_argument('path', help="Directory of one company's filings, or a directory of company directories")
+    build.add_argument('--batch-size', type=int, default=32, help="FinBERT inference batch size")
+
+    load = subparsers.add_parser('import-queue', help="Store the results checkpointed in a job queue (job_queue.py)")
+    load.add_argument('queue', help="SQLite job queue database")
+
+    show = subparsers.add_parser('show', help="Print a document's sentences")
+    show.add_argument('document_id')
+    show.add_argument('--sentence', type=int, help="Only this sentence id")
+
+    subparsers.add_parser('stats', help="Documents, sentences and compression ratio")
+    args = parser.parse_args()
+
+    store = SentenceStore(args.store)
+    if args.command in ('build', 'import-queue'):
+        if args.command == 'build':
+            from analyzer import BankruptcyAwareFinBERTAnalyzer
+
+            documents = iter_analyzed_documents(BankruptcyAwareFinBERTAnalyzer(), args.path, args.batch_size)
+        else:
+            from job_queue import JobQueue
+
+            documents = ((document_id, result['sentence_details'])
+                         for document_id, result in JobQueue(args.queue).results(include_details=True))
+
+        # Train the dictionary on the first documents, then stream the rest
+        training = []
+        if not store.manifest['dictionary'] and not len(store):
+            training = list(itertools.islice(documents, args.train_documents))
+            store.train_dictionary([result for _, details in training for result in details])
+        for document_id, details in itertools.chain(training, documents):
+            print(f"🗄️ Stored {store.add(document_id, details)} sentences from {document_id}")
+
+    elif args.command == 'show':
+        started = time.perf_counter()
+        if args.sentence is not None:
+            results = [store.sentence(args.document_id, args.sentence)]
+        else:
+            results = store.load(args.document_id)
+        elapsed = time.perf_counter() - started
+        for result in results:
+            print(f"{result['final_sentiment_score']:+.3f}  risk {result['risk_score']:.3f}  {result['sentence'][:120]}")
+        print(f"\n⏱️ Loaded {len(results)} sentences in {elapsed * 1000:.1f} ms")
+        return
+
+    report = store.storage_report()
+    print(f"\n📦 {report['documents']} documents, {report['sentences']} sentences ({report['codec']}): "
+          f"{report['raw_json_bytes'] / 1e6:.2f} MB as JSON -> {report['stored_bytes'] / 1e6:.2f} MB on disk "
+          f"({report['compression_ratio']:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import pytest
+import batching
+from batching import AdaptiveBatchSizer
+
+
+@pytest.fixture
+def rss(monkeypatch):
+    reading = {'mb': 500.0}
+    monkeypatch.setattr(batching, 'current_rss_mb', lambda: reading['mb'])
+    return reading
+
+
+def test_rss_over_budget_at_the_starting_size_backs_off(rss):
+    sizer = AdaptiveBatchSizer(initial=32, memory_limit_mb=1000)
+    rss['mb'] = 1200.0
+    sizer.record(32, 32 * 40, 0.5)
+    assert sizer.batch_size == 16
+    assert sizer.backoffs == {'memory': 1}
+    assert sizer.ceiling == 16
+
+
+def test_baseline_already_over_budget_does_not_shrink(rss):
+    rss['mb'] = 1200.0
+    sizer = AdaptiveBatchSizer(initial=32, memory_limit_mb=1000)
+    for _ in range(3):
+        sizer.record(32, 32 * 40, 0.5)
+    assert sizer.batch_size == 32
+    assert not sizer.backoffs
+
+
+def test_growth_that_pushes_rss_over_budget_backs_off_once(rss):
+    sizer = AdaptiveBatchSizer(initial=32, memory_limit_mb=1000, probe_batches=1)
+    sizer.record(32, 32 * 40, 0.5)
+    assert sizer.batch_size == 64
+    rss['mb'] = 1200.0
+    sizer.record(64, 64 * 40, 0.5)
+    assert sizer.batch_size == 32
+    sizer.record(32, 32 * 40, 0.5)
+    assert sizer.batch_size == 32
+    assert sizer.backoffs == {'memory': 1}
@@ -0,0 +1,48 @@
+import os
+import sqlite3
+from inbox_watcher import InboxWatcher
+from job_queue import JobQueue
+
+
+def _settle(watcher):
+    # First scan records the file's signature, the second finds it unchanged
+    return watcher.enqueue_ready() + watcher.enqueue_ready()
+
+
+def _jobs(queue):
+    with sqlite3.connect(queue.path) as connection:
+        return connection.execute("SELECT document_id, status, content_hash FROM jobs ORDER BY id").fetchall()
+
+
+def test_files_are_queued_by_path_and_copies_skipped(tmp_path):
+    inbox = tmp_path / 'inbox'
+    inbox.mkdir()
+    (inbox / 'filing.txt').write_text("Revenue declined.")
+    watcher = InboxWatcher(str(inbox), JobQueue(str(tmp_path / 'queue.db')), settle_seconds=0)
+    assert _settle(watcher) == [str(inbox / 'filing.txt')]
+
+    (inbox / 'copy.txt').write_text("Revenue declined.")
+    assert _settle(watcher) == []
+    assert [row[0] for row in _jobs(watcher.queue)] == ['filing.txt']
+
+
+def test_edit_during_a_running_job_is_queued_after_it_finishes(tmp_path):
+    inbox = tmp_path / 'inbox'
+    inbox.mkdir()
+    filing = inbox / 'filing.txt'
+    filing.write_text("Revenue declined.")
+    queue = JobQueue(str(tmp_path / 'queue.db'))
+    watcher = InboxWatcher(str(inbox), queue, settle_seconds=0)
+    _settle(watcher)
+    job = queue.claim()
+
+    filing.write_text("Revenue declined sharply after the impairment.")
+    assert _settle(watcher) == []
+    assert _jobs(queue)[0][1] == 'running'
+
+    queue.fail(job['id'], "interrupted for the test")
+    assert watcher.enqueue_ready() == [str(filing)]
+    [(document_id, status, content_hash)] = _jobs(queue)
+    assert (document_id, status) == ('filing.txt', 'pending')
+    assert watcher.enqueue_ready() == []
+    assert os.path.exists(filing) and content_hash
@@ -0,0 +1,80 @@
+import sqlite3
+import subprocess
+import sys
+import time
+import pytest
+from job_queue import JobQueue
+
+
+class RecordingAnalyzer:
+    """Stands in for the analyzer: records which documents were analyzed"""
+
+    model_name = 'test-model'
+    lexicon_version = 'test-lexicon'
+
+    def __init__(self):
+        self.analyzed = []
+
+    def analyze_text(self, text, batch_size=32):
+        self.analyzed.append(text)
+        return {'document_sentiment_score': 0.0}
+
+
+@pytest.fixture
+def queue_path(tmp_path):
+    path = str(tmp_path / 'queue.db')
+    documents = []
+    for name in ('a', 'b'):
+        document = tmp_path / f'{name}.txt'
+        document.write_text(f"Document {name}.")
+        documents.append((name, str(document)))
+    JobQueue(path).enqueue(documents)
+    return path
+
+
+def _status(path, document_id):
+    with sqlite3.connect(path) as connection:
+        return connection.execute("SELECT status FROM jobs WHERE document_id = ?", (document_id,)).fetchone()[0]
+
+
+def test_second_runner_leaves_live_claims_alone(queue_path):
+    first, second = JobQueue(queue_path), JobQueue(queue_path)
+    job = first.claim()
+
+    analyzer = RecordingAnalyzer()
+    assert second.recover() == 0
+    assert second.run(analyzer) == 1
+    assert analyzer.analyzed == ["Document b."]
+    assert _status(queue_path, job['document_id']) == 'running'
+
+    first.complete(job['id'], {'document_sentiment_score': 0.0}, analyzer)
+    assert first.counts()['done'] == 2
+
+
+def test_stale_claims_are_recovered(queue_path):
+    first, second = JobQueue(queue_path), JobQueue(queue_path, stale_after=60)
+    first.claim()
+    with sqlite3.connect(queue_path) as connection:
+        connection.execute("UPDATE jobs SET heartbeat_at = ? WHERE status = 'running'", (time.time() - 120,))
+    assert second.recover() == 1
+    assert second.counts()['running'] == 0
+
+
+def test_claims_of_dead_local_processes_are_recovered(queue_path):
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    first = JobQueue(queue_path)
+    host, _, token = first.claimant.rsplit(':', 2)
+    first.claimant = f"{host}:{process.pid}:{token}"
+    first.claim()
+    assert JobQueue(queue_path).recover() == 1
+
+
+def test_heartbeat_keeps_a_long_job_alive(queue_path):
+    runner = JobQueue(queue_path, heartbeat_interval=0.05)
+    job = runner.claim()
+    with sqlite3.connect(queue_path) as connection:
+        connection.execute("UPDATE jobs SET heartbeat_at = 0 WHERE id = ?", (job['id'],))
+    with runner._keep_alive(job['id']):
+        time.sleep(0.2)
+    assert JobQueue(queue_path, stale_after=60).recover() == 0
@@ -0,0 +1,29 @@
+import pytest
+from red_flags import RedFlagCollector
+
+
+def _result(score):
+    return {
+        'sentence': f"Sentence scored {score}.",
+        'final_sentiment_score': score,
+        'risk_score': score,
+        'risk_indicators': ['going concern'],
+        'risk_indicators_by_category': {'critical_bankruptcy': ['going concern']},
+        'financial_metrics': [],
+        'source_span': None
+    }
+
+
+def test_k_must_be_positive():
+    with pytest.raises(ValueError):
+        RedFlagCollector(k=0)
+
+
+def test_keeps_the_k_worst_sentences():
+    collector = RedFlagCollector(k=1)
+    for score in (-0.2, -0.9, -0.5):
+        collector.add(_result(score))
+    flags = collector.red_flags()
+    assert flags['sentences_scanned'] == 3
+    assert [entry['final_sentiment_score'] for entry in flags['most_negative']] == [-0.9]
+    assert [entry['risk_score'] for entry in flags['most_risk_flagged']] == [-0.9]
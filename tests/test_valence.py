@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('torch')
+pytest.importorskip('transformers')
+
+from analyzer import BankruptcyAwareFinBERTAnalyzer
+from tuning import SCORING_WEIGHT_NAMES, extract_scoring_features, predict_scores
+
+UNCERTAINTY_ONLY = "There can be no assurance the Company will continue as a going concern."
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return BankruptcyAwareFinBERTAnalyzer()
+
+
+def test_uncertainty_only_phrase_moves_the_score(analyzer):
+    shifters, words, summary = analyzer.match_valence_shifters(UNCERTAINTY_ONLY)
+    assert not shifters
+    assert summary['uncertainty_count'] > 0
+
+    result = analyzer.analyze_sentence(UNCERTAINTY_ONLY)
+    risk = analyzer.calculate_risk_sentiment(UNCERTAINTY_ONLY)
+    unshifted = analyzer.apply_valence_adjustment(result['finbert_base_score'], risk, [], words,
+                                                  dict.fromkeys(summary, 0))
+    assert unshifted != 0
+    assert abs(result['final_sentiment_score']) < abs(unshifted)
+
+
+def test_predict_scores_matches_the_analyzer(analyzer):
+    sentences = [UNCERTAINTY_ONLY, "Revenue did not decline significantly this quarter.",
+                 "Net sales increased 12% compared to the prior year."]
+    examples = [{'text': sentence, 'target_sentiment': 0.0} for sentence in sentences]
+    features = extract_scoring_features(analyzer, examples)
+    predicted = predict_scores(
+        features,
+        {name: [analyzer.scoring_weights[name]] for name in SCORING_WEIGHT_NAMES},
+        [[analyzer.category_weights[str(c)] for c in features['risk_categories']]]
+    )[:, 0]
+    expected = [analyzer.analyze_sentence(sentence)['final_sentiment_score'] for sentence in sentences]
+    np.testing.assert_allclose(predicted, expected)
@@ -0,0 +1,173 @@
+import argparse
+import os
+import time
+import pandas as pd
+
+RISK_CATEGORIES = ['critical_bankruptcy', 'high_risk', 'moderate_risk', 'economic_headwinds', 'management_change']
+
+TREND_METRICS = ['document_sentiment_score', 'bankruptcy_risk_score'] + RISK_CATEGORIES
+
+
+def summarize_result(result):
+    """Flatten the document-level fields of an analyze_text result into one row"""
+    row = {
+        'document_sentiment_score': result['document_sentiment_score'],
+        'bankruptcy_risk_score': result['bankruptcy_risk_score'],
+        'economic_headwinds_score': result['economic_headwinds_score'],
+        'sentiment_classification': result['sentiment_classification'],
+        'risk_indicators_count': result['risk_indicators_count'],
+        'sentences_with_critical_risk': result['sentences_with_critical_risk'],
+        'total_sentences_analyzed': result['total_sentences_analyzed']
+    }
+    for category in RISK_CATEGORIES:
+        row[category] = result['risk_indicators_by_category'].get(category, 0)
+    return row
+
+
+def analyze_filing_series(analyzer, filings, company=None, batch_size=32, approximate=False):
+    """
+    Analyze a company's filings in period order and build a trend table.
+
+    ``filings`` is a list of (period, text) pairs in chronological order. Sentences
+    repeated from earlier periods are served from the analyzer's FinBERT cache.
+    With ``approximate`` each filing is screened with analyze_text_approximate and
+    the rows gain the sentiment confidence interval and whether it was escalated.
+    Returns a DataFrame with one row per period plus ``<metric>_delta`` columns.
+    """
+    rows = []
+    for period, text in filings:
+        stats_before = dict(analyzer.cache_stats)
+        started = time.perf_counter()
+        if approximate:
+            result = analyzer.analyze_text_approximate(text, batch_size=batch_size)
+        else:
+            result = analyzer.analyze_text(text, batch_size=batch_size)
+        if result is None:
+            continue
+
+        row = {'company': company, 'period': period}
+        row.update(summarize_result(result))
+        if approximate:
+            approximation = result['approximation']
+            interval = approximation.get('document_sentiment_ci', (row['document_sentiment_score'],) * 2)
+            row['document_sentiment_ci_low'], row['document_sentiment_ci_high'] = interval
+            row['scored_sentence_ratio'] = approximation['scored_sentences'] / approximation['total_sentences']
+            row['escalated'] = approximation['escalated']
+        delta = {key: analyzer.cache_stats[key] - stats_before[key]
+                 for key in ('hits', 'misses', 'near_duplicate_hits', 'audited')}
+        # Audited near-duplicates were counted as hits but also scored by the model
+        reused = delta['hits'] + delta['near_duplicate_hits'] - delta['audited']
+        row['cached_sentence_ratio'] = reused / (reused + delta['misses']) if reused + delta['misses'] else 0.0
+        row['analysis_seconds'] = time.perf_counter() - started
+        rows.append(row)
+
+    trend = pd.DataFrame(rows)
+    if trend.empty:
+        return trend
+    for metric in TREND_METRICS:
+        trend[f'{metric}_delta'] = trend[metric].diff()
+    return trend
+
+
+def analyze_watchlist(analyzer, filings_by_company, batch_size=32, approximate=False):
+    """Run analyze_filing_series for every company and stack the trend tables"""
+    trends = [analyze_filing_series(analyzer, filings, company=company, batch_size=batch_size, approximate=approximate)
+              for company, filings in filings_by_company.items()]
+    trends = [trend for trend in trends if not trend.empty]
+    return pd.concat(trends, ignore_index=True) if trends else pd.DataFrame()
+
+
+def load_filing_directory(path):
+    """
+    Load filings from disk for trend analysis.
+
+    A directory of text files is treated as one company whose periods sort by file
+    name (e.g. 2022Q1.txt, 2022Q2.txt); a directory of such directories is a watchlist.
+    Returns {company: [(period, text), ...]}.
+    """
+    def read_periods(directory):
+        periods = []
+        for name in sorted(os.listdir(directory)):
+            file_path = os.path.join(directory, name)
+            if os.path.isfile(file_path):
+                with open(file_path, encoding='utf-8', errors='ignore') as f:
+                    periods.append((os.path.splitext(name)[0], f.read()))
+        return periods
+
+    subdirectories = sorted(name for name in os.listdir(path) if os.path.isdir(os.path.join(path, name)))
+    if subdirectories:
+        return {name: read_periods(os.path.join(path, name)) for name in subdirectories}
+    return {os.path.basename(os.path.normpath(path)): read_periods(path)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Filing-over-filing sentiment and risk trend analysis")
+    parser.add_argument('path', help="Directory of one company's filings, or a directory of company directories")
+    parser.add_argument('--batch-size', type=int, default=32, help="FinBERT inference batch size")
+    parser.add_argument('--output', help="Optional CSV path for the trend table")
+    parser.add_argument('--near-duplicates', action='store_true',
+                        help="Reuse FinBERT scores for sentences that differ only in numbers, dates or a few words")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Analyze companies in this many forked processes sharing one copy of the model")
+    parser.add_argument('--model', default="ProsusAI/finbert",
+                        help="Sentence model: ProsusAI/finbert or a distilled student directory (see distillation.py)")
+    parser.add_argument('--approximate', action='store_true',
+                        help="Screen filings from a stratified sentence sample, escalating when the sentiment sign is uncertain")
+    parser.add_argument('--adaptive-batch', action='store_true',
+                        help="Adapt the FinBERT batch size to measured latency and memory, starting from --batch-size")
+    args = parser.parse_args()
+
+    from analyzer import BankruptcyAwareFinBERTAnalyzer
+
+    filings_by_company = load_filing_directory(args.path)
+    analyzer = BankruptcyAwareFinBERTAnalyzer(model_name=args.model)
+    if args.near_duplicates:
+        analyzer.enable_near_duplicate_reuse()
+    if args.adaptive_batch:
+        analyzer.enable_adaptive_batching(initial=args.batch_size)
+    memory = None
+    if args.workers > 1:
+        from workers import analyze_watchlist_in_workers
+        trend, memory = analyze_watchlist_in_workers(analyzer, filings_by_company, args.workers,
+                                                     args.batch_size, approximate=args.approximate)
+    else:
+        trend = analyze_watchlist(analyzer, filings_by_company, batch_size=args.batch_size, approximate=args.approximate)
+
+    if trend.empty:
+        print("No filings analyzed.")
+        return
+
+    print("\n=== FILING TRENDS ===")
+    columns = ['company', 'period', 'document_sentiment_score', 'document_sentiment_score_delta',
+               'bankruptcy_risk_score', 'bankruptcy_risk_score_delta', 'critical_bankruptcy',
+               'high_risk', 'cached_sentence_ratio', 'analysis_seconds']
+    if args.approximate:
+        columns += ['document_sentiment_ci_low', 'document_sentiment_ci_high', 'scored_sentence_ratio', 'escalated']
+    print(trend[columns].to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+
+    if memory is not None:
+        from workers import print_memory_report
+        print_memory_report(memory)
+
+    # With --workers the analyzer's cache_stats are the sum of the workers' stats
+    report = analyzer.cache_report()
+    print(f"\n♻️ Exact reuse: {report['exact_reuse_rate']:.1%}  Near-duplicate reuse: {report['near_duplicate_reuse_rate']:.1%}  "
+          f"Model scored: {report['model_scored_rate']:.1%}")
+    if report['audited_near_duplicates']:
+        print(f"📏 Score drift on {report['audited_near_duplicates']} audited near-duplicates: "
+              f"mean {report['mean_score_drift']:.3f}, max {report['max_score_drift']:.3f}")
+    if args.adaptive_batch:
+        from batching import print_batch_report
+        if memory is not None:
+            for pid, usage in sorted(memory['workers'].items()):
+                print_batch_report(usage['batch_report'], label=f"worker {pid}")
+        else:
+            print_batch_report(analyzer.batch_report())
+
+    if args.output:
+        trend.to_csv(args.output, index=False)
+        print(f"💾 Trend table written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
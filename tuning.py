@@ -0,0 +1,282 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+
+SCORING_WEIGHT_NAMES = ['base_blend', 'risk_blend', 'amplifier', 'de_amplifier', 'adversative', 'uncertainty']
+
+DEFAULT_GRID = {
+    'base_blend': [0.1, 0.2, 0.3, 0.4, 0.5],
+    'risk_blend': [0.5, 0.6, 0.7, 0.8, 0.9],
+    'amplifier': [0.1, 0.2, 0.3, 0.4, 0.5],
+    'de_amplifier': [0.1, 0.2, 0.3, 0.4],
+    'adversative': [0.2, 0.3, 0.4, 0.5],
+    'uncertainty': [0.1, 0.2, 0.3]
+}
+
+DEFAULT_CATEGORY_GRID = {
+    'critical_bankruptcy': [0.7, 0.8, 0.9, 1.0],
+    'high_risk': [0.5, 0.6, 0.7, 0.8],
+    'moderate_risk': [0.3, 0.4, 0.5, 0.6],
+    'economic_headwinds': [0.4, 0.5, 0.6, 0.7],
+    'management_change': [0.2, 0.3, 0.4, 0.5]
+}
+
+
+def _prepare_examples(examples):
+    examples = pd.DataFrame(examples).reset_index(drop=True)
+    if 'category' not in examples:
+        examples['category'] = 'uncategorized'
+    return examples[examples['text'].fillna('').astype(str).str.strip() != ''].reset_index(drop=True)
+
+
+def labeled_set_hash(examples):
+    """Content hash of the sentences, targets and categories features are extracted from"""
+    examples = _prepare_examples(examples)
+    rows = zip(examples['text'].astype(str), examples['target_sentiment'].astype(float),
+               examples['category'].fillna('uncategorized').astype(str))
+    return hashlib.sha256(json.dumps(list(rows)).encode('utf-8')).hexdigest()
+
+
+def extract_scoring_features(analyzer, examples, batch_size=32):
+    """
+    Run FinBERT and lexicon feature extraction once over a labeled set.
+
+    Returns a dict of NumPy arrays holding everything apply_valence_adjustment and
+    calculate_risk_sentiment need, so any weight combination can be re-scored
+    without touching the model. The model name, lexicon version and labeled set
+    hash are stored alongside so a stale cache can be detected.
+    """
+    set_hash = labeled_set_hash(examples)
+    examples = _prepare_examples(examples)
+    texts = examples['text'].astype(str).tolist()
+
+    categories = list(analyzer.category_weights)
+    finbert_results = analyzer.get_finbert_sentiment_batch(texts, batch_size=batch_size)
+
+    n = len(texts)
+    features = {
+        'base_score': np.array([r['sentiment_score'] for r in finbert_results], dtype=float),
+        'category_score_sums': np.zeros((n, len(categories))),
+        'other_weighted_sum': np.zeros(n),
+        'indicator_count': np.zeros(n),
+        'metric_mean': np.zeros(n),
+        'risk_confidence': np.zeros(n),
+        'has_critical': np.zeros(n, dtype=bool),
+        'has_shifters': np.zeros(n, dtype=bool),
+        'negator_odd': np.zeros(n, dtype=bool),
+        'amplifier_strength': np.zeros(n),
+        'de_amplifier_strength': np.zeros(n),
+        'adversative_strength': np.zeros(n),
+        'uncertainty_count': np.zeros(n),
+        'target': examples['target_sentiment'].to_numpy(dtype=float),
+        'category': np.array(examples['category'].fillna('uncategorized').astype(str).tolist(), dtype=str),
+        'risk_categories': np.array(categories),
+        'lexicon_version': np.array(analyzer.lexicon_version),
+        'model_name': np.array(analyzer.model_name),
+        'labeled_set_hash': np.array(set_hash)
+    }
+
+    for i, text in enumerate(texts):
+        risk_result = analyzer.calculate_risk_sentiment(text)
+        for ind in risk_result['indicators']:
+            if ind['category'] in analyzer.category_weights:
+                features['category_score_sums'][i, categories.index(ind['category'])] += ind['score']
+            else:
+                features['other_weighted_sum'][i] += ind['score'] * 0.3
+        features['indicator_count'][i] = len(risk_result['indicators'])
+        if risk_result['financial_metrics']:
+            metric_scores = [metric['score'] for metric in risk_result['financial_metrics']]
+            features['metric_mean'][i] = sum(metric_scores) / len(metric_scores)
+        features['risk_confidence'][i] = risk_result['risk_confidence']
+        features['has_critical'][i] = any(ind['term'] in analyzer.critical_bankruptcy_terms
+                                          for ind in risk_result['indicators'])
+
+        shifters, _, valence_summary = analyzer.match_valence_shifters(text)
+        # Mirrors apply_valence_adjustment, which also adjusts uncertainty-only sentences
+        features['has_shifters'][i] = bool(shifters) or valence_summary['uncertainty_count'] > 0
+        features['negator_odd'][i] = valence_summary['negator_count'] % 2 == 1
+        features['amplifier_strength'][i] = valence_summary['amplifier_strength']
+        features['de_amplifier_strength'][i] = valence_summary['de_amplifier_strength']
+        features['adversative_strength'][i] = valence_summary['adversative_strength']
+        features['uncertainty_count'][i] = valence_summary['uncertainty_count']
+
+    return features
+
+
+def save_scoring_features(features, path):
+    """Cache extracted features to a compressed .npz file"""
+    np.savez_compressed(path, **features)
+
+
+def load_scoring_features(path):
+    """Load features cached by save_scoring_features"""
+    with np.load(path, allow_pickle=False) as data:
+        return {key: data[key] for key in data.files}
+
+
+def predict_scores(features, scoring_weights, category_weights):
+    """
+    Vectorized equivalent of apply_valence_adjustment for many weight combinations.
+
+    ``scoring_weights`` maps each name in SCORING_WEIGHT_NAMES to an array of shape (W,)
+    and ``category_weights`` is an array of shape (W, C) ordered like
+    features['risk_categories']. Returns final sentiment scores of shape (N, W).
+    """
+    w = {name: np.asarray(scoring_weights[name], dtype=float)[None, :] for name in SCORING_WEIGHT_NAMES}
+    count = features['indicator_count'][:, None]
+
+    weighted_sum = features['category_score_sums'] @ np.asarray(category_weights, dtype=float).T
+    weighted_sum += features['other_weighted_sum'][:, None]
+    risk_score = np.where(count > 0, weighted_sum / np.maximum(count, 1), 0.0)
+    risk_score = np.clip(risk_score + features['metric_mean'][:, None], -1.0, 0.0)
+
+    base = features['base_score'][:, None]
+    combined = np.where(features['risk_confidence'][:, None] > 0.15,
+                        base * w['base_blend'] + risk_score * w['risk_blend'],
+                        base)
+    combined = np.where(features['has_critical'][:, None], np.minimum(combined, -0.2), combined)
+
+    adjusted = np.where(features['negator_odd'][:, None], -combined, combined)
+    amplifier = features['amplifier_strength'][:, None]
+    adjusted = adjusted * np.where(amplifier > 0, 1 + amplifier * w['amplifier'], 1.0)
+    de_amplifier = features['de_amplifier_strength'][:, None]
+    adjusted = adjusted * np.where(de_amplifier > 0, np.maximum(0.1, 1 - de_amplifier * w['de_amplifier']), 1.0)
+    adversative = features['adversative_strength'][:, None]
+    adjusted = adjusted * np.where(adversative > 0, np.maximum(0.1, 1 - adversative * w['adversative']), 1.0)
+    uncertainty = features['uncertainty_count'][:, None]
+    adjusted = adjusted * np.where(uncertainty > 0, np.maximum(0.3, 1 - uncertainty * w['uncertainty']), 1.0)
+    adjusted = np.clip(adjusted, -1.0, 1.0)
+
+    # apply_valence_adjustment returns the unshifted blend when a sentence has no shifters or uncertainty
+    return np.where(features['has_shifters'][:, None], adjusted, combined)
+
+
+def grid_search(features, base_scoring_weights, base_category_weights, grid, max_elements=4_000_000, top_n=10):
+    """
+    Evaluate every combination in ``grid`` against the cached features.
+
+    Weights missing from the grid keep their values from the base dicts. Combinations
+    are generated and scored in chunks of at most ``max_elements`` sentence x
+    combination cells, so the full grid is never materialized. Returns a DataFrame
+    of the ``top_n`` combinations ordered by mean absolute error.
+    """
+    if top_n < 1:
+        raise ValueError(f"top_n must be at least 1, got {top_n}")
+    categories = [str(c) for c in features['risk_categories']]
+    unknown = set(grid) - set(SCORING_WEIGHT_NAMES) - set(categories)
+    if unknown:
+        raise ValueError(f"Unknown weights in grid: {sorted(unknown)}")
+
+    names = list(grid)
+    values = [np.asarray(grid[name], dtype=float) for name in names]
+    shape = tuple(len(v) for v in values)
+    n_combinations = int(np.prod(shape))
+    target = features['target'][:, None]
+    target_negative = target < 0
+    chunk_size = max(1, max_elements // max(1, len(features['target'])))
+
+    best = []
+    for start in range(0, n_combinations, chunk_size):
+        # Row-major over the grid, the order itertools.product would yield
+        flat = np.arange(start, min(start + chunk_size, n_combinations))
+        indices = np.unravel_index(flat, shape) if names else ()
+        chunk = np.column_stack([v[i] for v, i in zip(values, indices)]) if names else np.zeros((len(flat), 0))
+        columns = {name: chunk[:, j] for j, name in enumerate(names)}
+        scoring = {name: columns.get(name, np.full(len(chunk), base_scoring_weights[name]))
+                   for name in SCORING_WEIGHT_NAMES}
+        category_matrix = np.column_stack([columns.get(c, np.full(len(chunk), base_category_weights[c]))
+                                           for c in categories]) if categories else np.zeros((len(chunk), 0))
+
+        predictions = predict_scores(features, scoring, category_matrix)
+        errors = predictions - target
+        mae = np.abs(errors).mean(axis=0)
+        keep = np.argpartition(mae, top_n - 1)[:top_n] if len(mae) > top_n else np.arange(len(mae))
+        best.append(pd.DataFrame({
+            **{name: chunk[keep, j] for j, name in enumerate(names)},
+            'mae': mae[keep],
+            'rmse': np.sqrt((errors[:, keep] ** 2).mean(axis=0)),
+            'bias': errors[:, keep].mean(axis=0),
+            'sign_accuracy': ((predictions[:, keep] < 0) == target_negative).mean(axis=0)
+        }))
+
+    return pd.concat(best, ignore_index=True).sort_values('mae', kind='stable').head(top_n).reset_index(drop=True)
+
+
+def split_weights(row, categories):
+    """Split a grid_search result row into (scoring_weights, category_weights) dicts"""
+    scoring_weights = {name: float(row[name]) for name in SCORING_WEIGHT_NAMES if name in row}
+    category_weights = {name: float(row[name]) for name in categories if name in row}
+    return scoring_weights, category_weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grid search scoring weights over cached FinBERT outputs")
+    parser.add_argument('labeled_set', nargs='?', help="CSV or JSONL labeled set (defaults to the analyzer's training_sentences)")
+    parser.add_argument('--features', help="Path of the .npz feature cache to read or create")
+    parser.add_argument('--refresh', action='store_true', help="Re-run FinBERT even if the feature cache exists")
+    parser.add_argument('--tune-categories', action='store_true', help="Also search over risk category weights")
+    parser.add_argument('--batch-size', type=int, default=32, help="FinBERT inference batch size")
+    parser.add_argument('--top', type=int, default=10, help="Number of best combinations to print")
+    parser.add_argument('--output', help="Write the best weights to this JSON file")
+    args = parser.parse_args()
+
+    from analyzer import BankruptcyAwareFinBERTAnalyzer
+    from evaluation import load_labeled_sentences
+
+    if args.top < 1:
+        parser.error("--top must be at least 1")
+
+    analyzer = BankruptcyAwareFinBERTAnalyzer()
+    examples = load_labeled_sentences(args.labeled_set) if args.labeled_set else analyzer.training_sentences
+
+    features = None
+    if args.features and os.path.exists(args.features) and not args.refresh:
+        print(f"📦 Loading cached features from {args.features}")
+        features = load_scoring_features(args.features)
+        expected = {'lexicon_version': analyzer.lexicon_version, 'model_name': analyzer.model_name,
+                    'labeled_set_hash': labeled_set_hash(examples)}
+        for key, value in expected.items():
+            cached = str(features[key]) if key in features else None
+            if cached != value:
+                print(f"♻️ Cached features do not match the current {key.replace('_', ' ')}, re-extracting")
+                features = None
+                break
+    if features is None:
+        print(f"🎯 Extracting features for {len(examples)} labeled sentences...")
+        features = extract_scoring_features(analyzer, examples, batch_size=args.batch_size)
+        if args.features:
+            save_scoring_features(features, args.features)
+            print(f"💾 Cached features to {args.features}")
+
+    grid = dict(DEFAULT_GRID)
+    if args.tune_categories:
+        grid.update(DEFAULT_CATEGORY_GRID)
+    n_combinations = int(np.prod([len(values) for values in grid.values()]))
+
+    print(f"🔍 Evaluating {n_combinations} weight combinations on {len(features['target'])} sentences...")
+    started = time.perf_counter()
+    results = grid_search(features, analyzer.scoring_weights, analyzer.category_weights, grid, top_n=args.top)
+    print(f"⏱️ Grid search finished in {time.perf_counter() - started:.2f}s")
+
+    current = predict_scores(
+        features,
+        {name: [analyzer.scoring_weights[name]] for name in SCORING_WEIGHT_NAMES},
+        [[analyzer.category_weights[str(c)] for c in features['risk_categories']]]
+    )[:, 0]
+    print(f"📊 Current weights MAE: {np.abs(current - features['target']).mean():.3f}")
+    print(f"\n=== TOP {args.top} WEIGHT COMBINATIONS ===")
+    print(results.to_string(float_format=lambda value: f"{value:.3f}"))
+
+    if args.output and len(results):
+        scoring_weights, category_weights = split_weights(results.iloc[0], [str(c) for c in features['risk_categories']])
+        with open(args.output, 'w') as f:
+            json.dump({'scoring_weights': scoring_weights, 'category_weights': category_weights}, f, indent=2)
+        print(f"💾 Best weights written to {args.output} (apply with analyzer.update_scoring_weights(**weights))")
+
+
+if __name__ == "__main__":
+    main()
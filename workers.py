@@ -0,0 +1,145 @@
+import functools
+import gc
+import multiprocessing
+import os
+import pandas as pd
+from trends import analyze_filing_series
+
+# Set in the parent before forking; workers inherit it copy-on-write
+_ANALYZER = None
+_STARTUP_MEMORY = None
+
+SMAPS_FIELDS = ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty')
+
+
+def memory_usage():
+    """
+    Resident memory of the current process in MB.
+
+    On Linux the shared/private split and PSS (shared pages divided among the
+    processes mapping them) come from /proc/self/smaps_rollup; elsewhere only the
+    peak RSS is available and is reported as private.
+    """
+    fields = {}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                name = parts[0].rstrip(':')
+                if name in SMAPS_FIELDS:
+                    fields[name] = int(parts[1]) / 1024
+    except OSError:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return {'rss_mb': rss, 'pss_mb': rss, 'shared_mb': 0.0, 'private_mb': rss}
+    return {
+        'rss_mb': fields.get('Rss', 0.0),
+        'pss_mb': fields.get('Pss', 0.0),
+        'shared_mb': fields.get('Shared_Clean', 0.0) + fields.get('Shared_Dirty', 0.0),
+        'private_mb': fields.get('Private_Clean', 0.0) + fields.get('Private_Dirty', 0.0)
+    }
+
+
+def model_memory_mb(model):
+    """Size of a torch model's parameters and buffers in MB"""
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors) / (1024 * 1024)
+
+
+def _init_worker(threads):
+    import torch
+    torch.set_num_threads(threads)
+    global _STARTUP_MEMORY
+    _STARTUP_MEMORY = memory_usage()
+
+
+def _analyze_company(item, batch_size, approximate):
+    company, filings = item
+    stats_before = dict(_ANALYZER.cache_stats)
+    trend = analyze_filing_series(_ANALYZER, filings, company=company, batch_size=batch_size, approximate=approximate)
+    cache_stats = {key: value - stats_before[key] for key, value in _ANALYZER.cache_stats.items()}
+    # A running maximum has no delta; report the worker's own
+    cache_stats['drift_max'] = _ANALYZER.cache_stats['drift_max']
+    return trend, os.getpid(), _STARTUP_MEMORY, memory_usage(), cache_stats, _ANALYZER.batch_report()
+
+
+def analyze_watchlist_in_workers(analyzer, filings_by_company, workers=2, batch_size=32, approximate=False):
+    """
+    Run analyze_filing_series for every company in forked worker processes.
+
+    The model is loaded once in the parent (``analyzer``) and workers are forked
+    from it, so FinBERT weights are shared copy-on-write instead of loaded per
+    worker. The garbage collector is frozen before forking so collections in the
+    workers do not touch, and thereby copy, the parent's object pages. The parent
+    should not run inference before calling this, since forking after torch has
+    started its thread pool can deadlock. Each company is analyzed by a single
+    worker so its FinBERT cache still serves sentences repeated across periods.
+
+    Cache statistics from the workers are added to ``analyzer.cache_stats`` so
+    cache_report covers the whole run. Returns (trend DataFrame, worker report):
+    the report holds per-pid memory at the worker's first startup and after its
+    last company, the number of companies it analyzed and, with adaptive batching,
+    its latest batch_report.
+    """
+    global _ANALYZER
+    _ANALYZER = analyzer
+    os.environ.setdefault('TOKENIZERS_PARALLELISM', 'false')
+    threads = max(1, (os.cpu_count() or 1) // workers)
+
+    memory = {
+        'parent_mb': memory_usage(),
+        'model_weights_mb': model_memory_mb(analyzer.model),
+        'workers': {}
+    }
+
+    gc.collect()
+    gc.freeze()
+    try:
+        context = multiprocessing.get_context('fork')
+        trends = []
+        with context.Pool(workers, initializer=_init_worker, initargs=(threads,)) as pool:
+            job = functools.partial(_analyze_company, batch_size=batch_size, approximate=approximate)
+            for trend, pid, startup, final, cache_stats, batch_report in pool.imap_unordered(
+                    job, filings_by_company.items()):
+                if not trend.empty:
+                    trends.append(trend)
+                # A pid analyzes several companies; keep its first startup and latest final reading
+                usage = memory['workers'].setdefault(pid, {'startup': startup, 'companies': 0})
+                usage['final'] = final
+                usage['companies'] += 1
+                usage['batch_report'] = batch_report
+                for key, value in cache_stats.items():
+                    if key == 'drift_max':
+                        analyzer.cache_stats[key] = max(analyzer.cache_stats[key], value)
+                    else:
+                        analyzer.cache_stats[key] += value
+    finally:
+        gc.unfreeze()
+        _ANALYZER = None
+
+    trend = pd.concat(trends, ignore_index=True) if trends else pd.DataFrame()
+    if not trend.empty:
+        order = {company: i for i, company in enumerate(filings_by_company)}
+        trend = trend.sort_values('company', key=lambda companies: companies.map(order), kind='stable')
+        trend = trend.reset_index(drop=True)
+    return trend, memory
+
+
+def print_memory_report(memory):
+    """Print per-worker RSS/PSS at startup and after analysis, and the memory saved by sharing weights"""
+    print("\n=== WORKER MEMORY (MB) ===")
+    print(f"Parent RSS with model loaded: {memory['parent_mb']['rss_mb']:.0f}  "
+          f"FinBERT weights: {memory['model_weights_mb']:.0f}")
+    total_pss = 0.0
+    total_private = 0.0
+    for pid, usage in sorted(memory['workers'].items()):
+        startup, final = usage['startup'], usage['final']
+        print(f"Worker {pid} ({usage['companies']} companies): RSS {startup['rss_mb']:.0f} -> {final['rss_mb']:.0f}, "
+              f"shared {final['shared_mb']:.0f}, private {final['private_mb']:.0f}, PSS {final['pss_mb']:.0f}")
+        total_pss += final['pss_mb']
+        total_private += final['private_mb']
+
+    if memory['workers']:
+        unshared = total_private + len(memory['workers']) * memory['model_weights_mb']
+        print(f"Workers total PSS: {total_pss:.0f}  "
+              f"(~{unshared:.0f} if each worker loaded its own weights)")